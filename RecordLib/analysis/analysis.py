@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Optional
+from datetime import date
 from RecordLib.crecord import CRecord
-import copy
+from RecordLib.crecord.evaluation import EvaluationContext
 from collections import OrderedDict
 
 class Analysis:
@@ -29,12 +30,31 @@ class Analysis:
     and the `reasoning` is a tree of `Decisions`
 
     Each rule function takes a criminal record and returns a tuple of a tree of Decisions and a CRecord. 
+
+    Rules don't change the records they're given. They build new records out of the cases and charges
+    of the old ones, and only copy a case when they split up its charges (see `Case.with_charges`).
+    So the record the analysis starts from shares its person, cases and charges with the records
+    rules return, instead of being copied.
+
+    The rules evaluate the record as of a fixed date, `as_of`, in an `EvaluationContext` that keeps the
+    number of years since each date in the record once it has been worked out. It also keeps the decisions
+    rules make about the whole record, like whether it's been ten years since the last conviction, and about
+    single cases, like which of a case's charges are convictions. Later rules asking about the same record, or
+    about a record holding the same case, share them. `context.decision_hits` counts how often they were shared.
+
+    With `explain=False`, rules decide which petitions to make without explaining what they decided about
+    each case and charge, which takes less than half the time. The petitions are the same, but the reasoning
+    of each decision only holds the decisions about the whole record, and those list the charges that
+    failed them instead of a decision about every charge.
     """
 
-    def __init__(self, rec: CRecord) -> None:
+    def __init__(
+        self, rec: CRecord, as_of: Optional[date] = None, explain: bool = True
+    ) -> None:
         self.record = rec
-        self.remaining_record = copy.deepcopy(rec)
+        self.remaining_record = rec.sharedcopy()
         self.decisions = []
+        self.context = EvaluationContext(as_of, explain=explain)
 
     def rule(self, ruledef: Callable) -> Analysis:
         """
@@ -51,7 +71,8 @@ class Analysis:
         Returns:
             This Analyis, after applying the ruledef and updating the analysis with the results of the ruledef.
         """
-        remaining_record, petition_decision = ruledef(self.remaining_record)
+        with self.context:
+            remaining_record, petition_decision = ruledef(self.remaining_record)
         self.remaining_record = remaining_record
         self.decisions.append(petition_decision)
         return self
@@ -0,0 +1,228 @@
+"""
+Analyze the records of many people at once.
+
+Screening a group of people means building and analyzing a record for each of them, from a
+directory of their dockets and summaries. `analyze_directory` does that for one person, and
+returns a result that can be written out as one line of json. `analyze_directories` hands the
+directories to a pool of processes and yields each result as soon as it's ready, in the order
+they finish.
+
+Only a few directories are given to the pool at a time (`max_in_flight`), and more are read from
+the iterable of directories only as results come back. So a batch takes about the same memory
+no matter how many people are in it, and its results can be written out while it runs.
+
+A batch's results double as a checkpoint: `finished_directories` reads the directories that
+already have a result, so that an interrupted batch can pick up where it stopped.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+import glob
+import itertools
+import json
+import os
+import time
+import logging
+from RecordLib.crecord import CRecord
+from RecordLib.analysis.analysis import Analysis
+from RecordLib.analysis.ruledefs import (
+    expunge_deceased,
+    expunge_over_70,
+    expunge_nonconvictions,
+    expunge_summary_convictions,
+    seal_convictions,
+)
+from RecordLib.sourcerecords import dispatch
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.utilities.serializers import to_serializable
+
+
+logger = logging.getLogger(__name__)
+
+# The rules a batch applies to each record, in order.
+RULES = (
+    expunge_deceased,
+    expunge_over_70,
+    expunge_nonconvictions,
+    expunge_summary_convictions,
+    seal_convictions,
+)
+
+# Analyzes a directory: takes the directory, `as_of` and `full`, like `analyze_directory`.
+DirectoryAnalyzer = Callable[[str, Optional[date], bool], Dict]
+
+
+def read_source_record(pdf: str) -> SourceRecord:
+    """
+    Parse a docket or summary pdf into a SourceRecord that knows which kind of record it is.
+    """
+    registration, parsed = dispatch.detect_and_parse_pdf(pdf)
+    return SourceRecord(
+        pdf,
+        parser=lambda _: parsed,
+        record_type=None if registration is None else registration.record_type,
+    )
+
+
+def read_record(directory: str) -> Tuple[CRecord, List[str]]:
+    """
+    Build the record of one person out of the pdfs in a directory.
+
+    Dockets tell us more about a case than summaries, so a case on a docket replaces the same
+    case from a summary. Summaries fill in the cases there are no dockets for.
+
+    Returns:
+        The record, and the errors from parsing each pdf.
+    """
+    record = CRecord()
+    errors = []
+    summaries = []
+    for pdf in sorted(glob.glob(os.path.join(directory, "*.pdf"))):
+        sourcerecord = read_source_record(pdf)
+        errors.extend(f"{os.path.basename(pdf)}: {error}" for error in sourcerecord.errors or [])
+        if sourcerecord.record_type == SourceRecord.RECORD_TYPES.DOCKET:
+            record.add_sourcerecord(sourcerecord, case_merge_strategy="overwrite_old")
+        else:
+            summaries.append(sourcerecord)
+    for sourcerecord in summaries:
+        record.add_sourcerecord(sourcerecord, case_merge_strategy="ignore_new")
+    return record, errors
+
+
+def analyze_record(
+    record: CRecord, as_of: Optional[date] = None, explain: bool = True
+) -> Analysis:
+    """
+    Apply the `RULES` to a record. See `Analysis` for `as_of` and `explain`.
+    """
+    analysis = Analysis(record, as_of=as_of, explain=explain)
+    for ruledef in RULES:
+        analysis.rule(ruledef)
+    return analysis
+
+
+def analyze_directory(
+    directory: str, as_of: Optional[date] = None, full: bool = False
+) -> Dict:
+    """
+    Build and analyze the record of the person whose pdfs are in `directory`.
+
+    Errors are part of the result, rather than raised, so that one unreadable record doesn't
+    stop a batch.
+
+    Args:
+        directory: A directory of the dockets and summaries of one person.
+        as_of: Analyze the record as of this date. Today, if None.
+        full: Include the whole serialized analysis in the result, not just the petitions.
+
+    Returns:
+        A dict of the directory, the person's name, how many cases and charges they have, the
+        petitions the analysis found, any errors, and how many seconds it all took. Everything
+        in it can be written out with `json.dumps`.
+    """
+    started = time.perf_counter()
+    result = {"directory": directory, "errors": []}
+    try:
+        record, result["errors"] = read_record(directory)
+        if record.person is None:
+            result["errors"].append("Could not find who these records are about.")
+        else:
+            # Only the whole analysis needs to explain its decisions about each case and charge.
+            analysis = analyze_record(record, as_of, explain=full)
+            petitions = [
+                petition for decision in analysis.decisions for petition in decision.value
+            ]
+            result.update(
+                {
+                    "name": record.person.full_name(),
+                    "cases": len(record.cases),
+                    "charges": sum(len(case.charges) for case in record.cases),
+                    "petitions": [
+                        {
+                            "petition_type": petition.petition_type,
+                            "docket_numbers": [
+                                case.docket_number for case in petition.cases
+                            ],
+                        }
+                        for petition in petitions
+                    ],
+                }
+            )
+            if full:
+                result["analysis"] = json.loads(
+                    json.dumps(analysis, default=to_serializable)
+                )
+    except Exception as e:
+        logger.error(f"Could not analyze {directory}: {e}")
+        result["errors"].append(f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def analyze_directories(
+    directories: Iterable[str],
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    as_of: Optional[date] = None,
+    full: bool = False,
+    analyzer: DirectoryAnalyzer = analyze_directory,
+) -> Iterator[Dict]:
+    """
+    Analyze the people in many directories in a pool of processes, and yield each result as
+    soon as it's done.
+
+    Args:
+        directories: Directories of the pdfs of one person each. Read only as results come back.
+        workers: The number of processes. Defaults to the number of cpus. If 1, the directories
+            are analyzed in this process, in order.
+        max_in_flight: The most directories handed to the pool and not yet yielded back.
+            Defaults to twice the number of workers.
+        as_of: Analyze the records as of this date. Today, if None.
+        full: Include the whole serialized analysis in each result.
+        analyzer: Analyzes each directory. It has to be picklable, like any function defined at
+            the top level of a module.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for directory in directories:
+            yield analyzer(directory, as_of, full)
+        return
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    directories = iter(directories)
+    in_flight = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for directory in itertools.islice(directories, max_in_flight - len(in_flight)):
+                in_flight.add(pool.submit(analyzer, directory, as_of, full))
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def finished_directories(output: str) -> Set[str]:
+    """
+    The directories that already have a result in a file of json lines written by a batch.
+
+    A batch that was stopped while writing may have left a partial line at the end of the file.
+    That line is cut off, so that results appended to the file start on a line of their own.
+    """
+    finished = set()
+    if not os.path.exists(output):
+        return finished
+    complete_length = 0
+    with open(output, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            complete_length += len(line)
+            try:
+                finished.add(json.loads(line)["directory"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping a line of {output} that isn't a result.")
+    if complete_length < os.path.getsize(output):
+        with open(output, "r+b") as f:
+            f.truncate(complete_length)
+    return finished
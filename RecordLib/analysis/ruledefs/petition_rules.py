@@ -13,9 +13,8 @@ from typing import Tuple
 from RecordLib.analysis.decision import Decision, PetitionDecision
 from RecordLib.analysis.ruledefs import simple_expungement_rules as ser
 from RecordLib.analysis.ruledefs import simple_sealing_rules as ssr
-from RecordLib.crecord import CRecord
+from RecordLib.crecord import CRecord, evaluation
 from RecordLib.petitions import Expungement, Sealing, Petition
-import copy
 
 
 def expunge_over_70(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
@@ -47,7 +46,7 @@ def expunge_over_70(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
         for e in exps:
             e.expungement_type = Expungement.ExpungementTypes.FULL_EXPUNGEMENT
         conclusion.value = exps
-        remaining_recordord = CRecord(person=copy.deepcopy(crecord.person), cases=[])
+        remaining_recordord = CRecord(person=crecord.person, cases=[])
     else:
         conclusion.value = []
         remaining_recordord = crecord
@@ -79,7 +78,7 @@ def expunge_deceased(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
         for e in exps:
             e.expungement_type = Expungement.ExpungementTypes.FULL_EXPUNGEMENT
         conclusion.value = exps
-        remaining_record = CRecord(person=copy.deepcopy(crecord.person), cases=[])
+        remaining_record = CRecord(person=crecord.person, cases=[])
     else:
         conclusion.value = []
         remaining_record = crecord
@@ -117,34 +116,35 @@ def expunge_summary_convictions(crecord: CRecord) -> Tuple[CRecord, PetitionDeci
 
     # initialize a blank crecord to hold the cases and charges that can't be expunged under this rule.
     remaining_record = CRecord(person=crecord.person)
+    explain = evaluation.explaining()
     if all(conclusion.reasoning) and len(crecord.cases) > 0:
         for case in crecord.cases:
             # Find expungeable charges in a case. Save a Decision explaining what's
             # expungeable to
             # the reasoning of the Decision about the whole record.
-            case_d = Decision(
-                name=f"Is {case.docket_number} expungeable?", reasoning=[]
-            )
-            expungeable_case = (
-                case.partialcopy()
-            )  # The charges in this case that are expungeable.
-            not_expungeable_case = (
-                case.partialcopy()
-            )  # Charges in this case that are not expungeable.
+            if explain:
+                case_d = Decision(
+                    name=f"Is {case.docket_number} expungeable?", reasoning=[]
+                )
+            expungeable_charges = []  # The charges in this case that are expungeable.
+            not_expungeable_charges = []  # Charges in this case that are not expungeable.
             for charge in case.charges:
-                charge_d = ser.is_summary_conviction(charge)
-                if all(charge_d.reasoning):
-                    expungeable_case.charges.append(charge)
-                    charge_d.value = True
+                if explain:
+                    charge_d = ser.is_summary_conviction(charge)
+                    expungeable = charge_d.value
+                    case_d.reasoning.append(charge_d)
+                else:
+                    expungeable = ser.charge_is_summary_conviction(charge)
+                if expungeable:
+                    expungeable_charges.append(charge)
                 else:
-                    charge_d.value = False
-                    not_expungeable_case.charges.append(charge)
-                case_d.reasoning.append(charge_d)
+                    not_expungeable_charges.append(charge)
+            expungeable_case = case.with_charges(expungeable_charges)
+            not_expungeable_case = case.with_charges(not_expungeable_charges)
 
             # If there are any expungeable charges, add an Expungepent to the Value of the decision about
             # this whole record.
             if len(expungeable_case.charges) > 0:
-                case_d.value = True
                 exp = Expungement(
                     client=crecord.person,
                     cases=[expungeable_case],
@@ -157,11 +157,12 @@ def expunge_summary_convictions(crecord: CRecord) -> Tuple[CRecord, PetitionDeci
                         Expungement.ExpungementTypes.PARTIAL_EXPUNGEMENT
                     )
                 conclusion.value.append(exp)
-            if len(not_expungeable_case.charges) > 0:
-                case_d.value = False
+            if explain and len(case.charges) > 0:
+                case_d.value = len(not_expungeable_case.charges) == 0
 
         remaining_record.cases.append(not_expungeable_case)
-        conclusion.reasoning.append(case_d)
+        if explain:
+            conclusion.reasoning.append(case_d)
 
     else:
         # The global requirements for expunging anything on this record weren't met, so nothing can be
@@ -185,44 +186,50 @@ def expunge_nonconvictions(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]
     )
 
     remaining_recordord = CRecord(person=crecord.person)
+    explain = evaluation.explaining()
     for case in crecord.cases:
-        case_d = Decision(
-            name=f"Does {case.docket_number} have expungeable nonconvictions?",
-            reasoning=[],
-        )
-        unexpungeable_case = case.partialcopy()
-        expungeable_case = case.partialcopy()
-        for charge in case.charges:
-            charge_d = Decision(
-                name=f"Is the charge for {charge.offense} a nonconviction?",
-                value=not charge.is_conviction(),
-                reasoning=f"The charge's disposition {charge.disposition} indicates a conviction"
-                if charge.is_conviction()
-                else f"The charge's disposition {charge.disposition} indicates its not a conviction.",
+        if explain:
+            case_d = Decision(
+                name=f"Does {case.docket_number} have expungeable nonconvictions?",
+                reasoning=[],
             )
-
-            if bool(charge_d) is True:
-                expungeable_case.charges.append(charge)
+        unexpungeable_charges = []
+        expungeable_charges = []
+        convictions = set(map(id, case.convictions()))
+        for charge in case.charges:
+            conviction = id(charge) in convictions
+            if explain:
+                case_d.reasoning.append(
+                    Decision(
+                        name=f"Is the charge for {charge.offense} a nonconviction?",
+                        value=not conviction,
+                        reasoning=f"The charge's disposition {charge.disposition} indicates a conviction"
+                        if conviction
+                        else f"The charge's disposition {charge.disposition} indicates its not a conviction.",
+                    )
+                )
+            if conviction:
+                unexpungeable_charges.append(charge)
             else:
-                unexpungeable_case.charges.append(charge)
-            case_d.reasoning.append(charge_d)
+                expungeable_charges.append(charge)
+        expungeable_case = case.with_charges(expungeable_charges)
+        unexpungeable_case = case.with_charges(unexpungeable_charges)
 
         # If there are any expungeable charges, add an Expungepent to the Value of the decision about
         # this whole record.
         if len(expungeable_case.charges) > 0:
-            case_d.value = True
             exp = Expungement(client=crecord.person, cases=[expungeable_case])
             if len(expungeable_case.charges) == len(case.charges):
                 exp.expungement_type = Expungement.ExpungementTypes.FULL_EXPUNGEMENT
             else:
                 exp.expungement_type = Expungement.ExpungementTypes.PARTIAL_EXPUNGEMENT
             conclusion.value.append(exp)
-        else:
-            case_d.value = False
 
         if len(unexpungeable_case.charges) > 0:
             remaining_recordord.cases.append(unexpungeable_case)
-        conclusion.reasoning.append(case_d)
+        if explain:
+            case_d.value = len(expungeable_case.charges) > 0
+            conclusion.reasoning.append(case_d)
 
     return remaining_recordord, conclusion
 
@@ -257,84 +264,56 @@ def seal_convictions(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
     conclusion.reasoning.append(
         ssr.full_record_requirements_for_petition_sealing(crecord)
     )
+    explain = evaluation.explaining()
     if conclusion.reasoning[0]:
         for case in crecord.cases:
-            # The sealability of each case is its own decision
-            case_decision = Decision(
-                name=f"Sealing case {case.docket_number}", reasoning=[]
-            )
-            fines_decision = ssr.fines_and_costs_paid(case)  # 18 Pa.C.S. 9122.1(a)
-            case_decision.reasoning.append(fines_decision)
-            # create copies of a case that don't include any charges.
-            # sealable or unsealable charges will be added to these.
-            sealable_parts_of_case = case.partialcopy()
-            unsealable_parts_of_case = case.partialcopy()
+            # Sealable and unsealable charges will be added to these, and then split into
+            # copies of the case.
+            sealable_charges = []
+            unsealable_charges = []
+            if explain:
+                # The sealability of each case is its own decision
+                case_decision = Decision(
+                    name=f"Sealing case {case.docket_number}", reasoning=[]
+                )
+                fines_decision = ssr.fines_and_costs_paid(case)  # 18 Pa.C.S. 9122.1(a)
+                case_decision.reasoning.append(fines_decision)
 
             # Iterate over the charges in a case, to see which charges are sealable.
-            charge_decisions = []
             for charge in case.charges:
-                # The sealability of each charge is its own Decision.
-                charge_decision = Decision(name=f"Sealing charge {charge.offense}")
-                # Conditions that determine whether this charge is sealable
-                #  See 91 Pa.C.S. 9122.1(b)(1)
-                charge_decision.reasoning = [
-                    ssr.is_misdemeanor_or_ungraded(charge),
-                    ssr.no_danger_to_person_offense(
-                        charge,
-                        penalty_limit=2,
-                        conviction_limit=1,
-                        within_years=float("Inf"),
-                    ),
-                    ssr.no_offense_against_family(
-                        charge,
-                        penalty_limit=2,
-                        conviction_limit=1,
-                        within_years=float("Inf"),
-                    ),
-                    ssr.no_firearms_offense(
-                        charge,
-                        penalty_limit=2,
-                        conviction_limit=1,
-                        within_years=float("Inf"),
-                    ),
-                    ssr.no_sexual_offense(
-                        charge,
-                        penalty_limit=2,
-                        conviction_limit=1,
-                        within_years=float("Inf"),
-                    ),
-                    ssr.no_corruption_of_minors_offense(
-                        charge,
-                        penalty_limit=2,
-                        conviction_limit=1,
-                        within_years=float("Inf"),
-                    ),
-                ]
-                if all(charge_decision.reasoning):
-                    charge_decision.value = "Sealable"
-                    sealable_parts_of_case.charges.append(charge)
+                if explain:
+                    # The sealability of each charge is its own Decision. See 91 Pa.C.S. 9122.1(b)(1)
+                    charge_decision = ssr.petition_sealing_for_single_charge(charge)
+                    sealable = bool(charge_decision)
+                    charge_decision.value = "Sealable" if sealable else "Not sealable"
+                    case_decision.reasoning.append(charge_decision)
+                else:
+                    sealable = ssr.charge_is_sealable(charge)
+                if sealable:
+                    sealable_charges.append(charge)
                 else:
-                    charge_decision.value = "Not sealable"
-                    unsealable_parts_of_case.charges.append(charge)
-                charge_decisions.append(charge_decision)
-            if all([decision.value == "Sealable" for decision in charge_decisions]):
+                    unsealable_charges.append(charge)
+            sealable_parts_of_case = case.with_charges(sealable_charges)
+            unsealable_parts_of_case = case.with_charges(unsealable_charges)
+            if len(unsealable_charges) == 0:
                 # All the charges in the current case are sealable.
-                case_decision.value = "All charges sealable"
+                case_value = "All charges sealable"
                 conclusion.value.append(
                     Sealing(client=crecord.person, cases=[sealable_parts_of_case])
                 )
-            elif any([decision.value == "Sealable" for decision in charge_decisions]):
+            elif len(sealable_charges) > 0:
                 # At least one charge in the current case is sealable.
-                case_decision.value = "Some charges sealable"
+                case_value = "Some charges sealable"
                 mod_rec.cases.append(unsealable_parts_of_case)
                 conclusion.value.append(
                     Sealing(client=crecord.person, cases=[sealable_parts_of_case])
                 )
             else:
-                case_decision.value = "No charges sealable"
+                case_value = "No charges sealable"
                 mod_rec.cases.append(unsealable_parts_of_case)
-            case_decision.reasoning.extend(charge_decisions)
-            conclusion.reasoning.append(case_decision)
+            if explain:
+                case_decision.value = case_value
+                conclusion.reasoning.append(case_decision)
     else:
         # the global conditions for sealing failed, so the modified record should contain all the cases.
         mod_rec.cases = crecord.cases
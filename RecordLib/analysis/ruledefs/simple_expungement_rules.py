@@ -18,7 +18,7 @@ Decision:
 The rules in this module all relate to expungemnts.
 
 """
-from RecordLib.crecord import CRecord, Charge, Person
+from RecordLib.crecord import CRecord, Charge, Person, evaluation
 from RecordLib.analysis import Decision
 
 
@@ -30,44 +30,58 @@ def is_over_age(person: Person, age_limit: int) -> Decision:
     )
 
 
+@evaluation.record_decision
 def years_since_last_contact(crec: CRecord, year_min: int) -> Decision:
+    years = crec.years_since_last_arrested_or_prosecuted()
     return Decision(
         name=f"Has {crec.person.first_name} been free of arrest or prosecution for {year_min} years?",
-        value=crec.years_since_last_arrested_or_prosecuted() >= 10,
-        reasoning=f"It has been {crec.years_since_last_arrested_or_prosecuted()} years.",
+        value=years >= 10,
+        reasoning=f"It has been {years} years.",
     )
 
 
+@evaluation.record_decision
 def years_since_final_release(crec: CRecord, year_min: int) -> Decision:
+    years = crec.years_since_final_release()
     return Decision(
         name=f"Has it been at least {year_min} years since {crec.person.first_name}'s final release from custody?",
-        value=crec.years_since_final_release() > year_min,
-        reasoning=f"It has been {crec.years_since_final_release()}.",
+        value=years > year_min,
+        reasoning=f"It has been {years}.",
     )
 
 
+@evaluation.record_decision
 def arrest_free_for_n_years(crec: CRecord, year_min=5) -> Decision:
+    years = crec.years_since_last_arrested_or_prosecuted()
     return Decision(
         name=f"Has {crec.person.first_name} been arrest free and prosecution free for five years?",
-        value=crec.years_since_last_arrested_or_prosecuted() > year_min,
-        reasoning=f"It has been {crec.years_since_last_arrested_or_prosecuted()} since the last arrest or prosecection.",
+        value=years > year_min,
+        reasoning=f"It has been {years} since the last arrest or prosecection.",
     )
 
 
 def is_summary(charge: Charge) -> Decision:
     return Decision(
         name=f"Is this charge for {charge.offense} a summary?",
-        value=charge.grade.strip() == "S",
+        value=charge_is_summary(charge),
         reasoning=f"The charge's grade is {charge.grade.strip()}",
     )
 
 
+def charge_is_summary(charge: Charge) -> bool:
+    """
+    What `is_summary` decides about a charge, without explaining it.
+    """
+    return charge.grade.strip() == "S"
+
+
 def is_conviction(charge: Charge) -> Decision:
+    conviction = charge.is_conviction()
     return Decision(
         name=f"Is this charge for {charge.offense} a conviction?",
-        value=charge.is_conviction(),
+        value=conviction,
         reasoning=f"The charge's disposition {charge.disposition} indicates a conviction"
-        if charge.is_conviction()
+        if conviction
         else f"The charge's disposition {charge.disposition} indicates its not a conviction.",
     )
 
@@ -77,6 +91,12 @@ def is_summary_conviction(charge: Charge) -> Decision:
         name=f"Is this charge for {charge.offense} a summary conviction?",
         reasoning=[is_summary(charge), is_conviction(charge)],
     )
-    charge_d.value = all(charge_d.reasoning)
+    charge_d.value = charge_is_summary_conviction(charge)
     return charge_d
 
+
+def charge_is_summary_conviction(charge: Charge) -> bool:
+    """
+    What `is_summary_conviction` decides about a charge, without explaining it.
+    """
+    return charge_is_summary(charge) and charge.is_conviction()
@@ -16,18 +16,130 @@ The rules in this module all relate to petition-based sealing..
 """
 
 from __future__ import annotations
-from RecordLib.crecord import CRecord, Charge
-from typing import Tuple, Union, List
+from RecordLib.crecord import CRecord, Case, Charge, evaluation
+from typing import FrozenSet, Tuple, Union, List
 import copy
 import json
 import re
 from RecordLib.analysis import Decision
 from RecordLib.petitions import Sealing
 import math
-from dateutil.relativedelta import relativedelta
-from datetime import date
+from bisect import bisect_right
+import threading
 
 
+class Exclusions:
+    """
+    Kinds of offenses that can't be sealed by petition, because of their statute.
+    """
+
+    ARTICLE_B = "Article B offense"
+    AGAINST_FAMILY = "Offense against the family"
+    FIREARMS = "Chapter 61 firearms offense"
+    TIERED_SEX_OFFENSE = "Tiered sexual or registration offense"
+    CORRUPTION_OF_MINORS = "Corruption of minors"
+
+
+# Sections of Title 18, as `Statute.key`s, that are tiered sexual or registration offenses.
+# 18 Pa.C.S. 9799.14 and 9799.55 relate to quite a few other offenses.
+TIERED_SEX_OFFENSES = frozenset(
+    [
+        "2901a.1",
+        "2902b",
+        "2903b",
+        "2904",
+        "2910b",
+        "3011b",
+        "3121",
+        "3122.1b",
+        "3123",
+        "3124.1",
+        "3124.2a",
+        "3124.2a.1",
+        "3124.2a2",
+        "3124.2a3",
+        "3125",
+        "3126a1",
+        "3126a2",
+        "3126a3",
+        "3126a4",
+        "3126a5",
+        "3126a6",
+        "3126a7",
+        "3126a8",
+        "4302b",
+        "5902b",
+        "5902b.1",
+        "5903a3ii",
+        "5903a4ii",
+        "5903a5ii",
+        "5903a6",
+        "6301a1ii",
+        "6312",
+        "6318",
+        "6320",
+        "7507.1",
+    ]
+)
+
+# Ranges of sections of Title 18, not including their ends, and the exclusions they trigger.
+EXCLUDED_SECTION_RANGES = [
+    (2300, 3300, Exclusions.ARTICLE_B),
+    (4300, 4500, Exclusions.AGAINST_FAMILY),
+    (6100, 6200, Exclusions.FIREARMS),
+]
+
+# The statute keys of Title 18 that trigger exclusions, and the ends of the excluded ranges,
+# in order, for `statute_exclusions`.
+_excluded_keys = {key: {Exclusions.TIERED_SEX_OFFENSE} for key in TIERED_SEX_OFFENSES}
+_excluded_keys.setdefault("6301a1", set()).add(Exclusions.CORRUPTION_OF_MINORS)
+_range_ends = [end for start, stop, _ in EXCLUDED_SECTION_RANGES for end in (start, stop)]
+_range_exclusions = [exclusion for _, _, exclusion in EXCLUDED_SECTION_RANGES]
+
+# The exclusions of the statutes already looked up, by the text of the statute.
+_statute_exclusions = dict()
+_statute_exclusions_lock = threading.Lock()
+
+
+def statute_exclusions(charge: Charge) -> FrozenSet[str]:
+    """
+    All the `Exclusions` the statute of a charge triggers, whether or not the charge is a conviction.
+
+    Each statute is only looked up once, so rules can ask for the exclusions of a charge as often
+    as they need to.
+    """
+    statute = charge.parsed_statute()
+    exclusions = _statute_exclusions.get(statute.text)
+    if exclusions is None:
+        exclusions = set()
+        if statute.title == 18:
+            exclusions.update(_excluded_keys.get(statute.key, ()))
+            if statute.section is not None:
+                i = bisect_right(_range_ends, statute.section)
+                if i % 2 == 1 and statute.section > _range_ends[i - 1]:
+                    exclusions.add(_range_exclusions[i // 2])
+        with _statute_exclusions_lock:
+            exclusions = _statute_exclusions.setdefault(
+                statute.text, frozenset(exclusions)
+            )
+    return exclusions
+
+
+def charge_is_excluded(charge: Charge, exclusion: str) -> bool:
+    """
+    Whether one of the `Exclusions` keeps a charge from being sealed: the charge's statute
+    triggers it, and the charge is a conviction. Firearms offenses are excluded whether or not
+    they are convictions.
+
+    This is what the `no_..._offense` rules decide about a charge, and what the record-wide
+    versions of those rules count, without explaining it.
+    """
+    return exclusion in statute_exclusions(charge) and (
+        exclusion == Exclusions.FIREARMS or charge.is_conviction()
+    )
+
+
+@evaluation.record_decision
 def no_danger_to_person_offense(
     item: Union[CRecord, Charge],
     within_years: int,
@@ -53,9 +165,8 @@ def no_danger_to_person_offense(
     """
     # Suppose `item` is a whole Record.
     try:
-        decision = Decision(
-            name="No convictions in the record for article B offenses, felonies or punishable by more than 7 years, in the last 20 years.",
-            reasoning=[
+        if evaluation.explaining():
+            reasoning = [
                 no_danger_to_person_offense(
                     charge,
                     within_years=within_years,
@@ -64,35 +175,40 @@ def no_danger_to_person_offense(
                 )
                 for case in item.cases
                 for charge in case.charges
-            ],
+            ]
+            value = all(reasoning)
+        else:
+            reasoning = [
+                charge
+                for case in item.cases
+                for charge in case.charges
+                if charge_is_excluded(charge, Exclusions.ARTICLE_B)
+            ]
+            value = len(reasoning) == 0
+        decision = Decision(
+            name="No convictions in the record for article B offenses, felonies or punishable by more than 7 years, in the last 20 years.",
+            reasoning=reasoning,
+            value=value,
         )
-        decision.value = all(decision.reasoning)
     except AttributeError:
         # `item` is probably a charge.
-        decision = Decision(name="Is this not a conviction for an Article B offense")
-        try:
-            if (
-                item.get_statute_chapter() == 18
-                and item.get_statute_section() > 2300
-                and item.get_statute_section() < 3300
-                and item.is_conviction()
-            ):
-                decision.value = False
-                decision.reasoning = (
-                    f"Statute {item.statute} is an Article B conviction"
-                )
-            else:
-                decison.value = True
-                decison.reasoning = (
-                    f"Statute {item.statute} appears not to be an Article B conviction."
-                )
-        except:
-            decision.value = True
+        decision = Decision(
+            name="Is this not a conviction for an Article B offense",
+            value=not charge_is_excluded(item, Exclusions.ARTICLE_B),
+        )
+        if item.parsed_statute().section is None:
             decision.reasoning = f"Couldn't read the statute {item.statute}, so its probably not Article B."
+        elif decision.value is False:
+            decision.reasoning = f"Statute {item.statute} is an Article B conviction"
+        else:
+            decision.reasoning = (
+                f"Statute {item.statute} appears not to be an Article B conviction."
+            )
 
     return decision
 
 
+@evaluation.record_decision
 def ten_years_since_last_conviction(crecord: CRecord) -> Decision:
     """
     Person is not eligible for sealing unless they have been "free from conviction
@@ -107,12 +223,7 @@ def ten_years_since_last_conviction(crecord: CRecord) -> Decision:
     decision = Decision(
         name="Has the person been free of conviction for at least 10 years?",
     )
-    convictions = [
-        case
-        for case in crecord.cases
-        for charge in case.charges
-        if charge.is_conviction()
-    ]
+    convictions = [case for case in crecord.cases for _ in case.convictions()]
     if len(convictions) == 0:
         decision.value = True
         decision.reasoning = "The person appears to have no convictions."
@@ -131,9 +242,9 @@ def ten_years_since_last_conviction(crecord: CRecord) -> Decision:
         convictions_with_disposition_dates, key=lambda c: c.disposition_date
     )
     # years_since_last_conviction = min([case.years_passed_disposition() for case in crecord.cases for charge in case.charges if charge.is_conviction()])
-    years_since_last_conviction = relativedelta(
-        date.today(), last_conviction.disposition_date
-    ).years
+    years_since_last_conviction = evaluation.years_since(
+        last_conviction.disposition_date
+    )
 
     decision.reasoning = (
         f"It has been {years_since_last_conviction} years since the last conviction on "
@@ -191,28 +302,37 @@ def not_felony1(charge: Charge) -> Decision:
     Returns:
         a True decision if the charge was NOT a felony1 conviction.
     """
-    decision = Decision(name="Is the charge an F1 conviction?")
+    decision = Decision(
+        name="Is the charge an F1 conviction?",
+        value=not charge_might_be_f1_conviction(charge),
+    )
     if charge.grade.strip() == "":
-        decision.value = False
         decision.reasoning = (
             "The charge's grade is unknown, so we don't know its *not* an F1."
         )
     elif re.match("F1", charge.grade):
-        if charge.is_conviction():
-            decision.value = False
+        if decision.value is False:
             decision.reasoning = "The charge is an F1 conviction"
         else:
-            decision.value = True
             decision.reasoning = (
                 f"The charge was F1, but the disposition was {charge.disposition}"
             )
     else:
-        decision.value = True
         decision.reasoning = f"The charge is {charge.grade}, which is not F1"
 
     return decision
 
 
+def charge_might_be_f1_conviction(charge: Charge) -> bool:
+    """
+    What `not_felony1` decides about a charge, without explaining it: the charge is an F1
+    conviction, or its grade is unknown.
+    """
+    if charge.grade.strip() == "":
+        return True
+    return re.match("F1", charge.grade) is not None and charge.is_conviction()
+
+
 def not_murder(charge: Charge) -> Decision:
     """
     Checks if a charge was a conviction for murder. 
@@ -222,20 +342,30 @@ def not_murder(charge: Charge) -> Decision:
 
     TODO The Expungement Generator's test is for the statute 18 PaCS 1502. Does the implementation here even work? Need to find real murder convictions to see.
     """
-    decision = Decision(name="Is the charge NOT a murder conviction?")
-    if charge.is_conviction():
-        if re.match("murder", charge.offense, re.IGNORECASE):
-            decision.value = False
-            decision.reasoning = "The charge was a murder conviction."
-        else:
-            decision.value = True
-            decision.reasoning = "Conviction for something other than murder."
+    decision = Decision(
+        name="Is the charge NOT a murder conviction?",
+        value=not charge_is_murder_conviction(charge),
+    )
+    if decision.value is False:
+        decision.reasoning = "The charge was a murder conviction."
+    elif charge.is_conviction():
+        decision.reasoning = "Conviction for something other than murder."
     else:
-        decision.value = True
         decision.reasoning = "Not a conviction."
     return decision
 
 
+def charge_is_murder_conviction(charge: Charge) -> bool:
+    """
+    What `not_murder` decides about a charge, without explaining it.
+    """
+    return (
+        charge.is_conviction()
+        and re.match("murder", charge.offense, re.IGNORECASE) is not None
+    )
+
+
+@evaluation.record_decision
 def no_f1_convictions(crecord: CRecord) -> Decision:
     """
     Any conviction for Murder, any F1 conviction, or any conviction punishable by imprisonment of 
@@ -250,12 +380,22 @@ def no_f1_convictions(crecord: CRecord) -> Decision:
         True if the charge is not a disqualifying conviction.
     """
     decision = Decision(name="No F1 or murder convictions in the record?")
-    decision.reasoning = [
-        not_felony1(charge) and not_murder(charge)
-        for case in crecord.cases
-        for charge in case.charges
-    ]
-    decision.value = all(decision.reasoning)
+    if evaluation.explaining():
+        decision.reasoning = [
+            not_felony1(charge) and not_murder(charge)
+            for case in crecord.cases
+            for charge in case.charges
+        ]
+        decision.value = all(decision.reasoning)
+    else:
+        decision.reasoning = [
+            charge
+            for case in crecord.cases
+            for charge in case.charges
+            if charge_might_be_f1_conviction(charge)
+            or charge_is_murder_conviction(charge)
+        ]
+        decision.value = len(decision.reasoning) == 0
     return decision
 
 
@@ -280,6 +420,7 @@ def is_felony_conviction(charge: Charge) -> Decision:
     return decision
 
 
+@evaluation.record_decision
 def any_felony_convictions_n_years(crecord: CRecord, years: int) -> Decision:
     """
     Were there any felony convictions in the last `years` years?
@@ -316,20 +457,26 @@ def is_misdemeanor_or_ungraded(charge: Charge) -> Decision:
         True if the charge is not a disqualifying conviction.
     """
     decision = Decision(
-        name="The offense is a misdemeanor or nongraded offense w/ a penalty of <= 5 years."
+        name="The offense is a misdemeanor or nongraded offense w/ a penalty of <= 5 years.",
+        value=charge_is_misdemeanor_or_ungraded(charge),
     )
     if re.match("^M", charge.grade):
         decision.reasoning = "Charge is a misdemeanor"
-        decision.value = True
     elif charge.grade.strip() == "":
         decision.reasoning = "Charge is ungraded. But be careful - we don't know the maximum penalty for the offense."
-        decision.value = True
     else:
         decision.reasoning = "Charge is neither a misdemeanor nor ungraded."
-        decision.value = False
     return decision
 
 
+def charge_is_misdemeanor_or_ungraded(charge: Charge) -> bool:
+    """
+    What `is_misdemeanor_or_ungraded` decides about a charge, without explaining it.
+    """
+    return re.match("^M", charge.grade) is not None or charge.grade.strip() == ""
+
+
+@evaluation.record_decision
 def no_offense_against_family(
     item: Union[CRecord, Charge],
     penalty_limit: int,
@@ -351,32 +498,26 @@ def no_offense_against_family(
     """
     # Presume a Charge
     try:
-        decision = Decision(
-            name=f"Charge for {item.statute} is not an offense against the family.",
-            reasoning=[
-                item.is_conviction(),
-                item.get_statute_chapter() == 18,
-                item.get_statute_section() > 4300,
-                item.get_statute_section() < 4500,
-            ],
-        )
-        decision.value = not all(decision.reasoning)
-    except TypeError:
-        # `item`'s get_statute functions returned something that doesn't have < > defined, such as None.
-        decision = Decision(
-            name=f"Charge for {item.statute} is not an offense against the family.",
-            reasoning="The statute doesn't appear to be one of the Article D offense statutes.",
-            value=True,
-        )
+        if item.parsed_statute().section is None:
+            decision = Decision(
+                name=f"Charge for {item.statute} is not an offense against the family.",
+                reasoning="The statute doesn't appear to be one of the Article D offense statutes.",
+                value=True,
+            )
+        else:
+            decision = Decision(
+                name=f"Charge for {item.statute} is not an offense against the family.",
+                reasoning=[
+                    item.is_conviction(),
+                    Exclusions.AGAINST_FAMILY in statute_exclusions(item),
+                ],
+                value=not charge_is_excluded(item, Exclusions.AGAINST_FAMILY),
+            )
     except AttributeError:
         # `item` may be a whole record.
-        decision = Decision(
-            name=(
-                f"Not convicted within {within_years} more than {conviction_limit} times "
-                + f"of felony or offense punishable by {penalty_limit} years."
-            ),
-            # reasoning should be a list of charges w/in 20 years where no_offense_fam(charge) is False
-            reasoning=[
+        # reasoning should be a list of charges w/in 20 years where no_offense_fam(charge) is False
+        if evaluation.explaining():
+            reasoning = [
                 no_offense_against_family(
                     charge,
                     penalty_limit=penalty_limit,
@@ -386,15 +527,32 @@ def no_offense_against_family(
                 for case in item.cases
                 for charge in case.charges
                 if case.years_passed_disposition() <= within_years
-            ],
-        )
-        decision.value = (
-            len(list(filter(lambda d: bool(d) is False, decision.reasoning)))
-            < conviction_limit
+            ]
+            value = (
+                len(list(filter(lambda d: bool(d) is False, reasoning)))
+                < conviction_limit
+            )
+        else:
+            reasoning = [
+                charge
+                for case in item.cases
+                for charge in case.charges
+                if case.years_passed_disposition() <= within_years
+                and charge_is_excluded(charge, Exclusions.AGAINST_FAMILY)
+            ]
+            value = len(reasoning) < conviction_limit
+        decision = Decision(
+            name=(
+                f"Not convicted within {within_years} more than {conviction_limit} times "
+                + f"of felony or offense punishable by {penalty_limit} years."
+            ),
+            reasoning=reasoning,
+            value=value,
         )
     return decision
 
 
+@evaluation.record_decision
 def no_firearms_offense(
     item: Union[CRecord, Charge],
     penalty_limit: int,
@@ -417,31 +575,23 @@ def no_firearms_offense(
     """
     # assume item is a charge.
     try:
-        decision = Decision(
-            name=f"Charge for {item.statute} is not a firearms offense.",
-            reasoning=[
-                item.get_statute_chapter() == 18,
-                item.get_statute_section() > 6100,
-                item.get_statute_section() < 6200,
-            ],
-        )
-        decision.value = not all(decision.reasoning)
-    except TypeError:
-        # `item`'s get_statute functions returned something that doesn't have < > defined, such as None.
-        decision = Decision(
-            name=f"Charge for {item.statute} is not a Chapter 61 firearms offense.",
-            reasoning="The statute doesn't appear to be one of the Article D offense statutes.",
-            value=True,
-        )
+        if item.parsed_statute().section is None:
+            decision = Decision(
+                name=f"Charge for {item.statute} is not a Chapter 61 firearms offense.",
+                reasoning="The statute doesn't appear to be one of the Article D offense statutes.",
+                value=True,
+            )
+        else:
+            decision = Decision(
+                name=f"Charge for {item.statute} is not a firearms offense.",
+                reasoning=[Exclusions.FIREARMS in statute_exclusions(item)],
+                value=not charge_is_excluded(item, Exclusions.FIREARMS),
+            )
     except AttributeError:
         # `item` may be a whole record.
-        decision = Decision(
-            name=(
-                f"Not convicted within {within_years} more than {conviction_limit} times "
-                + f"of felony or offense punishable by {penalty_limit} years."
-            ),
-            # reasoning should be a list of charges w/in 20 years where no_offense_fam(charge) is False
-            reasoning=[
+        # reasoning should be a list of charges w/in 20 years where no_offense_fam(charge) is False
+        if evaluation.explaining():
+            reasoning = [
                 no_firearms_offense(
                     charge,
                     penalty_limit=penalty_limit,
@@ -451,15 +601,32 @@ def no_firearms_offense(
                 for case in item.cases
                 for charge in case.charges
                 if case.years_passed_disposition() <= within_years
-            ],
-        )
-        decision.value = (
-            len(list(filter(lambda d: bool(d) is False, decision.reasoning)))
-            < conviction_limit
+            ]
+            value = (
+                len(list(filter(lambda d: bool(d) is False, reasoning)))
+                < conviction_limit
+            )
+        else:
+            reasoning = [
+                charge
+                for case in item.cases
+                for charge in case.charges
+                if case.years_passed_disposition() <= within_years
+                and charge_is_excluded(charge, Exclusions.FIREARMS)
+            ]
+            value = len(reasoning) < conviction_limit
+        decision = Decision(
+            name=(
+                f"Not convicted within {within_years} more than {conviction_limit} times "
+                + f"of felony or offense punishable by {penalty_limit} years."
+            ),
+            reasoning=reasoning,
+            value=value,
         )
     return decision
 
 
+@evaluation.record_decision
 def no_sexual_offense(
     item: Union[CRecord, Charge],
     penalty_limit: int,
@@ -481,76 +648,26 @@ def no_sexual_offense(
         True if the charge was NOT a disqualifying offense, or if the record does NOT contain any 
         disqulifying offenses.
     """
-    # 18 Pa.C.S. 9799.14 and 9799.55 relate to quite a few other offenses.
-    tiered_sex_offenses = [
-        "2901a.1",
-        "2902b",
-        "2903b",
-        "2904",
-        "2910b",
-        "3011b",
-        "3121",
-        "3122.1b",
-        "3123",
-        "3124.1",
-        "3124.2a",
-        "3124.2a.1",
-        "3124.2a2",
-        "3124.2a3",
-        "3125",
-        "3126a1",
-        "3126a2",
-        "3126a3",
-        "3126a4",
-        "3126a5",
-        "3126a6",
-        "3126a7",
-        "3126a8",
-        "4302b",
-        "5902b",
-        "5902b.1",
-        "5903a3ii",
-        "5903a4ii",
-        "5903a5ii",
-        "5903a6",
-        "6301a1ii",
-        "6312",
-        "6318",
-        "6320",
-        "7507.1",
-    ]
     # presume item is a Charge
     try:
         decision = Decision(
             name="This charge is not a disqualifying sexual or registration offense?"
         )
-        patt = re.compile(
-            r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*(?P<subsections>[\(\)A-Za-z0-9\.]+).*"
-        )
-        matches = patt.match(item.statute)
-        if not matches:
+        if item.parsed_statute().key is None:
             decision.reasoning = (
                 "This doesn't appear to be one of the tiered sex offense statutes."
             )
             decision.value = True
         else:
-            this_offense = matches.group("section") + matches.group(
-                "subsections"
-            ).replace("(", "").replace(")", "")
             decision.reasoning = [
                 item.is_conviction(),
-                item.get_statute_chapter() == 18,
-                this_offense in tiered_sex_offenses,
+                Exclusions.TIERED_SEX_OFFENSE in statute_exclusions(item),
             ]
-            decision.value = not all(decision.reasoning)
+            decision.value = not charge_is_excluded(item, Exclusions.TIERED_SEX_OFFENSE)
     except AttributeError:
         # item is a CRecord
-        decision = Decision(
-            name=(
-                f"Not convicted within {within_years} more than {conviction_limit} times "
-                + f"of certain sexual or registration-related offenses punishable by {penalty_limit} years"
-            ),
-            reasoning=[
+        if evaluation.explaining():
+            reasoning = [
                 no_sexual_offense(
                     charge,
                     penalty_limit=penalty_limit,
@@ -560,11 +677,27 @@ def no_sexual_offense(
                 for case in item.cases
                 for charge in case.charges
                 if case.years_passed_disposition() <= within_years
-            ],
-        )
-        decision.value = (
-            len(list(filter(lambda d: bool(d) is False, decision.reasoning)))
-            < conviction_limit
+            ]
+            value = (
+                len(list(filter(lambda d: bool(d) is False, reasoning)))
+                < conviction_limit
+            )
+        else:
+            reasoning = [
+                charge
+                for case in item.cases
+                for charge in case.charges
+                if case.years_passed_disposition() <= within_years
+                and charge_is_excluded(charge, Exclusions.TIERED_SEX_OFFENSE)
+            ]
+            value = len(reasoning) < conviction_limit
+        decision = Decision(
+            name=(
+                f"Not convicted within {within_years} more than {conviction_limit} times "
+                + f"of certain sexual or registration-related offenses punishable by {penalty_limit} years"
+            ),
+            reasoning=reasoning,
+            value=value,
         )
     return decision
 
@@ -584,28 +717,21 @@ def no_corruption_of_minors_offense(
     decision = Decision(
         name="This charge is not a disqualifying corruption of minors offense?"
     )
-    patt = re.compile(
-        r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*(?P<subsections>[\(\)A-Za-z0-9\.]+).*"
-    )
-    matches = patt.match(charge.statute)
-    if not matches:
+    if charge.parsed_statute().key is None:
         decision.reasoning = (
             "This doesn't appear to be one of the tiered sex offense statutes."
         )
         decision.value = True
     else:
-        this_offense = matches.group("section") + matches.group("subsections").replace(
-            "(", ""
-        ).replace(")", "")
         decision.reasoning = [
             charge.is_conviction(),
-            charge.get_statute_chapter() == 18,
-            this_offense == "6301a1",
+            Exclusions.CORRUPTION_OF_MINORS in statute_exclusions(charge),
         ]
-        decision.value = not all(decision.reasoning)
+        decision.value = not charge_is_excluded(charge, Exclusions.CORRUPTION_OF_MINORS)
     return decision
 
 
+@evaluation.record_decision
 def more_than_x_convictions_y_grade_z_years(
     crecord: CRecord, offense_limit: int, grade_limit: str, years: int
 ) -> Decision:
@@ -643,6 +769,20 @@ def more_than_x_convictions_y_grade_z_years(
     return decision
 
 
+@evaluation.case_decision
+def _convictions_within(case: Case, within_years: int) -> List[Charge]:
+    """
+    The convictions of a case, if it was disposed of less than `within_years` years ago.
+
+    Several rules count the recent convictions in a record, so each case's are found once and
+    shared.
+    """
+    if case.years_passed_disposition() < within_years:
+        return case.convictions()
+    return []
+
+
+@evaluation.record_decision
 def offenses_punishable_by_two_or_more_years(
     crecord: CRecord, conviction_limit: int, within_years: int
 ) -> Decision:
@@ -671,12 +811,8 @@ def offenses_punishable_by_two_or_more_years(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                charge.is_conviction()
-                and (charge.grade in proxy_grades)
-                and case.years_passed_disposition() < within_years
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.grade in proxy_grades
         ],
     )
     decision.value = len(decision.reasoning) < conviction_limit
@@ -684,6 +820,7 @@ def offenses_punishable_by_two_or_more_years(
     return decision
 
 
+@evaluation.record_decision
 def no_indecent_exposure(
     crecord, conviction_limit: int, within_years: int = 15
 ) -> Decision:
@@ -701,19 +838,15 @@ def no_indecent_exposure(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 3127
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.parsed_statute().is_section(18, 3127)
         ],
     )
     decision.value = True if len(decision.reasoning) < conviction_limit else False
     return decision
 
 
+@evaluation.record_decision
 def no_sexual_intercourse_w_animal(
     crecord: CRecord, conviction_limit: int, within_years: int = 15
 ) -> Decision:
@@ -730,19 +863,15 @@ def no_sexual_intercourse_w_animal(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 3129
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.parsed_statute().is_section(18, 3129)
         ],
     )
     decision.value = True if len(decision.reasoning) < conviction_limit else False
     return decision
 
 
+@evaluation.record_decision
 def no_failure_to_register(
     crecord: CRecord, conviction_limit: int, within_years: int = 15
 ) -> Decision:
@@ -759,22 +888,15 @@ def no_failure_to_register(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and (
-                    charge.get_statute_section() == 4915.1
-                    or charge.get_statute_section() == 4915.2
-                )
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.parsed_statute().is_section(18, 4915.1, 4915.2)
         ],
     )
     decision.value = True if len(decision.reasoning) < conviction_limit else False
     return decision
 
 
+@evaluation.record_decision
 def no_weapons_of_escape(
     crecord: CRecord, conviction_limit: int, within_years: int = 15
 ) -> Decision:
@@ -788,19 +910,15 @@ def no_weapons_of_escape(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 5122
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.parsed_statute().is_section(18, 5122)
         ],
     )
     decision.value = True if len(decision.reasoning) < conviction_limit else False
     return decision
 
 
+@evaluation.record_decision
 def no_abuse_of_corpse(
     crecord: CRecord, conviction_limit: int, within_years: int = 15
 ) -> Decision:
@@ -814,19 +932,15 @@ def no_abuse_of_corpse(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 5510
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.parsed_statute().is_section(18, 5510)
         ],
     )
     decision.value = True if len(decision.reasoning) < conviction_limit else False
     return decision
 
 
+@evaluation.record_decision
 def no_paramilitary_training(
     crecord: CRecord, conviction_limit: int, within_years: int = 15
 ) -> Decision:
@@ -840,19 +954,15 @@ def no_paramilitary_training(
         reasoning=[
             charge
             for case in crecord.cases
-            for charge in case.charges
-            if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 5515
-            )
+            for charge in _convictions_within(case, within_years)
+            if charge.parsed_statute().is_section(18, 5515)
         ],
     )
     decision.value = True if len(decision.reasoning) < conviction_limit else False
     return decision
 
 
+@evaluation.record_decision
 def full_record_requirements_for_petition_sealing(crecord: CRecord) -> Decision:
     """
     To seal a case or charge by petition, there are requirements that the record as a whole must satisfy. 
@@ -909,10 +1019,9 @@ def petition_sealing_for_single_case(case: Case) -> Decision:
     case_decision = Decision(name=f"Sealing case {case.docket_number}", reasoning=[])
     fines_decision = fines_and_costs_paid(case)  # 18 Pa.C.S. 9122.1(a)
     case_decision.reasoning.append(fines_decision)
-    # create copies of a case that don't include any charges.
-    # sealable or unsealable charges will be added to these.
-    sealable_parts_of_case = case.partialcopy()
-    unsealable_parts_of_case = case.partialcopy()
+    # Sealable and unsealable charges will be added to these, and then split into copies of the case.
+    sealable_charges = []
+    unsealable_charges = []
 
     # Iterate over the charges in a case, to see which charges are sealable.
     charge_decisions = []
@@ -921,9 +1030,11 @@ def petition_sealing_for_single_case(case: Case) -> Decision:
         charge_decision = petition_sealing_for_single_charge(charge)
         charge_decisions.append(charge_decision)
         if bool(charge_decision) is True:
-            sealable_parts_of_case.charges.append(charge)
+            sealable_charges.append(charge)
         else:
-            unsealable_parts_of_case.charges.append(charge)
+            unsealable_charges.append(charge)
+    sealable_parts_of_case = case.with_charges(sealable_charges)
+    unsealable_parts_of_case = case.with_charges(unsealable_charges)
 
     case_decision.value = (
         unsealable_parts_of_case if len(unsealable_parts_of_case.charges) > 0 else None,
@@ -959,5 +1070,21 @@ def petition_sealing_for_single_charge(charge: Charge):
             charge, penalty_limit=2, conviction_limit=1, within_years=float("Inf"),
         ),
     ]
-    charge_decision.value = all(charge_decision.reasoning)
+    charge_decision.value = charge_is_sealable(charge)
     return charge_decision
+
+
+def charge_is_sealable(charge: Charge) -> bool:
+    """
+    What `petition_sealing_for_single_charge` decides about a charge, without explaining it.
+    """
+    return charge_is_misdemeanor_or_ungraded(charge) and not any(
+        charge_is_excluded(charge, exclusion)
+        for exclusion in (
+            Exclusions.ARTICLE_B,
+            Exclusions.AGAINST_FAMILY,
+            Exclusions.FIREARMS,
+            Exclusions.TIERED_SEX_OFFENSE,
+            Exclusions.CORRUPTION_OF_MINORS,
+        )
+    )
@@ -1,7 +1,7 @@
-from .crecord import CRecord
+from .crecord import CRecord, Cases
 from .attorney import Attorney
 from .case import Case
 from .person import Person
 from .common import (
-    Sentence, SentenceLength, Charge, Address
+    Sentence, SentenceLength, Charge, ChargeMerger, Address, Statute, DispositionTypes
 )
\ No newline at end of file
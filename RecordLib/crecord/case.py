@@ -5,16 +5,37 @@ from .person import Person
 from typing import List, Optional
 from datetime import date, datetime
 import logging
-from dateutil.relativedelta import relativedelta
 from .helpers import convert_datestring
+from . import evaluation
 
 
 class Case:
     """
     Track information about a case
 
+    A record can hold thousands of cases, so a Case keeps its attributes in `__slots__`
+    instead of a `__dict__`.
     """
 
+    __slots__ = (
+        "docket_number",
+        "otn",
+        "dc",
+        "charges",
+        "total_fines",
+        "fines_paid",
+        "status",
+        "county",
+        "arrest_date",
+        "complaint_date",
+        "disposition_date",
+        "judge",
+        "judge_address",
+        "affiant",
+        "arresting_agency",
+        "arresting_agency_address",
+    )
+
     status: str
     county: str
     docket_number: str
@@ -98,12 +119,23 @@ class Case:
         self.arresting_agency_address = arresting_agency_address
 
     def years_passed_disposition(self) -> int:
-        """ The number of years that have passed since the disposition date of this case."""
+        """ The number of years that have passed since the disposition date of this case.
+
+        Counted up to the date the case is being evaluated as of. See `evaluation`.
+        """
         try:
-            return relativedelta(date.today(), self.disposition_date).years
+            return evaluation.years_since(self.disposition_date)
         except Exception:
             return 0
 
+    @evaluation.case_decision
+    def convictions(self) -> List[Charge]:
+        """ The charges of this case that are convictions, in order.
+
+        Inside of an `evaluation.EvaluationContext`, they're only found once for each case.
+        """
+        return [charge for charge in self.charges if charge.is_conviction()]
+
     def last_action(self) -> date:
         """
         The last arrest or disposition that happened in a case.
@@ -170,6 +202,24 @@ class Case:
             arresting_agency_address=self.arresting_agency_address,
         )
 
+    def with_charges(self, charges: List[Charge]) -> Case:
+        """
+        Return this case, if `charges` are all of its charges, or else a copy of this case (see
+        `partialcopy`) with just `charges`.
+
+        Rules use this to split the charges of a case without copying cases whose charges all end up
+        on the same side. The case returned may be shared with the record it came from, so it
+        shouldn't be changed in place.
+
+        Args:
+            charges: Some of the charges of this case, in the same order.
+        """
+        if len(charges) == len(self.charges):
+            return self
+        case = self.partialcopy()
+        case.charges = charges
+        return case
+
     def fines_remaining(self) -> Optional[int]:
         """ Return the value of the fines remaining on the case.
 
@@ -203,8 +253,7 @@ class Case:
         the parser did. Using 'completeness', we can compare cases to each other to evaluate whether one case is more completed than another.
         """
         score = 0
-        attrs = self.__dict__.keys()
-        for attr in attrs:
+        for attr in self.__slots__:
             # sometimes an attribute is given a blank value, like docket_number='', but that shouldn't count as a filled-in value.
             val = getattr(self, attr)
             if val is not None:
@@ -1,18 +1,23 @@
 """
 Common, simple dataclasses live here.
+
+A record can hold tens of thousands of these, so they keep their fields in `__slots__` (see
+`helpers.add_slots`) instead of a `__dict__` per instance.
 """
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import List, Tuple, Optional
 from datetime import date, timedelta
 import re
 import logging
+import threading
 from dateutil.relativedelta import relativedelta
 import json
-import functools
+from .helpers import add_slots
 
 logger = logging.getLogger(__name__)
 
+@add_slots
 @dataclass
 class SentenceLength:
     """
@@ -89,6 +94,7 @@ class SentenceLength:
         return cls(min_time=min_time, max_time=max_time)
 
 
+@add_slots
 @dataclass
 class Sentence:
     """
@@ -112,6 +118,150 @@ class Sentence:
             return None
 
 
+# Patterns for reading statutes, like "18 § 3921 §§ A".
+_statute_title = re.compile(r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+)")
+_statute_section = re.compile(r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)")
+_statute_subsections = re.compile(
+    r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*§§\s*(?P<subsections>[\(\)A-Za-z0-9\.\*]+)"
+)
+_statute_key = re.compile(
+    r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*(?P<subsections>[\(\)A-Za-z0-9\.]+)"
+)
+
+# Statutes already parsed, by their text.
+_statutes = dict()
+_statutes_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Statute:
+    """
+    A statute, like "18 § 3921 §§ A", read into its parts.
+
+    Statutes are parsed once per process (see `Statute.parse`), and shared by every charge with
+    the same statute, so they can't be changed.
+
+    Attributes:
+        text: The statute, as it was written.
+        title: The title of the PA Code, like 18, or None if the statute couldn't be read.
+        section: The section of the title, like 3921 or 4915.1, or None if the statute couldn't
+            be read.
+        subsections: The subsections after a "§§", like "A1*", or "".
+        key: The section and any subsections written right after it, without parentheses,
+            which is how lists of offenses name statutes. "6301a1" for "18 § 6301(a)(1)", but
+            "3921" for "18 § 3921 §§ A". None if the statute couldn't be read.
+    """
+
+    text: str
+    title: Optional[float]
+    section: Optional[float]
+    subsections: str
+    key: Optional[str]
+
+    @staticmethod
+    def parse(text: str) -> Statute:
+        """
+        Read a statute, or return the Statute already read from the same text.
+        """
+        statute = _statutes.get(text)
+        if statute is None:
+            statute = Statute.from_text(text)
+            with _statutes_lock:
+                statute = _statutes.setdefault(text, statute)
+        return statute
+
+    @staticmethod
+    def from_text(text: str) -> Statute:
+        """
+        Read a statute, without looking for one already read.
+        """
+        title = _statute_title.match(text)
+        section = _statute_section.match(text)
+        subsections = _statute_subsections.match(text)
+        key = _statute_key.match(text)
+        return Statute(
+            text=text,
+            title=float(title.group("chapt")) if title else None,
+            section=float(section.group("section")) if section else None,
+            subsections=subsections.group("subsections") if subsections else "",
+            key=(
+                key.group("section")
+                + key.group("subsections").replace("(", "").replace(")", "")
+                if key
+                else None
+            ),
+        )
+
+    def is_section(self, title: float, *sections: float) -> bool:
+        """
+        Is this statute one of `sections` of `title`?
+        """
+        return self.title == title and self.section in sections
+
+
+# Dispositions that end a charge (see `Charge.combine_with`), and dispositions of charges that
+# haven't ended yet.
+_final_disposition = re.compile(r"nolle|guilt|dismiss|withdraw", re.I)
+_ard_disposition = re.compile(r"\bARD\b|accelerated rehabilitative", re.I)
+_pending_disposition = re.compile(
+    r"held for court|proceed to court|pending|awaiting", re.I
+)
+
+# Classifications of the dispositions already seen, by the text of the disposition.
+_disposition_types = dict()
+_disposition_types_lock = threading.Lock()
+
+
+class DispositionTypes:
+    """
+    Kinds of dispositions of a charge.
+
+    There are many ways of writing each disposition, but only a few hundred in all (RedisHelper
+    collects the ones it sees), so each way is classified once per process, by `classify`.
+    """
+
+    CONVICTION = "Conviction"
+    NON_CONVICTION = "Non-conviction"
+    ARD = "ARD"
+    PENDING = "Pending"
+    UNKNOWN = "Unknown"
+
+    @staticmethod
+    def classify(disposition: Optional[str]) -> str:
+        """
+        The kind of a disposition, like "Guilty Plea" or "Nolle Prossed".
+
+        Dispositions that start with "Guilty" are convictions. Other dispositions that end a charge,
+        like "Not Guilty", "Dismissed" or "Withdrawn", are non-convictions.
+        """
+        disposition_type = _disposition_types.get(disposition)
+        if disposition_type is None:
+            disposition_type = DispositionTypes.from_text(disposition)
+            with _disposition_types_lock:
+                disposition_type = _disposition_types.setdefault(
+                    disposition, disposition_type
+                )
+        return disposition_type
+
+    @staticmethod
+    def from_text(disposition: Optional[str]) -> str:
+        """
+        Classify a disposition, without looking for it among the dispositions already classified.
+        """
+        if disposition is None:
+            return DispositionTypes.UNKNOWN
+        if disposition.strip().startswith("Guilty"):
+            return DispositionTypes.CONVICTION
+        if _final_disposition.search(disposition):
+            return DispositionTypes.NON_CONVICTION
+        if _ard_disposition.search(disposition):
+            return DispositionTypes.ARD
+        if _pending_disposition.search(disposition):
+            return DispositionTypes.PENDING
+        return DispositionTypes.UNKNOWN
+
+
+@add_slots
 @dataclass
 class Charge:
     """
@@ -174,36 +324,26 @@ class Charge:
         In a Docket, there's often a number of records relating to a single charge. There records explain
         how a charge proceeded through the case. When we parse a docket, if we find lots of records of 
         charges, we need to reduce them into a list where each charge only appears once.
+
+        The charges are merged in a single pass (see ChargeMerger). Charges without an integer sequence 
+        number are never merged.
         """
-        def reducer(accumulator, charge):
-            """
-            Add charge to accumulator, if the charge is new. Otherwise combine charge with its pre-existing charge.
-            """
-            if len(accumulator) == 0:
-                return [charge]
-            new_charges = []
-            is_new = True
-            for ch in accumulator:
-                if isinstance(charge.sequence, int) and charge.sequence == ch.sequence:
-                    ch.combine_with(charge)
-                    is_new = False
-            if is_new: accumulator.append(charge)
-            return accumulator
-        reduced = functools.reduce(reducer, charges, [])
-        return  reduced
+        merger = ChargeMerger()
+        merger.add_all(charges)
+        return merger.charges
     
     def combine_with(self, charge) -> Charge:
         """
         Combine this Charge with another, filling in missing info, or updating certain fields.
         """
-        for attr in self.__dict__.keys():
+        for attr in (f.name for f in fields(self)):
             if getattr(self, attr) is None and getattr(charge,attr) is not None:
                 setattr(self,attr,getattr(charge,attr))
             elif ((isinstance(getattr(self,attr),str) and getattr(self, attr).strip() == "") and 
                   (isinstance(getattr(charge,attr),str) and (getattr(charge,attr).strip() != ""))):
                 setattr(self,attr,getattr(charge,attr))
             elif attr == "disposition":
-                if re.search(r"nolle|guilt|dismiss|withdraw",charge.disposition,re.I):
+                if charge.disposition_type() in (DispositionTypes.CONVICTION, DispositionTypes.NON_CONVICTION):
                     # the new charge has a disposition that should be saved as the final disposition of this charge.
                     self.disposition = charge.disposition
                     self.disposition_date = getattr(charge,"disposition_date",None)
@@ -215,42 +355,69 @@ class Charge:
 
         There are lots of different dispositions, and this helps identify if a disp. counts as a conviction or not.
         """
-        if re.match("^Guilty", self.disposition.strip()):
-            return True
-        else:
-            return False
+        return self.disposition_type() == DispositionTypes.CONVICTION
+
+    def disposition_type(self) -> str:
+        """ The kind of disposition this charge has. One of the `DispositionTypes`.
+        """
+        return DispositionTypes.classify(self.disposition)
+
+    def parsed_statute(self) -> Statute:
+        """ The statute of this charge, read into its parts. See `Statute`.
+        """
+        return Statute.parse(self.statute)
 
     def get_statute_chapter(self) -> Optional[float]:
         """ Get the Chapter in the PA Code that this charge is related to. 
         """
-        patt = re.compile("^(?P<chapt>\d+)\s*§\s(?P<section>\d+).*")
-        match = patt.match(self.statute)
-        if match:
-            return float(match.group("chapt"))
-        else:
-            return None
+        return self.parsed_statute().title
 
     def get_statute_section(self) -> Optional[float]:
         """ Get the Statute section of the PA code, to which this charge is related.
         """
-        patt = re.compile("^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*).*")
-        match = patt.match(self.statute)
-        if match:
-            return float(match.group("section"))
-        else:
-            return None
+        return self.parsed_statute().section
 
     def get_statute_subsections(self) -> str:
         """ Get the subsection, if any, to which this charge relates
         """
-        patt = re.compile("^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*§§\s*(?P<subsections>[\(\)A-Za-z0-9\.\*]+)\s*.*")
-        match = patt.match(self.statute)
-        if match:
-            return match.group("subsections")
-        else:
-            return ""
+        return self.parsed_statute().subsections
+
+
+class ChargeMerger:
+    """
+    Collect charges, merging each charge into the earlier charge with the same sequence number, if there is one.
+
+    Charges are indexed by their sequence numbers, so adding a charge takes constant time no matter how 
+    many charges have been collected. Parsers can add charges as they find them.
+
+    The merged charges keep the order in which each sequence number was first seen.
+    """
+
+    def __init__(self):
+        self.charges: List[Charge] = []
+        self._by_sequence = dict()
+
+    def add(self, charge: Charge) -> Charge:
+        """
+        Add a charge, or combine it with the charge that has its sequence number.
+
+        Returns:
+            The collected charge that `charge` ended up in.
+        """
+        if isinstance(charge.sequence, int):
+            existing = self._by_sequence.get(charge.sequence)
+            if existing is not None:
+                return existing.combine_with(charge)
+            self._by_sequence[charge.sequence] = charge
+        self.charges.append(charge)
+        return charge
+
+    def add_all(self, charges: List[Charge]) -> None:
+        for charge in charges:
+            self.add(charge)
 
 
+@add_slots
 @dataclass
 class Address:
 
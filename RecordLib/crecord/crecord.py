@@ -6,14 +6,13 @@ Note - it looks like i can't use dataclasses throughout because
        what's the point?
 """
 from __future__ import annotations
-from typing import List
+from typing import Callable, Dict, List, Optional, Union
 from .common import Charge
 from .person import Person
 from .case import Case
 from dataclasses import asdict
-from datetime import date
-from dateutil.relativedelta import relativedelta
 import logging
+from . import evaluation
 
 
 def years_since_last_arrested_or_prosecuted(crecord: CRecord) -> int:
@@ -32,10 +31,9 @@ def years_since_last_arrested_or_prosecuted(crecord: CRecord) -> int:
         "Active" in case.status for case in crecord.cases if case.status is not None
     ):
         return 0
-    cases_ordered = sorted(crecord.cases, key=Case.order_cases_by_last_action)
-    last_case = cases_ordered[-1]
+    last_case = max(crecord.cases, key=Case.order_cases_by_last_action)
     try:
-        return relativedelta(date.today(), last_case.last_action()).years
+        return evaluation.years_since(last_case.last_action())
     except (ValueError, TypeError) as e:
         return 0
 
@@ -57,11 +55,91 @@ def years_since_final_release(crecord: CRecord) -> int:
         # if a is before b, then c is negative. if a is after b, c is positive.
         # relativedelta(today, yesterday) > 0
         # relativedelta(yesterday, today) < 0
-        return max(relativedelta(date.today(), max(confinement_ends)).years, 0)
+        return max(evaluation.years_since(max(confinement_ends)), 0)
     except (ValueError, TypeError):
         return 0
 
 
+def _forgets_positions(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def forget_positions(self, *args, **kwargs):
+        self._positions = None
+        return method(self, *args, **kwargs)
+
+    forget_positions.__name__ = name
+    forget_positions.__doc__ = method.__doc__
+    return forget_positions
+
+
+class Cases(list):
+    """
+    The cases of a criminal record, in the order they were added, indexed by docket number.
+
+    A Cases is a list, so code that reads or changes the cases of a CRecord as a list keeps working.
+    It also keeps the position of the first case with each docket number, so finding or replacing
+    the case with a docket number takes constant time, and so does merging a case into a record.
+
+    Appending cases, and replacing cases with `replace`, keep the index up to date. Any other change
+    to the list rebuilds the index the next time it's used. Changing the docket number of a case
+    that's already in the list isn't noticed.
+    """
+
+    _positions: Optional[Dict[str, int]] = None
+
+    def _index(self) -> Dict[str, int]:
+        if self._positions is None:
+            positions = dict()
+            for i, case in enumerate(self):
+                positions.setdefault(case.docket_number, i)
+            self._positions = positions
+        return self._positions
+
+    def find(self, docket_number: str) -> Optional[Case]:
+        """
+        The first case with a docket number, or None.
+        """
+        i = self._index().get(docket_number)
+        return None if i is None else self[i]
+
+    def replace(self, docket_number: str, case: Case) -> None:
+        """
+        Put `case` in place of the first case with the docket number `docket_number`.
+
+        Raises:
+            KeyError if there's no case with the docket number.
+        """
+        i = self._index()[docket_number]
+        list.__setitem__(self, i, case)
+        if case.docket_number != docket_number:
+            self._positions = None
+
+    def append(self, case: Case) -> None:
+        if self._positions is not None:
+            self._positions.setdefault(case.docket_number, len(self))
+        super().append(case)
+
+    def extend(self, cases) -> None:
+        for case in cases:
+            self.append(case)
+
+    __setitem__ = _forgets_positions("__setitem__")
+    __delitem__ = _forgets_positions("__delitem__")
+    __iadd__ = _forgets_positions("__iadd__")
+    __imul__ = _forgets_positions("__imul__")
+    insert = _forgets_positions("insert")
+    pop = _forgets_positions("pop")
+    remove = _forgets_positions("remove")
+    clear = _forgets_positions("clear")
+    sort = _forgets_positions("sort")
+    reverse = _forgets_positions("reverse")
+
+
+# Decides which of two cases with the same docket number a record keeps. Called with the case
+# already in the record and the new case, and returns the case to keep.
+CaseMergeStrategy = Callable[[Case, Case], Case]
+
+
 class CRecord:
     """
     Track information about a criminal record
@@ -93,9 +171,73 @@ class CRecord:
     def __init__(self, person: Person = None, cases: List[Case] = None):
         self.person = person
         if cases is None:
-            self.cases = list()
+            self.cases = Cases()
+        else:
+            self.cases = Cases(cases)
+
+    def sharedcopy(self) -> CRecord:
+        """
+        A new CRecord with the same person and cases as this one.
+
+        The person and the cases themselves are shared by the two records, not copied, so adding or
+        removing cases from one record doesn't change the other, but changing a case does.
+        """
+        return CRecord(person=self.person, cases=self.cases)
+
+    def indexed_cases(self) -> Cases:
+        """
+        The cases of this record, as `Cases`, indexed by docket number.
+
+        If a plain list of cases has been assigned to `self.cases`, it's replaced with a Cases first.
+        """
+        if not isinstance(self.cases, Cases):
+            self.cases = Cases(self.cases)
+        return self.cases
+
+    def merge_case(
+        self,
+        new_case: Case,
+        case_merge_strategy: Union[str, CaseMergeStrategy] = "ignore_new",
+    ) -> CRecord:
+        """
+        Add a case to this record, unless the record already has a case with the same docket
+        number. Then the `case_merge_strategy` decides which case the record keeps.
+
+        Args:
+            new_case: The case to add.
+            case_merge_strategy: "ignore_new" to keep the case already in the record, "overwrite_old" to
+                put the new case in its place, or a function that takes the old case and the new one,
+                and returns the case to keep in the old case's place.
+
+        Returns:
+            This updated CRecord object.
+        """
+        cases = self.indexed_cases()
+        old_case = cases.find(new_case.docket_number)
+        if old_case is None:
+            logging.info(f"Adding {new_case.docket_number} to record.")
+            cases.append(new_case)
+        elif case_merge_strategy == "ignore_new":
+            logging.info(
+                f"Case with docket { new_case.docket_number } already part of record. Ignoring it."
+            )
+        elif case_merge_strategy == "overwrite_old":
+            logging.info(
+                f"Case with docket { new_case.docket_number } already part of record. Using it."
+            )
+            cases.replace(new_case.docket_number, new_case)
+        elif callable(case_merge_strategy):
+            logging.info(
+                f"Case with docket { new_case.docket_number } already part of record. Merging them."
+            )
+            cases.replace(
+                new_case.docket_number, case_merge_strategy(old_case, new_case)
+            )
         else:
-            self.cases = cases
+            logging.info(
+                f"Case with docket { new_case.docket_number } already part of record, no merge strategy selected. Ignoring duplicate."
+            )
+        return self
 
     def to_dict(self) -> dict:
         # TODO Delete
@@ -107,7 +249,7 @@ class CRecord:
     def add_summary(
         self,
         summary: "Summary",
-        case_merge_strategy: str = "ignore_new",
+        case_merge_strategy: Union[str, CaseMergeStrategy] = "ignore_new",
         override_person: bool = False,
     ) -> CRecord:
         """
@@ -121,7 +263,7 @@ class CRecord:
 
         Args:
             summary (Summary): A parsed summary sheet.
-            case_merge_strategy (str): "ignore_new" or "overwrite_old", which indicate whether duplicate new cases should be dropped or should replace the old ones
+            case_merge_strategy (str): "ignore_new" or "overwrite_old", which indicate whether duplicate new cases should be dropped or should replace the old ones, or a function that picks the case to keep. See `merge_case`.
 
         Returns:
             This updated CRecord object.
@@ -130,25 +272,8 @@ class CRecord:
         if override_person or self.person is None:
             self.person = summary.get_defendant()
         # Get the cases from the summary
-        docket_nums = [c.docket_number for c in self.cases]
-        for i, new_case in enumerate(summary.get_cases()):
-            if new_case.docket_number not in docket_nums:
-                logging.info(f"Adding {new_case.docket_number} to record.")
-                self.cases.append(new_case)
-                docket_nums.append(new_case.docket_number)
-            elif case_merge_strategy == "ignore_new":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Ignoring it."
-                )
-            elif case_merge_strategy == "overwrite_old":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Using it."
-                )
-                self.cases[i] = new_case
-            else:
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record, no merge strategy selected. Ignoring duplicate."
-                )
+        for new_case in summary.get_cases():
+            self.merge_case(new_case, case_merge_strategy)
 
         return self
 
@@ -161,21 +286,23 @@ class CRecord:
 
         Returns:
             This CRecord, with the information from `docket` incorporated into the record.
+            The docket's case takes the place of every case with its docket number.
         """
-        replaced = False
         self.person = docket._defendant
-        for i, case in enumerate(self.cases):
-            if case.docket_number == docket._case.docket_number:
-                replaced = True
-                self.cases[i] = docket._case
-        if replaced is False:
-            self.cases.append(docket._case)
+        cases = self.indexed_cases()
+        docket_number = docket._case.docket_number
+        if cases.find(docket_number) is None:
+            cases.append(docket._case)
+            return self
+        for i, case in enumerate(cases):
+            if case.docket_number == docket_number:
+                cases[i] = docket._case
         return self
 
     def add_sourcerecord(
         self,
         sourcerecord: "SourceRecord",
-        case_merge_strategy: str = "ignore_new",
+        case_merge_strategy: Union[str, CaseMergeStrategy] = "ignore_new",
         override_person: bool = False,
         docket_number: Optional[str] = None,
     ) -> CRecord:
@@ -194,7 +321,7 @@ class CRecord:
         Args:
             sourcerecord (SourceRecord): A parsed sourcerecord
             case_merge_strategy (str): "ignore_new" or "overwrite_old", which indicate whether duplicate new cases should be 
-                dropped or should replace the old ones
+                dropped or should replace the old ones, or a function that picks the case to keep. See `merge_case`.
             override_person (bool): Should the source record's Person replace the crecord's current Person?
             docket_number (str or None): If provided, and if the sourcerecord only contains one case (i.e., its a Docket, 
                 not a Summary), then give the case this docket number.
@@ -210,28 +337,11 @@ class CRecord:
             # We're done. No modifications of self are necessary.
             return self
 
-        docket_nums = [c.docket_number for c in self.cases]
-        for i, new_case in enumerate(sourcerecord.cases):
+        for new_case in sourcerecord.cases:
             # If we're only adding one case, and have passed in a docket number, give the new case the docket number.
             if docket_number is not None and len(sourcerecord.cases) == 1:
                 new_case.docket_number = docket_number
-            if new_case.docket_number not in docket_nums:
-                logging.info(f"Adding {new_case.docket_number} to record.")
-                self.cases.append(new_case)
-                docket_nums.append(new_case.docket_number)
-            elif case_merge_strategy == "ignore_new":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Ignoring it."
-                )
-            elif case_merge_strategy == "overwrite_old":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Using it."
-                )
-                self.cases[i] = new_case
-            else:
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record, no merge strategy selected. Ignoring duplicate."
-                )
+            self.merge_case(new_case, case_merge_strategy)
 
         return self
 
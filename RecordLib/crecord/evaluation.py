@@ -0,0 +1,205 @@
+"""
+The date a record is evaluated as of.
+
+Rules ask how many years have passed since the dates in a record, like the disposition date of
+each case, over and over. Outside of an `EvaluationContext`, the years are counted up to today,
+each time they're asked for. Inside of one, they're counted up to the context's fixed `as_of`
+date, and each count is kept, so it's only worked out once per context.
+
+The counts are kept by the date they're counted from, not by the case or record they belong to,
+so they stay right when rules copy and split the record they're evaluating.
+
+Rules that decide something about a whole record, like whether it's been ten years since the
+last conviction, are asked the same question about the same record by more than one rule.
+Decorated with `record_decision`, such a rule decides about each record, with each set of
+arguments, only once per context, and the context counts how often a decision was shared
+(`decision_hits`) or had to be made (`decision_misses`).
+
+The rules of an Analysis each take the record the rules before them left, and those records
+have fewer cases, so questions about whole records are rarely asked twice within an Analysis.
+The parts of those questions that only depend on one case, like which of its charges are
+convictions, are decorated with `case_decision` instead. They're decided once per case, and
+shared by every rule that asks about a record holding the case, since rules leave the cases
+they don't split alone.
+
+A context can also be told not to explain its decisions (`explain=False`). Rules then only work
+out what they decide about each case and charge, and don't build the Decisions that explain why,
+which is all that screening many people for the petitions they could file needs.
+
+An `Analysis` evaluates every rule in its own context, so a batch of analyses run on the same
+`as_of` date get the same results on any day.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Counter, Dict, List, Optional, Tuple
+from contextvars import ContextVar
+from datetime import date
+from dateutil.relativedelta import relativedelta
+import collections
+import functools
+
+
+_current_context: ContextVar[Optional[EvaluationContext]] = ContextVar(
+    "evaluation_context", default=None
+)
+
+
+class EvaluationContext:
+    """
+    A fixed date to evaluate records as of, and the counts of years worked out from it.
+
+    Use it as a context manager. Contexts can be entered more than once, and nested.
+
+    Args:
+        as_of: The date to evaluate records as of. Today, if None.
+        explain: Whether rules should explain their decisions about each case and charge. See
+            `explaining`.
+
+    Attributes:
+        decision_hits: How many times each `record_decision` or `case_decision` rule's decision
+            was shared, by the rule's name.
+        decision_misses: How many times each of those rules had to decide, by name.
+    """
+
+    def __init__(self, as_of: Optional[date] = None, explain: bool = True) -> None:
+        self.as_of = as_of or date.today()
+        self.explain = explain
+        self._years_since: Dict[date, int] = dict()
+        self._decisions: Dict[Tuple, Tuple] = dict()
+        self.decision_hits: Counter[str] = collections.Counter()
+        self.decision_misses: Counter[str] = collections.Counter()
+        self._tokens: List = []
+
+    def __enter__(self) -> EvaluationContext:
+        self._tokens.append(_current_context.set(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current_context.reset(self._tokens.pop())
+
+    def years_since(self, then: date) -> int:
+        """
+        The number of whole years from `then` to `as_of`.
+        """
+        years = self._years_since.get(then)
+        if years is None:
+            years = relativedelta(self.as_of, then).years
+            self._years_since[then] = years
+        return years
+
+    def decide(self, ruledef: Callable, record: Any, *args, **kwargs) -> Any:
+        """
+        The decision `ruledef` makes about `record`, made only the first time it's asked for.
+
+        Records are told apart by their person and the cases they hold, not by the CRecord
+        object, since rules put the cases they leave alone into new records. The decision is kept
+        along with the person and cases, so that they can't be replaced by new objects with the
+        same ids while the context lasts.
+        """
+        cases = tuple(record.cases)
+        key = (
+            ruledef,
+            id(record.person),
+            tuple(map(id, cases)),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        kept = self._decisions.get(key)
+        if kept is not None:
+            self.decision_hits[ruledef.__name__] += 1
+            return kept[2]
+        self.decision_misses[ruledef.__name__] += 1
+        decision = ruledef(record, *args, **kwargs)
+        self._decisions[key] = (record.person, cases, decision)
+        return decision
+
+    def decide_about_case(self, ruledef: Callable, case: Any, *args) -> Any:
+        """
+        The decision `ruledef` makes about `case`, made only the first time it's asked for.
+
+        Cases are told apart by identity. The decision is kept along with the case, like in
+        `decide`.
+        """
+        key = (ruledef, id(case), args)
+        kept = self._decisions.get(key)
+        if kept is not None:
+            self.decision_hits[ruledef.__name__] += 1
+            return kept[1]
+        self.decision_misses[ruledef.__name__] += 1
+        decision = ruledef(case, *args)
+        self._decisions[key] = (case, decision)
+        return decision
+
+
+def current_context() -> Optional[EvaluationContext]:
+    """
+    The EvaluationContext records are being evaluated in, or None.
+    """
+    return _current_context.get()
+
+
+def today() -> date:
+    """
+    The date records are being evaluated as of: the current context's `as_of`, or today.
+    """
+    context = _current_context.get()
+    return date.today() if context is None else context.as_of
+
+
+def explaining() -> bool:
+    """
+    Whether rules should explain what they decide about each case and charge, with the
+    Decisions that make up their reasoning. True, unless the current context says not to.
+
+    Rules that don't explain still decide the same way. Their decisions about a whole record
+    give, as their reasoning, only the charges that failed them.
+    """
+    context = _current_context.get()
+    return context is None or context.explain
+
+
+def years_since(then: date) -> int:
+    """
+    The number of whole years from `then` to the date records are being evaluated as of.
+    """
+    context = _current_context.get()
+    if context is None:
+        return relativedelta(date.today(), then).years
+    return context.years_since(then)
+
+
+def record_decision(ruledef: Callable) -> Callable:
+    """
+    Decorate a rule that decides something about a whole record, so that inside of an
+    `EvaluationContext` it decides about the same record only once (see
+    `EvaluationContext.decide`). The decision is shared by every rule that asks for it, so
+    nothing should change it.
+
+    Rules that take either a record or a charge are shared only when they get a record.
+    """
+
+    @functools.wraps(ruledef)
+    def decide(item, *args, **kwargs):
+        context = _current_context.get()
+        if context is None or not hasattr(item, "cases"):
+            return ruledef(item, *args, **kwargs)
+        return context.decide(ruledef, item, *args, **kwargs)
+
+    return decide
+
+
+def case_decision(ruledef: Callable) -> Callable:
+    """
+    Decorate a rule that decides something about a single case, so that inside of an
+    `EvaluationContext` it decides about the same case, with the same arguments, only once (see
+    `EvaluationContext.decide_about_case`). Like with `record_decision`, nothing should change
+    the decision, or the case.
+    """
+
+    @functools.wraps(ruledef)
+    def decide(case, *args):
+        context = _current_context.get()
+        if context is None:
+            return ruledef(case, *args)
+        return context.decide_about_case(ruledef, case, *args)
+
+    return decide
@@ -1,5 +1,6 @@
 from typing import Union
 from datetime import datetime, date
+from dataclasses import fields
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,3 +21,27 @@ def convert_datestring(datestring: Union[str,date,datetime,None]) -> date:
     logger.error(f"Could not read date string: {datestring}")
     return None
 
+
+
+def add_slots(cls: type) -> type:
+    """
+    Class decorator that gives a dataclass `__slots__` for its fields, so its instances don't
+    each carry a `__dict__`. Apply it on top of `@dataclass`.
+
+    Python 3.7's dataclasses can't do this themselves, because a field's default value is a
+    class attribute with the same name as the slot. So the class is made over again, with
+    `__slots__` and without the class attributes. The dataclass's `__init__` keeps the
+    defaults. Methods of the class can't use `super()` without arguments.
+    """
+    if "__slots__" in cls.__dict__:
+        raise TypeError(f"{cls.__name__} already has __slots__")
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict["__slots__"] = field_names
+    for field_name in field_names:
+        cls_dict.pop(field_name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
@@ -2,10 +2,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional, Union
 from datetime import date, datetime
-from dateutil.relativedelta import relativedelta
 from .common import Address
 import logging
 from .helpers import convert_datestring
+from . import evaluation
 
 logger = logging.getLogger(__name__)
 
@@ -38,10 +38,10 @@ class Person:
             )
 
     def age(self) -> int:
-        """ Age in years """
+        """ Age in years, on the date the person's record is being evaluated as of. """
         if self.date_of_birth is None:
             return 0
-        today = date.today()
+        today = evaluation.today()
         return (
             today.year
             - self.date_of_birth.year
@@ -55,7 +55,7 @@ class Person:
         """Return number of years dead a person is. Or -Infinity, if alive.
         """
         if self.date_of_death:
-            return relativedelta(date.today(), self.date_of_death).years
+            return evaluation.years_since(self.date_of_death)
         else:
             return float("-Inf")
 
@@ -1,30 +1,116 @@
+import threading
 from parsimonious import NodeVisitor  # type: ignore
+from lxml import etree
+from RecordLib.sourcerecords.parsenode import ParseNode, build_node
 
-def stringify(node_visitor, content):
-    return "".join(content)
 
+class XmlVisitor(NodeVisitor):
+    """
+    Base class for visitors that write the parse tree out as a string of xml.
+
+    Custom visitor methods should build their output with `stringify` and `element`, so that
+    they work with any kind of visitor.
+    """
+
+    def stringify(self, content):
+        return "".join(content)
+
+    def generic_visit(self, node, vc):
+        return self.stringify(vc)
+
+    def element(self, tag, contents):
+        """ Wrap contents in a node called `tag`. """
+        return f"<{tag}> {self.stringify(contents)} </{tag}>"
 
-def generic_visit(node_visitor, node, vc):
-    return node_visitor.stringify(vc)
+    def tree(self, node, parser=None) -> etree.Element:
+        """ Visit a parse tree and return the root of the resulting xml tree. """
+        return etree.fromstring(self.visit(node), parser)
+
+
+class ParseNodeVisitor(NodeVisitor):
+    """
+    Base class for visitors that build a tree of ParseNodes, skipping the xml string.
+
+    Visiting a node returns a string if the node only holds text, like the xml visitor
+    does, or else a ParseNode or a list of strings and ParseNodes.
+    """
+
+    def stringify(self, content):
+        if isinstance(content, str):
+            return content
+        try:
+            # Most nodes only hold text.
+            return "".join(content)
+        except TypeError:
+            pass
+        pieces = []
+        text = []
+        _flatten(content, pieces, text)
+        if text:
+            pieces.append("".join(text))
+        return pieces
+
+    def generic_visit(self, node, vc):
+        return self.stringify(vc)
+
+    def element(self, tag, contents):
+        """ Wrap contents in a node called `tag`. """
+        return build_node(tag, self.stringify(contents))
+
+    def tree(self, node, parser=None) -> ParseNode:
+        """ Visit a parse tree and return the root of the resulting tree of ParseNodes. """
+        result = self.visit(node)
+        if isinstance(result, ParseNode):
+            return result
+        return next(piece for piece in result if isinstance(piece, ParseNode))
+
+
+def _flatten(content, pieces, text):
+    """
+    Flatten strings, ParseNodes and nested lists of them into `pieces`, joining strings that
+    are next to each other. `text` collects the strings since the last node.
+    """
+    for item in content:
+        if isinstance(item, str):
+            text.append(item)
+        elif isinstance(item, ParseNode):
+            if text:
+                pieces.append("".join(text))
+                text.clear()
+            pieces.append(item)
+        else:
+            _flatten(item, pieces, text)
+
+
+# Visitor classes made by create_instance, by CustomVisitorFactory.key().
+_visitor_classes = dict()
+_visitor_classes_lock = threading.Lock()
 
 
 class CustomVisitorFactory:
     """
     This class creates an object that is an instance of a custom
     subclass of parsimonious' NodeVisitor class.
+
+    Building the subclass is much slower than visiting a small parse tree, so `create_instance`
+    makes each subclass once per process and reuses it. Visitors keep no state between
+    visits, so the classes can be shared by every document and thread.
     """
 
-    def __init__(self, terminals, non_terminals, non_default_methods):
+    def __init__(self, terminals, non_terminals, non_default_methods, as_xml=True):
         """
         Input: a) list of terminal symbols,
                b) list of non-terminal symbols, and
                c) list of tuples (method_name, method) to override the default methods
                   this class creaes.
+               d) whether the visitor writes xml strings (the default), or builds a tree
+                  of ParseNodes.
         Inside: Sets these as attributes of the instance of the class.
         """
         self.terminals = terminals
         self.non_terminals = non_terminals
         self.non_default_methods = non_default_methods
+        self.as_xml = as_xml
 
     def create_subclass(self, subclass_name="CustomVisitor"):
         """
@@ -36,8 +122,6 @@ class CustomVisitorFactory:
                 non-terminal methods.
         """
         custom_methods = dict()
-        custom_methods["stringify"] = stringify
-        custom_methods["generic_visit"] = generic_visit
 
         method_name = "visit_{}"
         for terminal in self.terminals:
@@ -55,11 +139,26 @@ class CustomVisitorFactory:
         for symbol, method in self.non_default_methods:
             custom_methods[method_name.format(symbol)] = method
 
-        return type("CustomVisitor", (NodeVisitor,), custom_methods)
+        base = XmlVisitor if self.as_xml else ParseNodeVisitor
+        return type("CustomVisitor", (base,), custom_methods)
+
+    def key(self):
+        """
+        Identifies the visitor class this factory makes: two factories with the same key make
+        the same class.
+        """
+        if isinstance(self.non_default_methods, dict):
+            methods = tuple(self.non_default_methods.items())
+        else:
+            methods = tuple(tuple(method) for method in self.non_default_methods)
+        return (tuple(self.terminals), tuple(self.non_terminals), methods, self.as_xml)
 
     def create_instance(self, class_name="CustomVisitor"):
         """
         Create an instance of the custom nodevisitor class created with this factory.
+
+        The class is only created the first time a factory with the same terminals,
+        nonterminals, custom methods and output is asked for an instance.
         
         Args:
             an optional name for the custom class to be created.
@@ -69,7 +168,14 @@ class CustomVisitorFactory:
             an instance of the subclass of NodeVisitor. Uses the instance
                method NodeVisitor#create_subclass()
         """
-        CustomVisitor = self.create_subclass(class_name)
+        key = self.key()
+        CustomVisitor = _visitor_classes.get(key)
+        if CustomVisitor is None:
+            with _visitor_classes_lock:
+                CustomVisitor = _visitor_classes.get(key)
+                if CustomVisitor is None:
+                    CustomVisitor = self.create_subclass(class_name)
+                    _visitor_classes[key] = CustomVisitor
         return CustomVisitor()
 
     # Default method generators
@@ -86,11 +192,11 @@ class CustomVisitorFactory:
 
         The default method for visiting nonterminal symbols will return the
         output of the node's children wrapped in xml tags with the name of the
-        nonterminal symbol, as in <parent> [some contents] </parent>
+        nonterminal symbol, as in <parent> [some contents] </parent>, or in a ParseNode
+        with the name of the symbol.
         """
 
         def non_terminal_method(self, node, children):
-            contents = self.stringify(children)
-            return f"<{non_terminal_name}> {contents} </{non_terminal_name}>"
+            return self.element(non_terminal_name, children)
 
         return non_terminal_method
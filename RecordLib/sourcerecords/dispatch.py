@@ -0,0 +1,346 @@
+"""
+Pick the right parser for a document by reading its header.
+
+Dockets and summaries from the different courts all need different parsers. What kind of
+document we have is always clear from the top of its first page: the docket number ("CP-",
+"MC-" or "MJ-"), the name of the court, and whether it's a "Court Summary". So documents are
+classified from their header only, which takes the same time for a two page summary as for a
+docket with hundreds of entries.
+
+Parsers are kept in a `ParserRegistry`. Each registration has a detector that looks at a
+document's header, and a priority. The registration with the highest priority whose detector
+recognizes the header gets to parse the document.
+
+`parse_pdf` and `parse_text` parse any document that one of the default parsers recognizes.
+`detect_and_parse_pdf` also returns the registration of the parser, for callers that need to
+know what kind of record the document was.
+"""
+from __future__ import annotations
+from typing import BinaryIO, Callable, Iterable, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import itertools
+import re
+import threading
+import logging
+from RecordLib.crecord import Person, Case
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.sourcerecords.pdfbackends import PAGE_BREAK
+from RecordLib.sourcerecords.pdfextraction import split_pages
+from RecordLib.sourcerecords.parsingutilities import iter_pages_from_pdf
+
+
+logger = logging.getLogger(__name__)
+
+# The most text, from the start of the first page, that detectors look at.
+HEADER_LENGTH = 2000
+
+
+class COURTS:
+    CP = "CP"
+    MC = "MC"
+    MDJ = "MDJ"
+
+
+def document_header(text: str) -> str:
+    """
+    The top of the first page of a document: everything before the first page break, up to
+    `HEADER_LENGTH` characters.
+    """
+    end = text.find(PAGE_BREAK, 0, HEADER_LENGTH)
+    return text[: end if end != -1 else HEADER_LENGTH]
+
+
+@dataclass
+class ParserRegistration:
+    """
+    A parser, and how to recognize the documents it parses.
+
+    A parser takes either the whole text of a document (`text_parser`) or an iterable of the
+    text of its pages (`pages_parser`), and returns a tuple of a Person, a list of Cases, and a
+    list of errors.
+    """
+
+    name: str
+    court: str
+    record_type: str
+    detector: Callable[[str], bool]
+    text_parser: Optional[Callable[[str], Tuple[Person, List[Case], List[str]]]] = None
+    pages_parser: Optional[
+        Callable[[Iterable[str]], Tuple[Person, List[Case], List[str]]]
+    ] = None
+    priority: int = 0
+
+    def parse_text(self, text: str) -> Tuple[Person, List[Case], List[str]]:
+        if self.text_parser is not None:
+            return self.text_parser(text)
+        return self.pages_parser(split_pages(text))
+
+    def parse_pages(self, pages: Iterable[str]) -> Tuple[Person, List[Case], List[str]]:
+        if self.pages_parser is not None:
+            return self.pages_parser(pages)
+        return self.text_parser("".join(pages))
+
+
+class ParserRegistry:
+    """
+    Collection of parsers, and the detectors that decide which one parses a document.
+    """
+
+    def __init__(self):
+        self._registrations: List[ParserRegistration] = []
+
+    def register(
+        self,
+        name: str,
+        court: str,
+        record_type: str,
+        detector: Callable[[str], bool],
+        text_parser: Optional[Callable] = None,
+        pages_parser: Optional[Callable] = None,
+        priority: int = 0,
+    ) -> ParserRegistration:
+        """
+        Add a parser to the registry.
+
+        Args:
+            name: Names the registration, in logs.
+            court: One of `COURTS`.
+            record_type: One of `SourceRecord.RECORD_TYPES`.
+            detector: A function that gets the header of a document (see `document_header`) and
+                returns True if the parser can parse the document.
+            text_parser: A parser that takes the text of a whole document.
+            pages_parser: A parser that takes the text of a document one page at a time.
+            priority: Detectors with higher priorities are tried first. Registrations with
+                the same priority are tried in the order they were registered.
+        """
+        if text_parser is None and pages_parser is None:
+            raise ValueError(
+                f"Registration {name} needs a text_parser or pages_parser."
+            )
+        registration = ParserRegistration(
+            name=name,
+            court=court,
+            record_type=record_type,
+            detector=detector,
+            text_parser=text_parser,
+            pages_parser=pages_parser,
+            priority=priority,
+        )
+        self._registrations.append(registration)
+        # sorted() is stable, so equal priorities keep their order of registration.
+        self._registrations = sorted(
+            self._registrations, key=lambda reg: reg.priority, reverse=True
+        )
+        return registration
+
+    def detect(
+        self, text: str, record_type: Optional[str] = None
+    ) -> Optional[ParserRegistration]:
+        """
+        Find the parser for a document.
+
+        Args:
+            text: The text of the document, or at least of its first page.
+            record_type: If given, only consider parsers for this type of record.
+
+        Returns:
+            The registration of the parser, or None if no detector recognizes the document.
+        """
+        header = document_header(text)
+        for registration in self._registrations:
+            if record_type is not None and registration.record_type != record_type:
+                continue
+            if registration.detector(header):
+                return registration
+        return None
+
+    def parse_text(self, text: str) -> Tuple[Person, List[Case], List[str]]:
+        """
+        Parse the text of any document one of the registered parsers recognizes.
+        """
+        registration = self.detect(text)
+        if registration is None:
+            return None, None, ["Could not tell what kind of document this is."]
+        logger.info(f"Parsing document with {registration.name}")
+        return registration.parse_text(text)
+
+    def parse_pages(self, pages: Iterable[str]) -> Tuple[Person, List[Case], List[str]]:
+        """
+        Parse any document, given the text of its pages, such as the pages yielded by
+        `iter_pages_from_pdf`. The document is classified from its first page.
+        """
+        return self.detect_and_parse_pages(pages)[1]
+
+    def detect_and_parse_pages(
+        self, pages: Iterable[str]
+    ) -> Tuple[Optional[ParserRegistration], Tuple[Person, List[Case], List[str]]]:
+        """
+        Parse any document, like `parse_pages`, and also say which parser parsed it.
+
+        Returns:
+            The registration of the parser, or None if no detector recognizes the document, and
+            what the parser returned.
+        """
+        pages = iter(pages)
+        first_page = next(pages, None)
+        if first_page is None:
+            return None, (None, None, ["could not extract text from pdf"])
+        registration = self.detect(first_page)
+        if registration is None:
+            return None, (None, None, ["Could not tell what kind of document this is."])
+        logger.info(f"Parsing document with {registration.name}")
+        return (
+            registration,
+            registration.parse_pages(itertools.chain([first_page], pages)),
+        )
+
+
+def _docket_number_detector(prefix: str) -> Callable[[str], bool]:
+    pattern = re.compile(r"Docket Number:\s+" + prefix + r"\-")
+
+    def detector(header: str) -> bool:
+        return pattern.search(header) is not None
+
+    return detector
+
+
+def _is_summary(header: str) -> bool:
+    return "Court Summary" in header
+
+
+def _is_mdj_summary(header: str) -> bool:
+    return _is_summary(header) and "Magisterial" in header[:100]
+
+
+_common_pleas_pattern = re.compile("common pleas", re.I)
+_magisterial_district_pattern = re.compile("magisterial district", re.I)
+
+
+def _mentions_common_pleas(header: str) -> bool:
+    return _common_pleas_pattern.search(header) is not None
+
+
+def _mentions_magisterial_district(header: str) -> bool:
+    return _magisterial_district_pattern.search(header) is not None
+
+
+def register_default_parsers(registry: ParserRegistry) -> None:
+    """
+    Register RecordLib's parsers for CP, MC and MDJ dockets and summaries.
+    """
+    from RecordLib.sourcerecords.docket.re_parse_cp_pdf import parse_cp_pdf_text
+    from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import parse_mdj_pdf_text
+    from RecordLib.sourcerecords.summary.parse_pdf import parse_pdf_pages
+
+    DOCKET = SourceRecord.RECORD_TYPES.DOCKET
+    SUMMARY = SourceRecord.RECORD_TYPES.SUMMARY
+    # Summaries list docket numbers too, so look for them first.
+    registry.register(
+        "mdj summary",
+        COURTS.MDJ,
+        SUMMARY,
+        _is_mdj_summary,
+        pages_parser=parse_pdf_pages,
+        priority=30,
+    )
+    registry.register(
+        "cp summary",
+        COURTS.CP,
+        SUMMARY,
+        _is_summary,
+        pages_parser=parse_pdf_pages,
+        priority=20,
+    )
+    registry.register(
+        "cp docket",
+        COURTS.CP,
+        DOCKET,
+        _docket_number_detector("CP"),
+        text_parser=parse_cp_pdf_text,
+        priority=10,
+    )
+    registry.register(
+        "mc docket",
+        COURTS.MC,
+        DOCKET,
+        _docket_number_detector("MC"),
+        text_parser=parse_cp_pdf_text,
+        priority=10,
+    )
+    registry.register(
+        "mdj docket",
+        COURTS.MDJ,
+        DOCKET,
+        _docket_number_detector("MJ"),
+        text_parser=parse_mdj_pdf_text,
+        priority=10,
+    )
+    # If the docket number isn't where we expect it, fall back to the name of the court.
+    registry.register(
+        "docket naming common pleas",
+        COURTS.CP,
+        DOCKET,
+        _mentions_common_pleas,
+        text_parser=parse_cp_pdf_text,
+    )
+    registry.register(
+        "docket naming a magisterial district",
+        COURTS.MDJ,
+        DOCKET,
+        _mentions_magisterial_district,
+        text_parser=parse_mdj_pdf_text,
+    )
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def default_registry() -> ParserRegistry:
+    """
+    The registry of RecordLib's parsers, created the first time it's needed.
+    """
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                registry = ParserRegistry()
+                register_default_parsers(registry)
+                _default_registry = registry
+    return _default_registry
+
+
+def detect(
+    text: str, record_type: Optional[str] = None
+) -> Optional[ParserRegistration]:
+    """
+    Find the default parser for a document. See `ParserRegistry.detect`.
+    """
+    return default_registry().detect(text, record_type)
+
+
+def parse_text(text: str) -> Tuple[Person, List[Case], List[str]]:
+    """
+    Parse the text of a docket or summary from any court.
+    """
+    return default_registry().parse_text(text)
+
+
+def parse_pdf(pdf: Union[BinaryIO, str]) -> Tuple[Person, List[Case], List[str]]:
+    """
+    Parse a pdf of a docket or summary from any court.
+
+    Args:
+        pdf: A path to a pdf or a file object.
+    """
+    return default_registry().parse_pages(iter_pages_from_pdf(pdf))
+
+
+def detect_and_parse_pdf(
+    pdf: Union[BinaryIO, str]
+) -> Tuple[Optional[ParserRegistration], Tuple[Person, List[Case], List[str]]]:
+    """
+    Parse a pdf of a docket or summary from any court, and say which parser parsed it. See
+    `ParserRegistry.detect_and_parse_pages`.
+    """
+    return default_registry().detect_and_parse_pages(iter_pages_from_pdf(pdf))
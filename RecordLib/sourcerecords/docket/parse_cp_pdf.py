@@ -11,7 +11,7 @@ from .grammars import (
 from RecordLib.sourcerecords.customnodevisitorfactory import CustomVisitorFactory
 from .custom_parsing_funcs import docket_sections_custom_nodevisitors
 from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
-from parsimonious import Grammar
+from RecordLib.sourcerecords.grammarregistry import get_grammar
 import parsimonious
 from lxml import etree
 import logging
@@ -40,7 +40,7 @@ def text_to_pages(txt: str) -> Tuple[str, List[str]]:
         </docket>
     """
     errors = []
-    grammar = Grammar(docket_sections)
+    grammar = get_grammar(docket_sections)
     try:
         nodes = grammar.parse(txt)
         visitor = CustomVisitorFactory(
@@ -492,7 +492,7 @@ def parse_cp_pdf_text(
             section_text = "\n".join(
                 [ln for ln in section.text.split("\n") if ln.strip()]
             )
-            grammar = Grammar(grammar)
+            grammar = get_grammar(grammar)
             try:
                 nodes = grammar.parse(section_text)
             except Exception as e:
@@ -4,7 +4,7 @@ Regex parsing functions for Common Pleas pdf dockets.
 
 import logging
 import re
-from typing import Union, BinaryIO, Tuple, List, Optional
+from typing import Union, BinaryIO, Dict, Tuple, List, Optional
 from RecordLib.crecord import Charge, Person, Case, Address
 from RecordLib.sourcerecords.parsingutilities import (
     get_text_from_pdf,
@@ -32,8 +32,44 @@ section_headers = [
 ]
 
 
+# The line that starts a section. A header can share its line with another heading, like
+# "COMMONWEALTH INFORMATION      ATTORNEY INFORMATION".
+section_header_pattern = re.compile(
+    r"^[ \t]*(?P<header>"
+    + "|".join(re.escape(header) for header in section_headers)
+    + r")(?:[ \t]{2,}\S.*)?[ \t]*$",
+    re.M,
+)
+
+# The name of the text before the first section: the docket number, the court, and the caption.
+DOCKET_HEADER = "DOCKET HEADER"
+
+
+def split_sections(txt: str) -> Dict[str, str]:
+    """
+    Split the text of a docket into its sections, in a single pass over the text.
+
+    Returns:
+        A dict from each section header to the text of the section, not including the header's
+        own line. The text before the first section is under `DOCKET_HEADER`. If a section
+        appears more than once, its pieces are joined with newlines.
+    """
+    pieces = {}
+    name = DOCKET_HEADER
+    start = 0
+    for header in section_header_pattern.finditer(txt):
+        pieces.setdefault(name, []).append(txt[start : header.start()])
+        name = header.group("header")
+        # Skip the newline that ends the header's line.
+        start = header.end() + 1
+    pieces.setdefault(name, []).append(txt[start:])
+    return {name: "\n".join(texts) for name, texts in pieces.items()}
+
+
 def find_pattern(label, pattern, txt, flags=None) -> Tuple[str, List[str]]:
-    if flags is not None:
+    if hasattr(pattern, "search"):
+        search = pattern.search(txt)
+    elif flags is not None:
         search = re.search(pattern, txt, flags)
     else:
         search = re.search(pattern, txt)
@@ -43,17 +79,48 @@ def find_pattern(label, pattern, txt, flags=None) -> Tuple[str, List[str]]:
         return None, [f"Could not find {label}"]
 
 
-def parse_person(txt: str) -> Tuple[Person, List[str]]:
+def find_in_section(
+    label, pattern, sections: Dict[str, str], section: str, txt: str
+) -> Tuple[str, List[str]]:
+    """
+    Search for a pattern in the section of a docket where it belongs.
+
+    If the section is missing, or the pattern isn't in it, search the whole docket, in case
+    the docket is laid out differently than we expect.
+    """
+    if section in sections:
+        search = pattern.search(sections[section])
+        if search is not None:
+            return search, []
+    return find_pattern(label, pattern, txt)
+
+
+defendant_name_pattern = re.compile(
+    r"^Defendant\s+(?P<last_name>.*), (?P<first_name>.*)", re.M
+)
+date_of_birth_pattern = re.compile(
+    r"Date Of Birth:?\s+(?P<date_of_birth>\d{1,2}\/\d{1,2}\/\d{4})"
+)
+alias_header_pattern = re.compile(r"Alias Name\s*\n+")
+address_pattern = re.compile(r"City/State/Zip:\s*(?P<addr>.*)\s*")
+
+
+def parse_person(
+    txt: str, sections: Optional[Dict[str, str]] = None
+) -> Tuple[Person, List[str]]:
     """
     Extract a Person from the text of a CP docket.
+
+    Args:
+        txt: The text of the docket.
+        sections: The docket split with `split_sections`, if it has been already.
     """
+    if sections is None:
+        sections = split_sections(txt)
     person = Person(first_name=None, last_name=None, date_of_birth=None)
     errs = []
-    defendant_name, d_errs = find_pattern(
-        "defendant_name",
-        r"^Defendant\s+(?P<last_name>.*), (?P<first_name>.*)",
-        txt,
-        re.M,
+    defendant_name, d_errs = find_in_section(
+        "defendant_name", defendant_name_pattern, sections, "CASE PARTICIPANTS", txt
     )
     if defendant_name is not None:
         person.first_name = defendant_name.group("first_name")
@@ -61,134 +128,139 @@ def parse_person(txt: str) -> Tuple[Person, List[str]]:
     else:
         errs.extend(d_errs)
 
-    defendant_dob, dob_errs = find_pattern(
-        "date_of_birth",
-        r"Date Of Birth:?\s+(?P<date_of_birth>\d{1,2}\/\d{1,2}\/\d{4})",
-        txt,
+    defendant_dob, dob_errs = find_in_section(
+        "date_of_birth", date_of_birth_pattern, sections, "DEFENDANT INFORMATION", txt
     )
     if defendant_dob is not None:
         person.date_of_birth = date_or_none(defendant_dob.group("date_of_birth"))
     else:
         errs.extend(dob_errs)
 
-    defendant_info_section, d_section_errs = find_pattern(
-        "defendant_info",
-        r"DEFENDANT INFORMATION(?P<defendant_info>.*)\s+CASE PARTICIPANTS",
-        txt,
-        re.DOTALL,
-    )
-    if defendant_info_section is not None:
-        defendant_info_text = defendant_info_section.group("defendant_info")
+    if "DEFENDANT INFORMATION" in sections:
+        defendant_info_text = sections["DEFENDANT INFORMATION"]
         alias_search, a_errs = find_pattern(
-            "aliases", r"Alias Name\s*\n+(?P<aliases>(.+\s*\n*)*)", defendant_info_text
+            "aliases", alias_header_pattern, defendant_info_text
         )
         if alias_search is not None:
+            # Every line after the "Alias Name" heading, to the end of the section, is an alias.
             person.aliases = [
                 a.strip()
-                for a in alias_search.group("aliases").split("\n")
-                if len(a) > 0
+                for a in defendant_info_text[alias_search.end() :].split("\n")
+                if a.strip() != ""
             ]
         else:
             errs.extend(a_errs)
 
         addr_search, addr_errs = find_pattern(
-            "address", r"City/State/Zip:\s*(?P<addr>.*)\s*", defendant_info_text
+            "address", address_pattern, defendant_info_text
         )
         if addr_search is not None:
             person.address = Address(addr_search.group("addr"), "")
         else:
             errs.extend(addr_errs)
     else:
-        errs.extend(d_section_errs)
+        errs.append("Could not find defendant_info")
 
     return person, errs
 
 
-def parse_charges(txt: str) -> Tuple[Optional[List[Charge]], List[str]]:
+charge_line_pattern = re.compile(
+    r"(?P<sequence>\d)\s+\/\s+(?P<offense>.+)\s{12,}(?P<disposition>\w.+?)(?=\s\s)\s{12,}(?P<grade>\w{0,2})\s+(?P<statute>\w{1,2}\s?\u00A7\s?\d+(\-|\u00A7|\w+)*)"
+)
+charge_overflow_pattern = re.compile(r"^\s+(?P<offense_overflow>\w+\s*\w*)\s*$", re.I)
+charge_disposition_date_pattern = re.compile(
+    r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})"
+)
+
+
+def parse_charges(
+    txt: str, sections: Optional[Dict[str, str]] = None
+) -> Tuple[Optional[List[Charge]], List[str]]:
     """
     Find the charges in the text of a docket.
-    
+
+    The lines of the DISPOSITION SENTENCING/PENALTIES section are read once, from the top
+    down. A line may be:
+
+    - a charge, like "1 / Theft By Unlaw Taking    Guilty Plea    M1    18 § 3921 §§ A",
+    - the end of the offense of a charge on the line just before it, or
+    - a disposition date. Sometimes a single charge has several successive disposition
+      dates. A charge's disposition date is the last one in the run of date lines right
+      after the charge (or after its overflow line).
+
+    Args:
+        txt: The text of the docket.
+        sections: The docket split with `split_sections`, if it has been already.
 
     Returns:
         Tuple[0] is either None or a list of Charges.
         Tuple[1] is a list of strings describing errors encountered.
     """
     logger.info("      parsing charges")
-    disposition_section_searcher = re.compile(
-        r"(?:.*\s+)DISPOSITION SENTENCING/PENALTIES\s*\n(?P<disposition_section>(.+\n+(?=[A-Z ]+))+.*)"
-    )
+    if sections is None:
+        sections = split_sections(txt)
     errs = []
-    disposition_sections = disposition_section_searcher.findall(txt)
-    if disposition_section_searcher == []:
-        errs.append("Could not find the disposition/sentencing section.")
-        return None, errs
     charges = []
-    charges_pattern = r"(?P<sequence>\d)\s+\/\s+(?P<offense>.+)\s{12,}(?P<disposition>\w.+?)(?=\s\s)\s{12,}(?P<grade>\w{0,2})\s+(?P<statute>\w{1,2}\s?\u00A7\s?\d+(\-|\u00A7|\w+)*)"
-    # there may be multiple disposition sections
-    for disposition_section in disposition_sections:
-        section_text = disposition_section[0]
-        section_lines = section_text.split("\n")
-        for idx, ln in enumerate(section_lines):
-            # Need to use a copy of the index, to advance if we find a charge overflow line, so that
-            # when we reach forward for the disposition date, we compensate if we've also found a charge overflow line.
-            idx_copy = idx
-            # not using the find_pattern function here because we're doing repeated searches on every line,
-            # and failing to match is not an error, in that case.
-            charge_line_search = re.search(charges_pattern, ln)
-            if charge_line_search is not None:
-                logger.debug(f"found a charge in line: {ln}")
-                offense = charge_line_search.group("offense").strip()
-                charge_overflow_search = re.search(
-                    r"^\s+(?P<offense_overflow>\w+\s*\w*)\s*$",
-                    section_lines[idx + 1],
-                    re.I,
+    # The last disposition date found for each charge, as a match.
+    disp_date_searches = []
+    # Indexes of the charges whose run of disposition dates hasn't ended yet.
+    reading_dates = []
+    # Index of the charge on the previous line, whose offense may continue on this line.
+    may_overflow = None
+    disposition_section = sections.get("DISPOSITION SENTENCING/PENALTIES", "")
+    for ln in disposition_section.split("\n"):
+        if may_overflow is not None:
+            charge_overflow_search = charge_overflow_pattern.search(ln)
+            if charge_overflow_search is not None:
+                charges[may_overflow].offense += (
+                    " " + charge_overflow_search.group("offense_overflow").strip()
                 )
-                if charge_overflow_search is not None:
-                    offense += (
-                        " " + charge_overflow_search.group("offense_overflow").strip()
-                    )
-                    idx_copy += 1
-                try:
-                    sequence = int(charge_line_search.group("sequence").strip())
-                except Exception:
-                    sequence = None
-                charge = Charge(
+                # This charge's disposition dates start on the next line. An overflow line
+                # isn't a date, so any other charge's dates have ended.
+                reading_dates = [may_overflow]
+                may_overflow = None
+                continue
+            may_overflow = None
+
+        disp_date_search = charge_disposition_date_pattern.search(ln)
+        if disp_date_search is not None:
+            for idx in reading_dates:
+                disp_date_searches[idx] = disp_date_search
+        else:
+            reading_dates = []
+
+        # not using the find_pattern function here because we're doing repeated searches on every line,
+        # and failing to match is not an error, in that case.
+        charge_line_search = charge_line_pattern.search(ln)
+        if charge_line_search is not None:
+            logger.debug(f"found a charge in line: {ln}")
+            try:
+                sequence = int(charge_line_search.group("sequence").strip())
+            except Exception:
+                sequence = None
+            charges.append(
+                Charge(
                     sequence=sequence,
-                    offense=offense,
+                    offense=charge_line_search.group("offense").strip(),
                     grade=charge_line_search.group("grade"),
                     statute=charge_line_search.group("statute"),
                     disposition=charge_line_search.group("disposition"),
                     sentences=[],  # TODO: re_parse_cp_pdf parser does not collect Sentences yet.
                 )
-
-                # sometimes a single charge may have multiple successive disposition dates. We need the last one.
-                next_line_index = idx_copy + 1
-                disp_date_search = re.search(
-                    r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",
-                    section_lines[next_line_index],
+            )
+            disp_date_searches.append(None)
+            reading_dates.append(len(charges) - 1)
+            may_overflow = len(charges) - 1
+
+    for charge, disp_date_search in zip(charges, disp_date_searches):
+        if disp_date_search is not None:
+            charge.disposition_date = date_or_none(
+                disp_date_search.group("disposition_date")
+            )
+            if charge.disposition_date is None:
+                errs.append(
+                    f"For the offense, {charge.sequence}/ {charge.offense}, we found, but could not parse, the disposition date: {disp_date_search.group('disposition_date')}"
                 )
-                while re.search(
-                    r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",
-                    section_lines[next_line_index],
-                ):
-                    disp_date_search = re.search(
-                        r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",
-                        section_lines[next_line_index],
-                    )
-                    next_line_index += 1
-
-                #
-                # disposition_date_line = section_lines[idx_copy + 1]
-                # disp_date_search = re.search(r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",disposition_date_line)
-                if disp_date_search is not None:
-                    charge.disposition_date = date_or_none(
-                        disp_date_search.group("disposition_date")
-                    )
-                    if charge.disposition_date is None:
-                        errs.append(
-                            f"For the offense, {charge.sequence}/ {offense}, we found, but could not parse, the disposition date: {disp_date_search.group('disposition_date')}"
-                        )
-                charges.append(charge)
     charges = Charge.reduce_merge(charges)
     missing_disposition_dates = [
         f"Could not find disposition date for {c.sequence} / {c.offense} with disposition {c.disposition}"
@@ -199,52 +271,92 @@ def parse_charges(txt: str) -> Tuple[Optional[List[Charge]], List[str]]:
     return charges, errs
 
 
-def parse_case(txt: str) -> Tuple[Case, List[str]]:
+docket_number_pattern = re.compile(
+    r"Docket Number:\s+(?P<docket_number>(MC|CP)\-\d{2}\-(\D{2})\-\d*\-\d{4})"
+)
+otn_pattern = re.compile(r"OTN:\s+(?P<otn>\D(\s)?\d+(\-\d)?)")
+costs_pattern = re.compile(
+    r"Totals:\s+\$(?P<charged>[\d\,]+\.\d{2})\s+"
+    + r"-?\(?\$(?P<paid>[\d\,]+\.\d{2})\)?\s+-?\(?\$"
+    + r"(?P<adjusted>[\d\,]+\.\d{2})\)?\s+-?\(?\$([\d\,]+"
+    + r"\.\d{2})\)?\s+-?\(?\$(?P<total>[\d\,]+\.\d{2})\)?"
+)
+status_pattern = re.compile(r"case status:\s+(?P<status>(?:\w+\s)+)", re.I)
+county_pattern = re.compile(r"\sof\s(?P<county>\w+)\sCOUNTY", re.I)
+complaint_date_pattern = re.compile(
+    r"Complaint Date:\s+(?P<complaint_date>\d{1,2}\/\d{1,2}\/\d{4})"
+)
+arrest_date_pattern = re.compile(
+    r"Arrest Date:\s+(?P<arrest_date>\d{1,2}\/\d{1,2}\/\d{4})"
+)
+disposition_date_pattern = re.compile(
+    r"(?:Plea|Status|Status of Restitution|Status - Community Court|"
+    + r"Status Listing|Migrated Dispositional Event|Trial|Preliminary Hearing|"
+    + r"Pre-Trial Conference)\s+(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})\s+"
+    + r"Final Disposition"
+)
+judge_assignment_pattern = re.compile(
+    r"Judge Assigned:\s+(?P<judge_assigned>.*)\s+(Date Filed|Issue Date):"
+)
+# the E.G., because it searched line by line, looked at the line following the line matching the judge search.
+# this parser doesn't look like by line, so I'm doing the same thing by concatenating the judge_assignment seach,
+# a new_line, and the overflow pattern.
+judge_overflow_pattern = re.compile(
+    judge_assignment_pattern.pattern + "\n" + r"^\s+(?P<judge_overflow>\w+\s*\w*)\s*$"
+)
+final_issuing_authority_pattern = re.compile(
+    r"Final Issuing Authority:\s+(?P<judge_name>.*)"
+)
+dc_pattern = re.compile(r"District Control Number\s+(?P<dc>\d+)")
+arresting_agency_pattern = re.compile(
+    r"Arresting Agency:\s+(?P<agency>.*)\s+Arresting Officer: (?P<officer>\D+)"
+)
+
+
+def parse_case(
+    txt: str, sections: Optional[Dict[str, str]] = None
+) -> Tuple[Case, List[str]]:
     """
     Use regexes to extract case information from the text of a docket.
 
+    Each field is looked for in the section of the docket it belongs to, rather than in the
+    whole docket.
+
     Args:
         txt (str): The text of a CP or MC docket. 
+        sections: The docket split with `split_sections`, if it has been already.
 
     """
-
+    if sections is None:
+        sections = split_sections(txt)
     errs = []
     case = Case(
         status=None, county=None, docket_number=None, otn=None, dc=None, charges=[]
     )
 
-    docket_number_search, dn_errs = find_pattern(
-        "docket_number",
-        r"Docket Number:\s+(?P<docket_number>(MC|CP)\-\d{2}\-(\D{2})\-\d*\-\d{4})",
-        txt,
+    docket_number_search, dn_errs = find_in_section(
+        "docket_number", docket_number_pattern, sections, DOCKET_HEADER, txt
     )
     if docket_number_search is not None:
         case.docket_number = docket_number_search.group("docket_number")
     else:
         errs.extend(dn_errs)
 
-    otn_search, otn_errs = find_pattern(
-        "otn", r"OTN:\s+(?P<otn>\D(\s)?\d+(\-\d)?)", txt
+    otn_search, otn_errs = find_in_section(
+        "otn", otn_pattern, sections, "CASE INFORMATION", txt
     )
     if otn_search is not None:
         case.otn = otn_search.group("otn")
     else:
         errs.extend(otn_errs)
 
-    charges, charge_errs = parse_charges(txt)
+    charges, charge_errs = parse_charges(txt, sections)
     case.charges = charges
     errs.extend(charge_errs)
 
     # TODO Bail search.
-    costs_search, costs_errs = find_pattern(
-        "costs",
-        (
-            r"Totals:\s+\$(?P<charged>[\d\,]+\.\d{2})\s+"
-            + r"-?\(?\$(?P<paid>[\d\,]+\.\d{2})\)?\s+-?\(?\$"
-            + r"(?P<adjusted>[\d\,]+\.\d{2})\)?\s+-?\(?\$([\d\,]+"
-            + r"\.\d{2})\)?\s+-?\(?\$(?P<total>[\d\,]+\.\d{2})\)?"
-        ),
-        txt,
+    costs_search, costs_errs = find_in_section(
+        "costs", costs_pattern, sections, "CASE FINANCIAL INFORMATION", txt
     )
     if costs_search is not None:
         case.total_fines = money_or_none(costs_search.group("charged"))
@@ -254,26 +366,24 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     else:
         errs.extend(costs_errs)
 
-    status_search, status_search_errs = find_pattern(
-        "status", r"case status:\s+(?P<status>(?:\w+\s)+)", txt, re.I
+    status_search, status_search_errs = find_in_section(
+        "status", status_pattern, sections, "STATUS INFORMATION", txt
     )
     if status_search is not None:
         case.status = status_search.group("status")
     else:
         errs.extend(status_search_errs)
 
-    cty_search, cty_errs = find_pattern(
-        "county", r"\sof\s(?P<county>\w+)\sCOUNTY", txt, re.I
+    cty_search, cty_errs = find_in_section(
+        "county", county_pattern, sections, DOCKET_HEADER, txt
     )
     if cty_search is not None:
         case.county = cty_search.group("county")
     else:
         errs.extend(cty_errs)
 
-    complaint_date_search, cd_errs = find_pattern(
-        "complaint_date",
-        r"Complaint Date:\s+(?P<complaint_date>\d{1,2}\/\d{1,2}\/\d{4})",
-        txt,
+    complaint_date_search, cd_errs = find_in_section(
+        "complaint_date", complaint_date_pattern, sections, "STATUS INFORMATION", txt
     )
     if complaint_date_search is not None:
         complaint_date = date_or_none(complaint_date_search.group("complaint_date"))
@@ -286,8 +396,8 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     else:
         errs.extend(cd_errs)
 
-    arrest_date_search, arrest_date_errs = find_pattern(
-        "arrest_date", r"Arrest Date:\s+(?P<arrest_date>\d{1,2}\/\d{1,2}\/\d{4})", txt
+    arrest_date_search, arrest_date_errs = find_in_section(
+        "arrest_date", arrest_date_pattern, sections, "STATUS INFORMATION", txt
     )
     if arrest_date_search is not None:
         arrest_date = date_or_none(arrest_date_search.group("arrest_date"))
@@ -300,12 +410,11 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     else:
         errs.extend(arrest_date_errs)
 
-    disp_date_search, _ = find_pattern(
+    disp_date_search, _ = find_in_section(
         "disposition_date",
-        r"(?:Plea|Status|Status of Restitution|Status - Community Court|"
-        + r"Status Listing|Migrated Dispositional Event|Trial|Preliminary Hearing|"
-        + r"Pre-Trial Conference)\s+(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})\s+"
-        + r"Final Disposition",
+        disposition_date_pattern,
+        sections,
+        "DISPOSITION SENTENCING/PENALTIES",
         txt,
     )
     if disp_date_search is not None:
@@ -328,23 +437,18 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     #   judge's name appears in the Judge Assigned field.  If it does, then set it.
     #   Later on, we'll check in the "Final Issuing Authority" field.  If it appears there
     #   and doesn't show up as "migrated," we'll reassign the judge name.
-    judge_assignment_pattern = (
-        r"Judge Assigned:\s+(?P<judge_assigned>.*)\s+(Date Filed|Issue Date):"
-    )
-    judge_assigned_search, judge_assigned_errs = find_pattern(
-        "judge_assigned", judge_assignment_pattern, txt
+    judge_assigned_search, judge_assigned_errs = find_in_section(
+        "judge_assigned", judge_assignment_pattern, sections, "CASE INFORMATION", txt
     )
     if judge_assigned_search is not None:
         judge_assigned = judge_assigned_search.group("judge_assigned")
         judge_assigned.replace("Magisterial District Judge", "").strip()
-        # the E.G., because it searched line by line, looked at the line following the line matching the judge search.
-        # this parser doesn't look like by line, so I'm doing the same thing by concatenating the judge_assignment seach,
-        # a new_line, and the overflow pattern.
-
         # N.B. the EG only searches for overflow if "Magisterial District Judge" was in the assigned judge name. is that necessary?
-        judge_overflow_search, _ = find_pattern(
+        judge_overflow_search, _ = find_in_section(
             "judge_overflow_info",
-            judge_assignment_pattern + "\n" + r"^\s+(?P<judge_overflow>\w+\s*\w*)\s*$",
+            judge_overflow_pattern,
+            sections,
+            "CASE INFORMATION",
             txt,
         )
         if judge_overflow_search is not None:
@@ -358,15 +462,19 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
         errs.extend(judge_assigned_errs)
 
     # sometimes the judge is identified as the Final Issuing Authority.
-    final_issue_auth_search, _ = find_pattern(
-        "final_issuing_authority", r"Final Issuing Authority:\s+(?P<judge_name>.*)", txt
+    final_issue_auth_search, _ = find_in_section(
+        "final_issuing_authority",
+        final_issuing_authority_pattern,
+        sections,
+        "CASE INFORMATION",
+        txt,
     )
     if final_issue_auth_search is not None:
         judge_name = final_issue_auth_search.group("judge_name").strip()
         if not re.search("migrated", judge_name, re.I):
             case.judge = judge_name
 
-    dc_search, _ = find_pattern("dc", r"District Control Number\s+(?P<dc>\d+)", txt)
+    dc_search, _ = find_in_section("dc", dc_pattern, sections, "CASE INFORMATION", txt)
     if dc_search is not None:
         case.dc = dc_search.group("dc")
     # The District Control Number actually seems pretty rare,
@@ -374,9 +482,11 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     # else:
     # errs.extend(dc_errs)
 
-    arresting_agency_search, arresting_agency_errs = find_pattern(
+    arresting_agency_search, arresting_agency_errs = find_in_section(
         "arresting_agency and officer",
-        r"Arresting Agency:\s+(?P<agency>.*)\s+Arresting Officer: (?P<officer>\D+)",
+        arresting_agency_pattern,
+        sections,
+        "CASE INFORMATION",
         txt,
     )
     if arresting_agency_search is not None:
@@ -398,8 +508,9 @@ def parse_cp_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
 
     This function takes the text of the docket, extracted from a pdf.
     """
-    person, person_errs = parse_person(txt)
-    case, case_errs = parse_case(txt)
+    sections = split_sections(txt)
+    person, person_errs = parse_person(txt, sections)
+    case, case_errs = parse_case(txt, sections)
     return person, [case], person_errs + case_errs
 
 
@@ -424,4 +535,3 @@ def parse_cp_pdf(pdf: Union[BinaryIO, str]) -> Tuple[Person, List[Case], List[st
     if txt == "":
         return None, None, ["could not extract text from pdf"]
     return parse_cp_pdf_text(txt)
-
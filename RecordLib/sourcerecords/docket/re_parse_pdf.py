@@ -1,24 +1,30 @@
-import re
 from RecordLib.sourcerecords.docket.re_parse_cp_pdf import (
     parse_cp_pdf_text as re_parse_cp_pdf_text,
 )
 from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import (
     parse_mdj_pdf_text as re_parse_mdj_pdf_text,
 )
-from typing import Tuple, List
+from typing import Tuple, List, Iterable
 from RecordLib.crecord import Person, Case
 from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.sourcerecords.dispatch import detect, COURTS
 
 
 def which_court(txt: str) -> str:
     """
-    given the text of a docket, 
+    given the text of a docket, identify its court from the docket's header.
+
+    Returns:
+        "CP" for Common Pleas and Municipal Court dockets, which have the same parser, "MDJ" for
+        Magisterial District dockets, or "" if the court isn't clear.
     """
-    if re.search("common pleas", txt, re.I):
-        return "CP"
-    if re.search("magisterial district", txt, re.I):
+    registration = detect(txt, record_type=SourceRecord.RECORD_TYPES.DOCKET)
+    if registration is None:
+        return ""
+    if registration.court == COURTS.MDJ:
         return "MDJ"
-    return ""
+    return "CP"
 
 
 def re_parse_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
@@ -29,6 +35,19 @@ def re_parse_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
         return re_parse_cp_pdf_text(txt)
 
 
+def re_parse_pdf_pages(pages: Iterable[str]) -> Tuple[Person, List[Case], List[str]]:
+    """
+    Parse a docket from the text of its pages, such as the pages yielded by `iter_pages_from_pdf`.
+
+    The regex parsers look for sections of a docket that can be split across pages, so
+    the pages are joined back together before parsing.
+    """
+    txt = "".join(pages)
+    if txt == "":
+        return None, None, ["could not extract text from pdf"]
+    return re_parse_pdf_text(txt)
+
+
 def re_parse_pdf(path: str) -> Tuple[Person, List[Case], List[str]]:
     """
     Parse, using regex parsers, a pdf of a docket. This function doesn't care what court the docket relates to. It will figure it out.
@@ -0,0 +1,186 @@
+"""
+A process-wide registry of compiled parsimonious grammars.
+
+Compiling a parsimonious grammar from its source is slow: the docket section grammars each
+take tens of milliseconds, and the summary grammars together take about a third of a second.
+The parsers used to compile some of them again for every docket. `get_grammar` compiles each
+grammar once per process, and afterwards hands out the same Grammar object.
+
+Compiled grammars can also be kept on disk, so that a new process (a worker, say) loads them
+instead of compiling them. Set the environment variable `GRAMMAR_CACHE_DIR` to use a disk
+cache. Grammars are stored as pickles, under the SHA-256 of their source and the versions of
+Python and parsimonious, so only point this at a directory that RecordLib alone writes to.
+"""
+from __future__ import annotations
+from typing import Dict, Optional
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import logging
+from parsimonious.grammar import Grammar  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+_parsimonious_version = None
+
+
+def parsimonious_version() -> str:
+    """ The installed version of parsimonious. Only looked up if grammars are kept on disk. """
+    global _parsimonious_version
+    if _parsimonious_version is None:
+        try:
+            from importlib import metadata
+        except ImportError:
+            # Python 3.7 only has the importlib_metadata backport, if that.
+            try:
+                import importlib_metadata as metadata  # type: ignore
+            except ImportError:
+                _parsimonious_version = "unknown"
+                return _parsimonious_version
+        try:
+            _parsimonious_version = metadata.version("parsimonious")
+        except metadata.PackageNotFoundError:
+            _parsimonious_version = "unknown"
+    return _parsimonious_version
+
+
+class GrammarRegistry:
+    """
+    Compiles grammars once, and shares the compiled grammars.
+
+    Grammars are only read while parsing, so one Grammar can be shared by every thread.
+
+    Args:
+        directory: Where compiled grammars are kept on disk. If None, grammars are only kept in
+            memory.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        # Compiled grammars, by their source.
+        self._grammars: Dict[str, Grammar] = {}
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "disk_hits": 0, "compiled": 0}
+
+    @staticmethod
+    def key(source: str) -> str:
+        """
+        The key for the source of a grammar in the disk cache.
+        """
+        digest = hashlib.sha256(source.encode("utf8"))
+        digest.update(
+            f"python {sys.version_info[0]}.{sys.version_info[1]} ".encode("utf8")
+        )
+        digest.update(f"parsimonious {parsimonious_version()}".encode("utf8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.grammar")
+
+    def get(self, source: str) -> Grammar:
+        """
+        The compiled Grammar for the source of a grammar.
+        """
+        with self._lock:
+            grammar = self._grammars.get(source)
+            if grammar is not None:
+                self._counts["hits"] += 1
+                return grammar
+        key = self.key(source) if self.directory is not None else None
+        grammar = self._load(key)
+        if grammar is None:
+            grammar = Grammar(source)
+            compiled = True
+            self._store(key, grammar)
+        else:
+            compiled = False
+        with self._lock:
+            # If another thread got here first, share its grammar.
+            grammar = self._grammars.setdefault(source, grammar)
+            self._counts["compiled" if compiled else "disk_hits"] += 1
+        return grammar
+
+    def _load(self, key: Optional[str]) -> Optional[Grammar]:
+        """ Read a compiled grammar from the disk cache, if it's there. """
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                grammar = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not load compiled grammar {key}: {e}")
+            return None
+        if not isinstance(grammar, Grammar):
+            logger.warning(f"The grammar cache file for {key} does not hold a grammar.")
+            return None
+        return grammar
+
+    def _store(self, key: Optional[str], grammar: Grammar) -> None:
+        """ Write a compiled grammar to the disk cache. """
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first, so other processes never read half a grammar.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError as e:
+            logger.error(f"Could not write compiled grammar to the cache: {e}")
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(grammar, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, pickle.PicklingError, RecursionError) as e:
+            logger.error(f"Could not write compiled grammar to the cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Forget the grammars compiled in this process. The disk cache is left alone.
+        """
+        with self._lock:
+            self._grammars.clear()
+
+    def stats(self) -> dict:
+        """
+        Counts of how the registry has been used, since the process started.
+        """
+        with self._lock:
+            stats = dict(self._counts)
+            stats["grammars"] = len(self._grammars)
+        return stats
+
+
+_default_grammar_registry = None
+_default_grammar_registry_lock = threading.Lock()
+
+
+def default_grammar_registry() -> GrammarRegistry:
+    """
+    The process's grammar registry, configured by the environment variable
+    `GRAMMAR_CACHE_DIR`.
+    """
+    global _default_grammar_registry
+    if _default_grammar_registry is None:
+        with _default_grammar_registry_lock:
+            if _default_grammar_registry is None:
+                _default_grammar_registry = GrammarRegistry(
+                    directory=os.environ.get("GRAMMAR_CACHE_DIR") or None
+                )
+    return _default_grammar_registry
+
+
+def get_grammar(source: str) -> Grammar:
+    """
+    The compiled Grammar for the source of a grammar, compiled at most once per process.
+    """
+    return default_grammar_registry().get(source)
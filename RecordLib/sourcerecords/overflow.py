@@ -3,11 +3,16 @@ Module for tools to remove overflowing lines from dockets.
 
 
 Lines that repeat across page breaks in summaries and dockets are a big problem. These tools deal with those.
+
+Each kind of overflow is an `OverflowFilter`. An `OverflowPipeline` stitches the lines of
+consecutive pages together, and at each page break applies the first of its filters whose
+condition is satisfied.
 """
-from typing import List, Tuple
+from typing import Iterable, List, Sequence, Tuple, Type
 import re
 from RecordLib.utilities.references import pa_counties, statuses
 
+
 class OverflowFilter:
     @staticmethod
     def condition(prev: List[str], next: List[str]) -> bool:
@@ -39,19 +44,152 @@ class OverflowFilter:
                     counter += 1
         return ""
 
+    @staticmethod
+    def trailing_blank_lines(prev: List[str]) -> int:
+        """Return the number of blank lines at the end of a list of lines."""
+        blanks = 0
+        for ln in reversed(prev):
+            if ln.strip() != "":
+                break
+            blanks += 1
+        return blanks
+
+
+class OverflowPipeline:
+    """ Stitch the lines of the pages of a document together, without the lines that overflow from one page to the next.
+
+    Args:
+        filters: OverflowFilters, in the order their conditions are checked. At each page break, only the first filter
+            whose condition is satisfied removes lines.
+        filter_first_page: Also apply the filters to the start of the first page, as if it followed a page with no lines.
+        unfiltered_prev: Show the filters all the lines of the previous page, instead of the lines kept from it.
+    """
+
+    def __init__(
+        self,
+        filters: Sequence[Type[OverflowFilter]],
+        filter_first_page: bool = False,
+        unfiltered_prev: bool = False,
+    ):
+        self.filters = list(filters)
+        self.filter_first_page = filter_first_page
+        self.unfiltered_prev = unfiltered_prev
+
+    def filter(self, prev: List[str], next: List[str]) -> Tuple[int, List[str]]:
+        """ Apply the first filter whose condition is satisfied to the lines either side of a page break.
+
+        Returns:
+            The number of lines to remove from the end of `prev`, and the lines of `next` to keep.
+        """
+        for overflow_filter in self.filters:
+            if overflow_filter.condition(prev, next):
+                prev_length = len(prev)
+                prev, next = overflow_filter.remove_overflow(prev, next)
+                return prev_length - len(prev), next
+        return 0, next
+
+    def stitch(self, pages: Iterable[List[str]]) -> List[str]:
+        """ Join the lines of each page into one list of lines.
+
+        Lines are added to the end of a single list, and removed from its end, so stitching takes time in
+        proportion to the number of lines.
+        """
+        lines: List[str] = []
+        prev = [] if self.filter_first_page else None
+        for page in pages:
+            next = page
+            if prev is not None:
+                lines_to_remove, next = self.filter(prev, next)
+                if lines_to_remove > 0:
+                    del lines[-lines_to_remove:]
+            lines.extend(next)
+            prev = page if self.unfiltered_prev else next
+        return lines
+
+
+_mdj_case_line_start = re.compile(r"MJ-|Arr|Las|Nex|Bail")
+_county_or_status = re.compile("|".join(pa_counties) + "|" + "|".join(statuses))
+
+
+class MDJOverflowAfterCaseLine(OverflowFilter):
+    """Overflow filter for MDJ Summary sheets, in the case where a page overflows just after one of the first lines of
+    a case. The next page repeats the case status."""
+    @staticmethod
+    def condition(prev: List[str], next: List[str]) -> bool:
+        return _mdj_case_line_start.match(prev[-1].strip()) is not None
+
+    @staticmethod
+    def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
+        return prev, next[2:]
+
+
+class MDJOverflowAfterCaseLineAndBlank(OverflowFilter):
+    """Overflow filter for MDJ Summary sheets, like `MDJOverflowAfterCaseLine`, but with a blank line before the page
+    break."""
+    @staticmethod
+    def condition(prev: List[str], next: List[str]) -> bool:
+        return prev[-1].strip() == "" and _mdj_case_line_start.match(prev[-2].strip()) is not None
+
+    @staticmethod
+    def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
+        return prev[:-1], next[2:]
+
+
+class MDJOverflowIntoSentences(OverflowFilter):
+    """Overflow filter for MDJ Summary sheets, in the case where a page overflows from the end of the list of charges
+    to the list of sentences."""
+    @staticmethod
+    def condition(prev: List[str], next: List[str]) -> bool:
+        return "§" in OverflowFilter.previous_nonblank_line(prev) and any(
+            "Program Type" in ln for ln in next[2:6]
+        )
+
+    @staticmethod
+    def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
+        blanks = OverflowFilter.trailing_blank_lines(prev)
+        return prev[: len(prev) - blanks], next[2:]
+
+
+class MDJOverflowAfterStatuteHeader(OverflowFilter):
+    """Overflow filter for MDJ Summary sheets, in the case where a page overflows just after the header of the list of
+    charges."""
+    @staticmethod
+    def condition(prev: List[str], next: List[str]) -> bool:
+        return "Statute" in OverflowFilter.previous_nonblank_line(prev)
+
+    @staticmethod
+    def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
+        blanks = OverflowFilter.trailing_blank_lines(prev)
+        return prev[: len(prev) - blanks], next[3:]
+
+
+class MDJOnlyRepeatedLines(OverflowFilter):
+    """Overflow filter for MDJ Summary sheets, in the case where the only lines on a page are repeated lines. If there
+    are 4 lines or fewer on the page, they're not important."""
+    @staticmethod
+    def condition(prev: List[str], next: List[str]) -> bool:
+        return len(next) <= 4
+
+    @staticmethod
+    def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
+        return prev, []
+
+
 class MDJOverflowInChargeList(OverflowFilter):
     """Overflow filter for MDJ Summary sheets, in the case where a page overflows in the middle of a list of charges."""
     @staticmethod
     def condition(prev: List[str], next: List[str]) -> bool:
-        if re.search("§", OverflowFilter.previous_nonblank_line(prev)) and re.search("Statute", next[2]):
+        last_line = OverflowFilter.previous_nonblank_line(prev)
+        second_to_last_line = OverflowFilter.previous_nonblank_line(prev, n=2)
+        if "§" in last_line and "Statute" in next[2]:
             return True
-        if re.search("§", OverflowFilter.previous_nonblank_line(prev, n=2)) and re.search("Statute", next[2]):
+        if "§" in second_to_last_line and "Statute" in next[2]:
             return True
-        if re.search("§", OverflowFilter.previous_nonblank_line(prev, n=2)) and re.search("Program", next[3]):
+        if "§" in second_to_last_line and "Program" in next[3]:
             return True
-        if re.search("§", OverflowFilter.previous_nonblank_line(prev)) and re.search("Statewide", next[0]) and re.search("Statute", next[3]):
+        if "§" in last_line and "Statewide" in next[0] and "Statute" in next[3]:
             return True
-        if re.search("§", OverflowFilter.previous_nonblank_line(prev, n=2)) and re.search("Statewide", next[0]) and re.search("Statute", next[3]):
+        if "§" in second_to_last_line and "Statewide" in next[0] and "Statute" in next[3]:
             return True
         return False
 
@@ -59,10 +197,10 @@ class MDJOverflowInChargeList(OverflowFilter):
     @staticmethod
     def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
         while prev and prev[-1].strip() == "": prev.pop()
-        if re.search("Program", next[3]):
+        if "Program" in next[3]:
             # There should be a blank line before Program.
             next = next[2:]
-        elif re.search("Statewide", next[0]):
+        elif "Statewide" in next[0]:
             next = next[4:]
         else:
             next = next[3:]
@@ -75,7 +213,7 @@ class MDJFirstCoupleLinesOverflow(OverflowFilter):
 
     For example:
 
-    .. code-block:: 
+    .. code-block::
 
         [prev section]
         Inactive
@@ -91,20 +229,15 @@ class MDJFirstCoupleLinesOverflow(OverflowFilter):
             MJ-<...>
     """
 
+    @staticmethod
     def condition(prev: List[str], next: List[str]) -> bool:
         """ True or false, depending on whether this class's condition is satisfied.
 
         True if the page overflows after just the case status and a county name.
         """
-        preceeding_blanks = 0
-        for ln in reversed(prev):
-            if ln.strip() != "":
-                prev_nonblank_line = ln
-                break
-            preceeding_blanks += 1
-        if re.search("|".join(pa_counties) + "|" + "|".join(statuses),prev_nonblank_line):
-            return True
+        return _county_or_status.search(OverflowFilter.previous_nonblank_line(prev)) is not None
 
+    @staticmethod
     def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
         already_found_text = False
         lines_to_remove = 0
@@ -117,3 +250,71 @@ class MDJFirstCoupleLinesOverflow(OverflowFilter):
         if lines_to_remove > 0:
             return prev[:-lines_to_remove], next
         return prev, next
+
+
+_cp_docket_number = re.compile(r"(CP\S+)\s")
+
+
+class CPContinuedOverflow(OverflowFilter):
+    """ Overflow filter for CP summary sheets, where each page after the first starts with '(Continued)' lines, and
+    repeats the first lines of the case that overflowed onto it.
+    """
+
+    @staticmethod
+    def condition(prev: List[str], next: List[str]) -> bool:
+        return len(next) > 0 and "(Continued)" in next[0]
+
+    @staticmethod
+    def _previous_line_ends_case_details(p_line: str) -> bool:
+        return "Def" in p_line or "Arrest" in p_line or "Next" in p_line or "Disp " in p_line
+
+    @staticmethod
+    def remove_overflow(prev: List[str], next: List[str]) -> Tuple[List[str],List[str]]:
+        line_count = len(next)
+        lines_to_remove = 1
+        if line_count > 1 and "(Continued)" in next[1]:
+            lines_to_remove += 1
+            if line_count > 2:
+                line = next[2]
+                match = _cp_docket_number.search(line)
+                if match:
+                    cp_id = match.group(1)
+                    if any(cp_id in ln for ln in prev):
+                        # The first lines of the case are repeated.
+                        lines_to_remove += 1
+                        if line_count > 3 and "Arrest Dt" in next[3]:
+                            for n, repeated in enumerate(["Arrest Dt", "Def Atty", "Seq No", "Sentence"], start=3):
+                                if line_count > n and repeated in next[n]:
+                                    lines_to_remove += 1
+                                else:
+                                    break
+                        elif line_count > 3 and "Seq No" in next[3]:
+                            p_line = prev[-1]
+                            if not CPContinuedOverflow._previous_line_ends_case_details(p_line):
+                                lines_to_remove += 1
+                                if "Sentence" in next[4] and "Seq No" not in p_line:
+                                    lines_to_remove += 1
+                elif "Seq No" in line:
+                    p_line = prev[-1]
+                    if not CPContinuedOverflow._previous_line_ends_case_details(p_line):
+                        lines_to_remove += 1
+                        if "Sentence" in next[3] and "Seq No" not in p_line:
+                            lines_to_remove += 1
+        return prev, next[lines_to_remove:]
+
+
+mdj_summary_overflow = OverflowPipeline(
+    [
+        MDJOverflowAfterCaseLine,
+        MDJOverflowAfterCaseLineAndBlank,
+        MDJOverflowIntoSentences,
+        MDJOverflowAfterStatuteHeader,
+        MDJOnlyRepeatedLines,
+        MDJFirstCoupleLinesOverflow,
+        MDJOverflowInChargeList,
+    ]
+)
+
+cp_summary_overflow = OverflowPipeline(
+    [CPContinuedOverflow], filter_first_page=True, unfiltered_prev=True
+)
@@ -0,0 +1,150 @@
+"""
+Lightweight trees built directly from parse trees.
+
+Visitors made by `CustomVisitorFactory` used to write the nodes of a parse tree out as a string
+of xml, which then got parsed again by lxml before anything could be read from it. A visitor
+can instead build a tree of `ParseNode`s as it goes.
+
+A ParseNode behaves like the parts of an lxml Element that the parsers use:
+
+- `text` and `tail` hold the same text they would if the node had been written out as xml
+  and read back in,
+- `find`, `findall` and `iter` take simple paths, such as "case_basics/docket_num" or
+  ".//sentencing_info", and
+- `getparent` and `append` work like lxml's.
+
+So functions that read the parsed trees with only these methods work on either kind of tree.
+`ParseNode.to_xml` converts a tree to lxml, to look at it while debugging.
+"""
+from __future__ import annotations
+from typing import Iterator, List, Optional, Union
+from lxml import etree
+
+
+class ParseNode:
+    """
+    A node in a tree built from a parse tree. See the module docstring.
+    """
+
+    __slots__ = ("tag", "text", "tail", "_children", "_parent")
+
+    def __init__(self, tag: str, text: Optional[str] = None):
+        self.tag = tag
+        self.text = text
+        self.tail = None
+        self._children: List[ParseNode] = []
+        self._parent: Optional[ParseNode] = None
+
+    def __repr__(self):
+        return f"<ParseNode {self.tag}>"
+
+    def __iter__(self) -> Iterator[ParseNode]:
+        return iter(self._children)
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def __getitem__(self, index: int) -> ParseNode:
+        return self._children[index]
+
+    def append(self, child: ParseNode) -> None:
+        """ Add a child. Like lxml, this moves a child that already has a parent. """
+        if child._parent is not None:
+            child._parent._children.remove(child)
+        child._parent = self
+        self._children.append(child)
+
+    def getparent(self) -> Optional[ParseNode]:
+        return self._parent
+
+    def iter(self, tag: Optional[str] = None) -> Iterator[ParseNode]:
+        """
+        This node and all its descendants, in document order, optionally only those with a
+        tag.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if tag is None or tag == "*" or node.tag == tag:
+                yield node
+            stack.extend(reversed(node._children))
+
+    def findall(self, path: str) -> List[ParseNode]:
+        """
+        Find the nodes matching a path.
+
+        Paths are tags separated by "/", like "arrest_disp_actions/arrest_disp/disp_date".
+        A "//" (or a leading ".//") looks at every descendant instead of only at children, and
+        "*" matches any tag.
+        """
+        steps = path.split("/")
+        if steps[0] == ".":
+            steps = steps[1:]
+        nodes = [self]
+        descendants = False
+        for step in steps:
+            if step == "":
+                descendants = True
+                continue
+            found = []
+            seen = set()
+            for node in nodes:
+                candidates = (
+                    node.iter(step) if descendants else node._children_tagged(step)
+                )
+                for candidate in candidates:
+                    if candidate is node or id(candidate) in seen:
+                        continue
+                    seen.add(id(candidate))
+                    found.append(candidate)
+            nodes = found
+            descendants = False
+        return nodes
+
+    def _children_tagged(self, tag: str) -> Iterator[ParseNode]:
+        return (child for child in self._children if tag == "*" or child.tag == tag)
+
+    def find(self, path: str) -> Optional[ParseNode]:
+        """
+        The first node matching a path (see `findall`), or None.
+        """
+        found = self.findall(path)
+        return found[0] if found else None
+
+    def to_xml(self) -> etree.Element:
+        """
+        Copy this tree into an lxml Element.
+        """
+        element = etree.Element(self.tag)
+        element.text = self.text
+        for child in self._children:
+            child_element = child.to_xml()
+            child_element.tail = child.tail
+            element.append(child_element)
+        return element
+
+
+def build_node(tag: str, pieces: Union[str, List]) -> ParseNode:
+    """
+    Make a node out of a string or a list of strings and ParseNodes, as if they were written
+    out as the contents of an xml element, with a space at either end, and read back in.
+    """
+    if isinstance(pieces, str):
+        return ParseNode(tag, f" {pieces} ")
+    node = ParseNode(tag, " ")
+    last = None
+    for piece in pieces:
+        if isinstance(piece, str):
+            if last is None:
+                node.text += piece
+            else:
+                last.tail += piece
+        else:
+            piece.tail = ""
+            node.append(piece)
+            last = piece
+    if last is None:
+        node.text += " "
+    else:
+        last.tail += " "
+    return node
@@ -1,8 +1,7 @@
-from typing import Union, BinaryIO, Optional
-import os
-import tempfile
+from typing import Union, BinaryIO, Optional, Iterable, Iterator
 import logging
 from datetime import datetime
+from RecordLib.sourcerecords.pdfextraction import default_extractor
 
 
 logger = logging.getLogger(__name__)
@@ -10,35 +9,45 @@ logger = logging.getLogger(__name__)
 def get_text_from_pdf(pdf: Union[BinaryIO, str]) -> str:
     """
     Function which extracts the text from a pdf document.
+
+    The work is handed to the shared pool of pdftotext workers.
+
     Args:
         pdf:  Either a file object or the location of a pdf document.
-        tempdir:  Place to store intermediate files.
+
+    Returns:
+        The extracted text of the pdf, or "" if the text could not be extracted.
+    """
+    return default_extractor().extract(pdf)
 
 
+def get_texts_from_pdfs(pdfs: Iterable[Union[BinaryIO, str]]) -> Iterator[str]:
+    """
+    Extract the text from many pdf documents, concurrently.
+
+    Args:
+        pdfs: File objects or locations of pdf documents.
+
     Returns:
-        The extracted text of the pdf.
-    """
-    with tempfile.TemporaryDirectory() as out_dir:
-        if hasattr(pdf, "read"):
-            # the pdf attribute is a file object,
-            # and we need to write it out, for pdftotext to use it.
-            pdf_path = os.path.join(out_dir, "tmp.pdf")
-            with open(pdf_path, "wb") as f:
-                f.write(pdf.read())
-        else:
-            pdf_path = pdf
-        # TODO - remove the option of making tempdir anything other than a tempfile. 
-        #        Only doing it this way to avoid breaking old tests that send tempdir.
-        #out_path = os.path.join(tempdir, "tmp.txt")
-        out_path = os.path.join(out_dir, "tmp.txt")
-        os.system(f'pdftotext -layout -enc "UTF-8" { pdf_path } { out_path }')
-        try:
-            with open(os.path.join(out_dir, "tmp.txt"), "r", encoding="utf8") as f:
-                text = f.read()
-                return text
-        except IOError as e:
-            logger.error("Cannot extract pdf text..")
-            return ""
+        An iterator of the extracted texts, in the same order as `pdfs`.
+    """
+    return default_extractor().extract_many(pdfs)
+
+
+def iter_pages_from_pdf(pdf: Union[BinaryIO, str]) -> Iterator[str]:
+    """
+    Extract the text from a pdf document one page at a time.
+
+    Args:
+        pdf: Either a file object or the location of a pdf document.
+
+    Returns:
+        An iterator of the text of each page. Each page ends with the form feed that
+        separates it from the next page. If the text could not be extracted, the iterator
+        is empty.
+    """
+    return default_extractor().iter_pages(pdf)
+
 
 def date_or_none(date_text: str, fmtstr: str = r"%m/%d/%Y") -> datetime:
     """
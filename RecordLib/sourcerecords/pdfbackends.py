@@ -0,0 +1,353 @@
+"""
+Backends that turn the bytes of a pdf into text.
+
+Every backend produces text laid out the way `pdftotext -layout` lays it out, because that's
+what the docket and summary parsers expect: columns separated by runs of spaces, the words of
+a phrase separated by single spaces, and a form feed at the end of every page.
+
+- `PdfToTextBackend` runs the pdftotext command line tool.
+- `PdfMinerBackend` reads the pdf in-process with pdfminer.six and places each character on a
+  grid of fixed-width columns to emulate `-layout`. It needs `pip install pdfminer.six`.
+
+Pick a backend with the environment variable `PDF_TEXT_BACKEND` ("pdftotext", the default,
+or "pdfminer").
+"""
+from __future__ import annotations
+from typing import Iterator, List, Optional
+from abc import ABC, abstractmethod
+import os
+import io
+import codecs
+import statistics
+import subprocess
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+PDFTOTEXT_ARGS = ["pdftotext", "-layout", "-enc", "UTF-8"]
+
+# Every page of extracted text ends with a form feed.
+PAGE_BREAK = "\f"
+
+# How many bytes of pdftotext's output to read at a time, when streaming pages.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ExtractionError(Exception):
+    """ Raised when a backend cannot extract the text of a pdf. """
+
+
+class ExtractionBackend(ABC):
+    """
+    Interface for the ways of turning a pdf into text.
+
+    A backend gets either the path to a pdf or the pdf's bytes, never both.
+    """
+
+    name = ""
+
+    @property
+    @abstractmethod
+    def version(self) -> str:
+        """
+        Identifies the backend and its settings, so cached texts from a different backend
+        or version aren't reused.
+        """
+
+    def extract(self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]) -> str:
+        """
+        Extract the text of a whole pdf.
+
+        Raises:
+            ExtractionError if the text can't be extracted.
+        """
+        return "".join(self.iter_pages(pdf_path, pdf_bytes))
+
+    @abstractmethod
+    def iter_pages(
+        self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]
+    ) -> Iterator[str]:
+        """
+        Extract the text of a pdf one page at a time. Each page ends with a form feed.
+
+        Raises:
+            ExtractionError if the text can't be extracted.
+        """
+
+
+class PdfToTextBackend(ExtractionBackend):
+    """
+    Extract text by running pdftotext.
+
+    Args:
+        command: The extraction command, without the input and output arguments.
+            Defaults to `PDFTOTEXT_ARGS`.
+    """
+
+    name = "pdftotext"
+
+    def __init__(self, command: Optional[List[str]] = None):
+        self.command = command or PDFTOTEXT_ARGS
+        self._version = None
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            version = " ".join(self.command)
+            if self.command[0] == "pdftotext":
+                try:
+                    proc = subprocess.run(
+                        ["pdftotext", "-v"],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
+                    )
+                    version += (
+                        " "
+                        + proc.stdout.decode("utf8", errors="replace")
+                        .split("\n")[0]
+                        .strip()
+                    )
+                except OSError:
+                    pass
+            self._version = version
+        return self._version
+
+    def extract(self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]) -> str:
+        source = pdf_path if pdf_path is not None else "-"
+        try:
+            proc = subprocess.run(
+                self.command + [source, "-"],
+                input=pdf_bytes,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as e:
+            raise ExtractionError(str(e))
+        if proc.returncode != 0:
+            raise ExtractionError(proc.stderr.decode("utf8", errors="replace").strip())
+        return proc.stdout.decode("utf8", errors="replace")
+
+    def iter_pages(
+        self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]
+    ) -> Iterator[str]:
+        """
+        Yield each page as soon as pdftotext writes it.
+        """
+        source = pdf_path if pdf_path is not None else "-"
+        try:
+            proc = subprocess.Popen(
+                self.command + [source, "-"],
+                stdin=subprocess.PIPE if pdf_bytes is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as e:
+            raise ExtractionError(str(e))
+        if pdf_bytes is not None:
+            # Feed the pdf from another thread, so a full stdout pipe can't block us.
+            feeder = threading.Thread(
+                target=_feed, args=(proc.stdin, pdf_bytes), daemon=True
+            )
+            feeder.start()
+        completed = False
+        try:
+            decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+            buffer = ""
+            while True:
+                chunk = proc.stdout.read(STREAM_CHUNK_SIZE)
+                buffer += decoder.decode(chunk, final=(chunk == b""))
+                pages = buffer.split(PAGE_BREAK)
+                buffer = pages.pop()
+                for page in pages:
+                    yield page + PAGE_BREAK
+                if chunk == b"":
+                    break
+            if buffer.strip() != "":
+                yield buffer
+            completed = True
+        finally:
+            if not completed:
+                proc.kill()
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            proc.wait()
+            if pdf_bytes is not None:
+                feeder.join()
+        if proc.returncode != 0:
+            raise ExtractionError(stderr.decode("utf8", errors="replace").strip())
+
+
+def _feed(stdin, data: bytes) -> None:
+    try:
+        stdin.write(data)
+    except OSError:
+        # The process exited before it read everything.
+        pass
+    finally:
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+
+class PdfMinerBackend(ExtractionBackend):
+    """
+    Extract text in-process with pdfminer.six, emulating `pdftotext -layout`.
+
+    pdfminer reports where every character sits on the page. Characters are grouped into
+    lines by their baselines, and each line is laid out on a grid of columns as wide as the
+    page's typical character:
+
+    - characters that touch, or nearly touch, belong to the same word,
+    - a gap about the width of a space becomes a single space, so phrases stay intact, and
+    - a wider gap becomes at least two spaces, padded out to the column the next character
+      sits in, so columns line up the way they do in pdftotext's output. Columns are counted
+      from the leftmost character on the page.
+
+    A vertical gap of more than one line between baselines becomes blank lines.
+    """
+
+    name = "pdfminer"
+    # Bump this when the layout emulation changes, so cached texts get re-extracted.
+    LAYOUT_VERSION = "1"
+
+    # Gaps narrower than this fraction of a character width don't separate words.
+    WORD_GAP = 0.25
+    # Gaps wider than this many character widths separate columns.
+    COLUMN_GAP = 1.5
+
+    def __init__(self):
+        try:
+            import pdfminer
+        except ImportError as e:
+            raise ImportError(
+                "The pdfminer text backend needs pdfminer.six. Install it with "
+                "`pip install pdfminer.six`."
+            ) from e
+        self._pdfminer_version = pdfminer.__version__
+
+    @property
+    def version(self) -> str:
+        return f"pdfminer.six {self._pdfminer_version} layout {self.LAYOUT_VERSION}"
+
+    def iter_pages(
+        self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]
+    ) -> Iterator[str]:
+        from pdfminer.pdfparser import PDFParser, PDFSyntaxError
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+        from pdfminer.converter import PDFPageAggregator
+
+        if pdf_bytes is None:
+            try:
+                with open(pdf_path, "rb") as f:
+                    pdf_bytes = f.read()
+            except OSError as e:
+                raise ExtractionError(str(e))
+        try:
+            document = PDFDocument(PDFParser(io.BytesIO(pdf_bytes)))
+            resources = PDFResourceManager(caching=True)
+            # Without layout analysis (laparams=None), the aggregator just collects
+            # the positioned characters, which is all the emulation needs.
+            device = PDFPageAggregator(resources, laparams=None)
+            interpreter = PDFPageInterpreter(resources, device)
+            for page in PDFPage.create_pages(document):
+                interpreter.process_page(page)
+                yield self.layout_page(device.get_result())
+        except (PDFSyntaxError, ValueError, TypeError, KeyError) as e:
+            raise ExtractionError(f"pdfminer could not read the pdf: {e}")
+
+    def layout_page(self, page) -> str:
+        """
+        Lay out the characters of one pdfminer LTPage as text.
+        """
+        chars = [
+            ch
+            for ch in _iter_chars(page)
+            if ch.get_text().strip() != "" and ch.width > 0
+        ]
+        if len(chars) == 0:
+            return PAGE_BREAK
+        char_width = statistics.median(ch.width for ch in chars)
+        char_height = statistics.median(ch.height for ch in chars)
+        # Like pdftotext, columns are counted from the leftmost text, not the page's edge.
+        left = min(ch.x0 for ch in chars)
+
+        # Group characters into lines, from the top of the page down.
+        chars.sort(key=lambda ch: -ch.y0)
+        lines = []
+        for ch in chars:
+            if lines and abs(lines[-1][0] - ch.y0) <= char_height / 2:
+                lines[-1][1].append(ch)
+            else:
+                lines.append((ch.y0, [ch]))
+
+        pitches = [above[0] - below[0] for above, below in zip(lines, lines[1:])]
+        line_pitch = min(pitches) if pitches else char_height
+        line_pitch = max(line_pitch, char_height)
+
+        out = []
+        previous_baseline = None
+        for baseline, line_chars in lines:
+            if previous_baseline is not None:
+                skipped = int(round((previous_baseline - baseline) / line_pitch)) - 1
+                out.extend([""] * max(0, skipped))
+            previous_baseline = baseline
+            out.append(self.layout_line(line_chars, char_width, left))
+        return "\n".join(out) + "\n" + PAGE_BREAK
+
+    def layout_line(self, chars, char_width: float, left: float = 0.0) -> str:
+        """
+        Lay out the characters of one line on a grid of fixed-width columns, counted from
+        `left`.
+        """
+        chars = sorted(chars, key=lambda ch: ch.x0)
+        text = ""
+        previous = None
+        for ch in chars:
+            column = int((ch.x0 - left) / char_width + 0.5)
+            if previous is None:
+                text = " " * column
+            else:
+                gap = (ch.x0 - previous.x1) / char_width
+                if gap >= self.COLUMN_GAP:
+                    text += " " * max(2, column - len(text))
+                elif gap >= self.WORD_GAP:
+                    text += " "
+            text += ch.get_text()
+            previous = ch
+        return text
+
+
+def _iter_chars(container):
+    """ Find every character in a pdfminer layout object, including inside figures. """
+    from pdfminer.layout import LTChar
+
+    for item in container:
+        if isinstance(item, LTChar):
+            yield item
+        elif hasattr(item, "__iter__"):
+            yield from _iter_chars(item)
+
+
+BACKENDS = {
+    PdfToTextBackend.name: PdfToTextBackend,
+    PdfMinerBackend.name: PdfMinerBackend,
+}
+
+
+def backend_from_environment() -> ExtractionBackend:
+    """
+    Create the backend named by the environment variable `PDF_TEXT_BACKEND`.
+    """
+    name = os.environ.get("PDF_TEXT_BACKEND", PdfToTextBackend.name)
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown PDF_TEXT_BACKEND {name}. Choose one of {', '.join(BACKENDS)}."
+        )
@@ -0,0 +1,254 @@
+"""
+Extract text from pdfs with a pool of long-lived workers.
+
+Spawning `pdftotext` through a shell, writing the pdf to a temporary directory, and
+reading the text back from another temporary file costs more than the extraction itself
+for the small documents the UJS Portal serves. The workers here hand the pdf to an
+extraction backend (see `RecordLib.sourcerecords.pdfbackends`) without any temporary files,
+and a bounded number of extractions run at once.
+
+The number of workers can be set with the environment variable `PDFTOTEXT_WORKERS`. It
+defaults to the number of cpus. The backend is picked with `PDF_TEXT_BACKEND`.
+
+Extracted texts are cached (see `RecordLib.sourcerecords.textcache`), so a pdf we have
+already seen is not converted again.
+
+Long documents can also be read a page at a time with `PdfTextExtractor.iter_pages`, which
+yields each page as soon as the backend produces it.
+"""
+from __future__ import annotations
+from typing import Union, BinaryIO, Iterable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+import os
+import threading
+import logging
+from RecordLib.sourcerecords.textcache import TextCache, cache_from_environment
+from RecordLib.sourcerecords.pdfbackends import (
+    ExtractionBackend,
+    ExtractionError,
+    PdfToTextBackend,
+    PAGE_BREAK,
+    backend_from_environment,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _default_worker_count() -> int:
+    try:
+        return max(1, int(os.environ.get("PDFTOTEXT_WORKERS", "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+class PdfTextExtractor:
+    """
+    A bounded pool of workers that turn pdfs into text.
+
+    Args:
+        max_workers: The most extractions that may run at once. Defaults to `PDFTOTEXT_WORKERS`
+            or the number of cpus.
+        command: A pdftotext command, without the input and output arguments. Shorthand for
+            `backend=PdfToTextBackend(command)`.
+        cache: Cache of texts that have already been extracted. If None, nothing is cached.
+        backend: The ExtractionBackend that does the work. Defaults to pdftotext.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        command: Optional[List[str]] = None,
+        cache: Optional[TextCache] = None,
+        backend: Optional[ExtractionBackend] = None,
+    ):
+        self.max_workers = max_workers or _default_worker_count()
+        self.backend = backend or PdfToTextBackend(command)
+        self.cache = cache
+        # Streaming pages happens in the caller's thread, so the workers and the streams
+        # share these slots to keep the number of running extractions bounded.
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pdftotext"
+        )
+
+    @property
+    def version(self) -> str:
+        """
+        Identifies the backend, so that changing backends or upgrading one doesn't serve
+        texts extracted the old way.
+        """
+        return self.backend.version
+
+    def _run(self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]) -> str:
+        """
+        Extract the text of one pdf, in a worker.
+        """
+        if self.cache is None:
+            return self._convert(pdf_path, pdf_bytes)
+        if pdf_bytes is None:
+            try:
+                with open(pdf_path, "rb") as f:
+                    pdf_bytes = f.read()
+            except OSError as e:
+                logger.error(f"Cannot extract pdf text.. {e}")
+                return ""
+        key = TextCache.key(pdf_bytes, self.version)
+        text = self.cache.get(key)
+        if text is None:
+            text = self._convert(None, pdf_bytes)
+            if text != "":
+                self.cache.put(key, text)
+        return text
+
+    def _convert(self, pdf_path: Optional[str], pdf_bytes: Optional[bytes]) -> str:
+        """
+        Have the backend extract the text once.
+        """
+        try:
+            with self._slots:
+                return self.backend.extract(pdf_path, pdf_bytes)
+        except ExtractionError as e:
+            logger.error(f"Cannot extract pdf text.. {e}")
+            return ""
+
+    def submit(self, pdf: Union[BinaryIO, str]) -> Future:
+        """
+        Queue a pdf for extraction.
+
+        File objects are read in the calling thread, so they don't need to be safe to share
+        across threads.
+
+        Returns:
+            A Future whose result is the text of the pdf.
+        """
+        if hasattr(pdf, "read"):
+            return self._executor.submit(self._run, None, pdf.read())
+        return self._executor.submit(self._run, os.fspath(pdf), None)
+
+    def extract(self, pdf: Union[BinaryIO, str]) -> str:
+        """
+        Extract the text of a single pdf.
+        """
+        return self.submit(pdf).result()
+
+    def extract_many(self, pdfs: Iterable[Union[BinaryIO, str]]) -> Iterator[str]:
+        """
+        Extract the text of many pdfs, keeping every worker busy.
+
+        Only a couple of pdfs per worker are queued at any time, so a long iterable of open
+        files doesn't all get read into memory at once.
+
+        Yields:
+            The texts of the pdfs, in the same order as `pdfs`.
+        """
+        in_flight = deque()
+        for pdf in pdfs:
+            in_flight.append(self.submit(pdf))
+            if len(in_flight) >= 2 * self.max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def iter_pages(self, pdf: Union[BinaryIO, str]) -> Iterator[str]:
+        """
+        Extract the text of a pdf one page at a time.
+
+        Pages are yielded as soon as the backend produces them, so only about one page of
+        text is held in memory at a time. A text that isn't cached yet is written to the
+        on-disk store as it streams past.
+
+        Yields:
+            The text of each page, ending with its form feed, as it would appear in the text
+            of the whole document.
+        """
+        if hasattr(pdf, "read"):
+            pdf_path, pdf_bytes = None, pdf.read()
+        else:
+            pdf_path, pdf_bytes = os.fspath(pdf), None
+
+        pending = None
+        if self.cache is not None:
+            if pdf_bytes is None:
+                try:
+                    with open(pdf_path, "rb") as f:
+                        pdf_bytes = f.read()
+                except OSError as e:
+                    logger.error(f"Cannot extract pdf text.. {e}")
+                    return
+                pdf_path = None
+            key = TextCache.key(pdf_bytes, self.version)
+            text = self.cache.get(key)
+            if text is not None:
+                yield from split_pages(text)
+                return
+            pending = self.cache.writer(key)
+
+        # Only cache the text if every page was extracted and read.
+        wrote_text = False
+        completed = False
+        pages = self.backend.iter_pages(pdf_path, pdf_bytes)
+        try:
+            while True:
+                # Only hold a slot while the backend works on the next page. Holding it
+                # while the caller has the page would let a paused or abandoned stream
+                # starve other extractions.
+                with self._slots:
+                    page = next(pages, None)
+                if page is None:
+                    break
+                if pending is not None:
+                    pending.write(page)
+                wrote_text = True
+                yield page
+            completed = True
+        except ExtractionError as e:
+            logger.error(f"Cannot extract pdf text.. {e}")
+        finally:
+            if hasattr(pages, "close"):
+                pages.close()
+            if pending is not None:
+                if completed and wrote_text:
+                    pending.commit()
+                else:
+                    pending.discard()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def split_pages(text: str) -> Iterator[str]:
+    """
+    Split the text of a whole document into pages, lazily.
+
+    Yields:
+        The text of each page, ending with its form feed.
+    """
+    start = 0
+    while True:
+        end = text.find(PAGE_BREAK, start)
+        if end == -1:
+            if text[start:].strip() != "":
+                yield text[start:]
+            return
+        yield text[start : end + 1]
+        start = end + 1
+
+
+_default_extractor = None
+_default_extractor_lock = threading.Lock()
+
+
+def default_extractor() -> PdfTextExtractor:
+    """
+    The process-wide extractor, created the first time it's needed.
+    """
+    global _default_extractor
+    if _default_extractor is None:
+        with _default_extractor_lock:
+            if _default_extractor is None:
+                _default_extractor = PdfTextExtractor(
+                    cache=cache_from_environment(), backend=backend_from_environment()
+                )
+    return _default_extractor
@@ -0,0 +1,117 @@
+"""
+Split the body of a summary into blocks of cases that can be parsed on their own.
+
+A long summary lists hundreds of cases, and parsing its body with the summary body grammar
+takes most of the time it takes to parse the summary. Each case parses the same way no matter
+what comes before or after it, so the body can be cut between two cases and the pieces parsed
+separately, in parallel, in a pool of processes (see `summary_parse_pool`). Parsing the
+blocks one after another also keeps the memory a parse takes to about what the largest block
+needs, instead of growing with the length of the summary.
+
+Only the first block starts with the status and county headings the grammar expects, so every
+other block gets a placeholder heading. Whoever merges the parsed blocks copies the status and
+county of the last case of a block to the cases of the next block that fall under its
+placeholder heading.
+
+The number of processes in the pool is set with the environment variable
+`SUMMARY_PARSE_WORKERS`. If it is not set, or is 1, summaries are parsed in one process.
+"""
+from __future__ import annotations
+from typing import List, Optional, Pattern
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Lines that start a case in the bodies of CP and MDJ summaries.
+CP_CASE_START = re.compile(r"^\s*\S+\s+Proc Status:")
+MDJ_CASE_START = re.compile(r"^ *\S+ +(?:Processing Status:.*?)?OTN(?:/LOTN)?:")
+
+# Headings for the blocks after the first, in place of the status and county the cases are
+# listed under.
+CP_CONTINUED_HEADING = "Continued\n  Continued\n"
+MDJ_CONTINUED_HEADING = "County: Continued\nContinued\n"
+
+# Blocks are cut after about this many lines.
+DEFAULT_BLOCK_LINES = 200
+
+
+def split_case_blocks(
+    text: str,
+    case_start: Pattern,
+    heading: str,
+    block_lines: int = DEFAULT_BLOCK_LINES,
+) -> List[str]:
+    """
+    Cut the body of a summary into blocks of whole cases.
+
+    A block ends once it has at least `block_lines` lines, just before the next line that
+    starts a case after a blank line. Cases right after a one-word line are never cut
+    off from it, since that line may be the name of the county the case belongs to.
+
+    Args:
+        text: The body of a summary, as returned by `cp_summary_body_text`, for example.
+        case_start: Matches the first line of a case.
+        heading: Put at the start of every block but the first.
+        block_lines: The fewest lines in a block, except the last one.
+
+    Returns:
+        The blocks. Without the headings, they add up to `text`.
+    """
+    blocks = []
+    block_start = 0
+    lines_in_block = 0
+    offset = 0
+    previous_blank = False
+    # The number of words in the last line that wasn't blank, before the current line.
+    last_words = 0
+    for line in text.split("\n"):
+        if (
+            lines_in_block >= block_lines
+            and previous_blank
+            and last_words > 1
+            and case_start.match(line)
+        ):
+            blocks.append(text[block_start:offset])
+            block_start = offset
+            lines_in_block = 0
+        words = len(line.split())
+        previous_blank = words == 0
+        if words:
+            last_words = words
+        lines_in_block += 1
+        offset += len(line) + 1
+    blocks.append(text[block_start:])
+    return blocks[:1] + [heading + block for block in blocks[1:]]
+
+
+def _default_worker_count() -> int:
+    try:
+        return max(1, int(os.environ.get("SUMMARY_PARSE_WORKERS", "")))
+    except ValueError:
+        return 1
+
+
+_summary_parse_pool = None
+_summary_parse_pool_lock = threading.Lock()
+
+
+def summary_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    The pool of processes that parse the blocks of long summaries, started the first time it's
+    needed, or None if summaries are parsed in one process.
+    """
+    global _summary_parse_pool
+    if _summary_parse_pool is None:
+        workers = _default_worker_count()
+        if workers <= 1:
+            return None
+        with _summary_parse_pool_lock:
+            if _summary_parse_pool is None:
+                logger.info(f"Starting {workers} processes to parse summaries.")
+                _summary_parse_pool = ProcessPoolExecutor(max_workers=workers)
+    return _summary_parse_pool
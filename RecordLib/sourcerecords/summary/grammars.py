@@ -1,4 +1,4 @@
-from parsimonious.grammar import Grammar  # type: ignore
+from RecordLib.sourcerecords.grammarregistry import get_grammar
 
 useful_terminals = r"""
     # nonterminals, but quiet ones that shouldn't create xml <tags>
@@ -83,7 +83,7 @@ shared_summary_page_grammar_nonterminals = r"""
     """
 
 
-md_summary_page_grammar = Grammar(
+md_summary_page_grammar = get_grammar(
     r"""
     # Grammar for parsing CP summary pages, to separate
     # header, body, and footer for each page.
@@ -125,7 +125,7 @@ md_summary_page_grammar = Grammar(
 )
 
 
-cp_summary_page_grammar = Grammar(
+cp_summary_page_grammar = get_grammar(
     r"""
     # Grammar for parsing CP summary pages, to separate
     # header, body, and footer for each page.
@@ -260,7 +260,7 @@ md_summary_body_nonterminals = [
     "archived_case",
 ]
 
-md_summary_body_grammar = Grammar(
+md_summary_body_grammar = get_grammar(
     r"""
     summary_body = case_category+ empty_line*
     case_category = ws* court_or_county new_line
@@ -365,7 +365,7 @@ md_summary_body_grammar = Grammar(
     """ + useful_terminals
 )
 
-cp_summary_body_grammar = Grammar(
+cp_summary_body_grammar = get_grammar(
     r"""
     summary_body = case_category+ empty_line*
     case_category = ws* case_status ws* new_line cases_in_county+ archives?
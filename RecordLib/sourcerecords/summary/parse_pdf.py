@@ -4,22 +4,45 @@ Parsing a Summary from a PDF.
 The most important thing is that this module provides a method, `parse_pdf`.
 This method returns a Summary object.
 
+`parse_pdf_pages` does the same for the text of a summary that arrives one page at a time.
+
+The bodies of long summaries can be parsed a block of cases at a time, in a pool of processes.
+See `RecordLib.sourcerecords.summary.caseblocks`.
+
+The grammars' parse trees are turned into trees of ParseNodes, which the functions that find
+the defendant and cases read. Pass `as_xml=True` to build lxml trees instead, through the xml
+strings the visitors used to write, which is handy for debugging.
+
+CP summaries are first read with regular expressions, which is much faster than parsing them
+with the grammars (see `RecordLib.sourcerecords.summary.re_parse_cp_pdf`). The grammars only
+parse a CP summary if it isn't laid out the way the regex parser expects.
 """
-import re
 import logging
-from typing import Dict, Tuple, List, Union, BinaryIO
+import itertools
+from typing import Dict, Tuple, List, Optional, Union, BinaryIO, Iterable
+from concurrent.futures import Executor
 from lxml import etree
-from parsimonious.nodes import Node  # type: ignore
+from parsimonious.grammar import Grammar  # type: ignore
 from RecordLib.crecord import Case
 from RecordLib.crecord import Charge, Sentence, SentenceLength
 from RecordLib.crecord import Person
 from RecordLib.sourcerecords.customnodevisitorfactory import CustomVisitorFactory
-from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.parsenode import ParseNode
+from RecordLib.sourcerecords.parsingutilities import iter_pages_from_pdf
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.sourcerecords.dispatch import detect, COURTS
 from RecordLib.sourcerecords.summary.utilities import *
-from RecordLib.sourcerecords.overflow import (
-    MDJFirstCoupleLinesOverflow,
-    MDJOverflowInChargeList,
+from RecordLib.sourcerecords.overflow import cp_summary_overflow, mdj_summary_overflow
+from .caseblocks import (
+    CP_CASE_START,
+    CP_CONTINUED_HEADING,
+    MDJ_CASE_START,
+    MDJ_CONTINUED_HEADING,
+    DEFAULT_BLOCK_LINES,
+    split_case_blocks,
+    summary_parse_pool,
 )
+from .re_parse_cp_pdf import SummaryLayoutError, parse_cp_summary_pages
 from .grammars import (
     summary_page_terminals,
     summary_page_nonterminals,
@@ -37,262 +60,181 @@ def get_processors(text: str) -> Dict:
     """
     Get the functions for processing this text. It will be a set of processers either for MDJ court
     summaries or CP Court summaries.
+
+    The court is identified from the header of the summary's first page.
     """
-    try:
-        text.index("Magisterial", 0, 100)
+    registration = detect(text, record_type=SourceRecord.RECORD_TYPES.SUMMARY)
+    if registration is not None and registration.court == COURTS.MDJ:
         return md_processors
-    except ValueError:
-        return cp_processors
+    return cp_processors
 
 
-def parse_md_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
-    """ handle parsing the rest of an md summary pdf
+def parse_summary_pages(
+    pages: Iterable[str], summary_page_grammar: Grammar, as_xml: bool = False
+) -> Union[ParseNode, etree.Element]:
+    """
+    Separate the header, caption, body and footer of each page of a summary.
 
-    (After parse_pdf has separated pages)
+    Pages are parsed one at a time, so only one page's parse tree exists at once.
 
-    TODO - it might make sense later to recombine these cp/md functions to make
-    code more DRY, but for now i don't know how different they will need to be from each other."""
+    Args:
+        pages: The text of each page of the summary, ending with its page break.
+        summary_page_grammar: The md or cp summary page grammar.
+        as_xml: Build an lxml tree instead of ParseNodes.
+
+    Returns:
+        A tree along the lines of
+        <summary> <first_page> ... </first_page> <following_page> ... </following_page> </summary>
+    """
     summary_page_visitor = CustomVisitorFactory(
-        summary_page_terminals, summary_page_nonterminals, dict()
+        summary_page_terminals, summary_page_nonterminals, dict(), as_xml=as_xml
     ).create_instance()
     xml_parser = etree.XMLParser(encoding="UTF-8", recover=True)
-    pages_xml_tree = etree.fromstring(
-        summary_page_visitor.visit(parsed_pages), xml_parser
-    )
-
-    # combine the body sections from each page and parse the combined body
-    summary_info_sections = pages_xml_tree.findall(".//summary_info")
-
-    # Combine the text of the sections into one string
-    # When there's a page break over sections, then an empty line gets
-    # inserted, and I'd like to get rid of it, to help the grammars.
-    logging.info(f"Page count: {len(summary_info_sections)}")
-    for i, section in enumerate(summary_info_sections):
-        if section.text[-2] == "\n" and section.text[-1] == " ":
-            if i < (len(summary_info_sections) - 1):
-                if "(Continued)" in summary_info_sections[i + 1].text[0:50]:
-                    section.text = section.text[:-2]
-
-    # Then split into lines, so we can remove lines that say (Continued) and other overflow lines.
-    slines = []
-    previous_sec_lines = []
-    for i, sec in enumerate(summary_info_sections):
-        sec_lines = sec.text.split("\n")
-        lines_to_remove = 0
-        previous_lines_to_remove = 0
-        if i > 0:
-            # on pages after the first, remove lines that are duplicated.
-            # if the previous line was empty and
-            # prev line-1 was one of the first case lines
-            # then remove the empty line and the first line of the next section,
-            # because its a repeated case status.
-            case_line_starts = ["^MJ-", "^Arr", "^Las", "^Nex", "^Bail"]
-            preceeding_blanks = 0
-            for ln in reversed(previous_sec_lines):
-                if ln.strip() != "":
-                    prev_nonblank_line = ln
-                    break
-                preceeding_blanks += 1
-
-            prev_line = previous_sec_lines[-1].strip()
-            prev_line2 = previous_sec_lines[-2].strip()
-            if any([re.match(start, prev_line) for start in case_line_starts]):
-                lines_to_remove += 2
-            elif (prev_line == "") and any(
-                [re.match(start, prev_line2) for start in case_line_starts]
-            ):
-                lines_to_remove += 2
-                previous_lines_to_remove += 1
-            elif re.search("§", prev_nonblank_line) and any(
-                [re.search("Program Type", ln) for ln in sec_lines[2:6]]
-            ):
-                # Catch when page overflows from the end of the list of charges to
-                # the list of sentences.
-                lines_to_remove += 2
-                previous_lines_to_remove = preceeding_blanks
-            elif re.search("Statute", prev_nonblank_line):
-                # Catch when page overlows just after the header of the charges section.
-                lines_to_remove += 3
-                previous_lines_to_remove = preceeding_blanks
-            elif len(sec_lines) <= 4:
-                # Catch the overflow case when the only overflow lines are repeated lines. I think if there are fewer than 4 lines on the page, then they're not important.
-                lines_to_remove = len(sec_lines)
-            elif MDJFirstCoupleLinesOverflow.condition(previous_sec_lines, sec_lines):
-                (
-                    previous_sec_lines_filtered,
-                    sec_lines,
-                ) = MDJFirstCoupleLinesOverflow.remove_overflow(
-                    previous_sec_lines, sec_lines
-                )
-                # this len() - len() operation only needed while the conditions above
-                # don't use OverflowFilters. OverflowFilters directly return the
-                # lines of the next and previous sectinos.
-                previous_lines_to_remove = len(previous_sec_lines) - len(
-                    previous_sec_lines_filtered
-                )
-            elif MDJOverflowInChargeList.condition(previous_sec_lines, sec_lines):
-                _, sec_lines = MDJOverflowInChargeList.remove_overflow(
-                    slines, sec_lines
-                )
-
-            sec_lines = sec_lines[lines_to_remove:]
-            if previous_lines_to_remove > 0:
-                slines = slines[:-previous_lines_to_remove]
-        slines = slines + sec_lines
-        previous_sec_lines = sec_lines
+    pages_xml_tree = etree.Element("summary") if as_xml else ParseNode("summary")
+    for i, page in enumerate(pages):
+        page_rule = summary_page_grammar["first_page" if i == 0 else "following_page"]
+        pages_xml_tree.append(
+            summary_page_visitor.tree(page_rule.parse(page), xml_parser)
+        )
+    return pages_xml_tree
 
-    # And recombine into one string.
-    summary_info_combined = "\n".join(slines)
 
-    # Remove.
+def parse_summary_body(
+    text: str, processors: Dict, as_xml: bool = False
+) -> Union[ParseNode, etree.Element]:
+    """
+    Parse the combined body of a summary (see `cp_summary_body_text`) with the court's
+    summary body grammar.
+    """
+    parsed_summary_body = processors["summary_body_grammar"].parse(text)
     summary_info_visitor = CustomVisitorFactory(
         summary_body_terminals,
-        md_summary_body_nonterminals,
+        processors["summary_body_nonterminals"],
         [("sentence_length", visit_sentence_length)],
+        as_xml=as_xml,
     ).create_instance()
+    return summary_info_visitor.tree(parsed_summary_body)
 
-    try:
-        parsed_summary_body = md_summary_body_grammar.parse(summary_info_combined)
-    except Exception as e:
-        raise e
 
-    summary_info_visitor = CustomVisitorFactory(
-        summary_body_terminals,
-        md_summary_body_nonterminals,
-        [("sentence_length", visit_sentence_length)],
-    ).create_instance()
+def _parse_case_block(court: str, text: str) -> Tuple[List[Case], int, int]:
+    """
+    Parse the cases in a block of the body of a summary (see `split_case_blocks`). This runs in
+    a worker process.
 
-    summary_body_xml_tree = etree.fromstring(
-        summary_info_visitor.visit(parsed_summary_body)
+    Returns:
+        The cases, and how many of them, from the start, are listed under the status and under
+        the county of the block's first heading.
+    """
+    processors = md_processors if court == COURTS.MDJ else cp_processors
+    summary_body = parse_summary_body(text, processors)
+    cases = processors["get_cases"](summary_body)
+    first_case = summary_body.find(".//case")
+    if first_case is None:
+        return cases, 0, 0
+    # get_cases reads the county from the parent of a case, and the status from its grandparent.
+    county_group = first_case.getparent()
+    return (
+        cases,
+        len(county_group.getparent().findall(".//case")),
+        len(county_group.findall("case")),
     )
-    return pages_xml_tree, summary_body_xml_tree
 
 
-def parse_cp_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
-    """ handle parsing the rest of a cp summary pdf
+def parse_cases_in_blocks(
+    text: str,
+    processors: Dict,
+    pool: Optional[Executor] = None,
+    block_lines: int = DEFAULT_BLOCK_LINES,
+) -> List[Case]:
+    """
+    Parse the cases in the body of a summary a block at a time. The cases are the same, and in
+    the same order, as if the body were parsed whole.
+
+    parsimonious remembers every node it tries while parsing a text, so parsing a long body
+    whole takes a lot of memory. Each block is parsed on its own, and its parse tree is thrown
+    away once its cases are read, so without a pool, only one block's tree is in memory at a
+    time.
+
+    Args:
+        text: The body of the summary, as returned by `processors["summary_body_text"]`.
+        processors: `cp_processors` or `md_processors`.
+        pool: Parses the blocks in parallel. A ProcessPoolExecutor, such as
+            `summary_parse_pool()`. If None, the blocks are parsed one after another, in this
+            process.
+        block_lines: About how many lines to put in each block.
+    """
+    blocks = split_case_blocks(
+        text, processors["case_start"], processors["continued_heading"], block_lines
+    )
+    cases = []
+    for block_cases, under_status, under_county in (map if pool is None else pool.map)(
+        _parse_case_block, itertools.repeat(processors["court"]), blocks
+    ):
+        # The first cases of every block but the first are listed under a placeholder heading.
+        # They really belong with the last case of the block before.
+        if cases:
+            last_case = cases[-1]
+            for case in block_cases[:under_status]:
+                case.status = last_case.status
+            for case in block_cases[:under_county]:
+                case.county = last_case.county
+        cases.extend(block_cases)
+    return cases
 
-    (After parse_pdf has separated pages) """
-    summary_page_visitor = CustomVisitorFactory(
-        summary_page_terminals, summary_page_nonterminals, dict()
-    ).create_instance()
 
-    # the summary is now a string of xml along the lines of:
-    # <summary> <first_page> ... </first_page>
-    # <following_page> ... </following_page> </summary>\
-    xml_parser = etree.XMLParser(encoding="UTF-8", recover=True)
-    pages_xml_tree = etree.fromstring(
-        summary_page_visitor.visit(parsed_pages), xml_parser
+def parse_md_summary(pages_xml_tree: etree.Element, as_xml: bool = False) -> Tuple[etree.Element, etree.Element]:
+    """ handle parsing the rest of an md summary pdf
+
+    (After parse_summary_pages has separated pages)
+
+    TODO - it might make sense later to recombine these cp/md functions to make
+    code more DRY, but for now i don't know how different they will need to be from each other."""
+    summary_body_xml_tree = parse_summary_body(
+        md_summary_body_text(pages_xml_tree), md_processors, as_xml=as_xml
     )
+    return pages_xml_tree, summary_body_xml_tree
 
-    # combine the body sections from each page and parse the combined body
-    summary_info_sections = pages_xml_tree.findall(".//summary_info")
 
-    # Combine the text of the sections into one string
-    # When there's a page break over sections, then an empty line gets
-    # inserted, and I'd like to get rid of it, to help the grammars.
+def summary_info_lines(pages_xml_tree: etree.Element) -> List[List[str]]:
+    """
+    The lines of the body section of each page of a summary.
+    """
+    summary_info_sections = pages_xml_tree.findall(".//summary_info")
     logging.info(f"Page count: {len(summary_info_sections)}")
-    for i, section in enumerate(summary_info_sections):
-        if section.text[-2] == "\n" and section.text[-1] == " ":
-            if i < (len(summary_info_sections) - 1):
-                if "(Continued)" in summary_info_sections[i + 1].text[0:50]:
-                    section.text = section.text[:-2]
-
-    def find_in_lines(lines, cp_id):
-        for line in lines:
-            if cp_id in line:
-                return True
-
-        return False
-
-    # Then split into lines, so we can remove lines that say (Continued) and other overflow lines.
-    slines = []
-    previous_sec_lines = []
-    for i, sec in enumerate(summary_info_sections):
-        sec_lines = sec.text.split("\n")
-        line_count = len(sec_lines)
-        lines_to_remove = 0
-        if line_count > 0 and "(Continued)" in sec_lines[0]:
-            lines_to_remove += 1
-            if line_count > 1 and "(Continued)" in sec_lines[1]:
-                lines_to_remove += 1
-                if line_count > 2:
-                    line = sec_lines[2]
-                    pattern = r"(CP\S+)\s"
-                    match = re.search(pattern, line)
-                    if match:
-                        cp_id = match.group(1)
-                        # print(cp_id)
-                        if find_in_lines(previous_sec_lines, cp_id):
-                            lines_to_remove += 1
-                            if line_count > 3 and "Arrest Dt" in sec_lines[3]:
-                                lines_to_remove += 1
-                                if line_count > 4 and "Def Atty" in sec_lines[4]:
-                                    lines_to_remove += 1
-                                    if line_count > 5 and "Seq No" in sec_lines[5]:
-                                        lines_to_remove += 1
-                                        if (
-                                            line_count > 6
-                                            and "Sentence" in sec_lines[6]
-                                        ):
-                                            lines_to_remove += 1
-                            elif line_count > 3 and "Seq No" in sec_lines[3]:
-                                p_line = previous_sec_lines[-1]
-                                test = (
-                                    "Def" in p_line
-                                    or "Arrest" in p_line
-                                    or "Next" in p_line
-                                    or "Disp " in p_line
-                                )
-                                if not test:
-                                    lines_to_remove += 1
-                                    if (
-                                        "Sentence" in sec_lines[4]
-                                        and "Seq No" not in p_line
-                                    ):
-                                        lines_to_remove += 1
-                    elif "Seq No" in line:
-                        p_line = previous_sec_lines[-1]
-                        test = (
-                            "Def" in p_line
-                            or "Arrest" in p_line
-                            or "Next" in p_line
-                            or "Disp " in p_line
-                        )
-                        if not test:
-                            lines_to_remove += 1
-                            if "Sentence" in sec_lines[3] and "Seq No" not in p_line:
-                                lines_to_remove += 1
-
-        for ln in sec_lines[lines_to_remove:]:
-            slines.append(ln)
-
-        previous_sec_lines = sec_lines
-
-    # And recombine into one string.
-    summary_info_combined = "\n".join(slines)
+    return section_lines(section.text for section in summary_info_sections)
 
-    try:
-        parsed_summary_body = cp_summary_body_grammar.parse(summary_info_combined)
-    except Exception as e:
-        raise e
 
-    summary_info_visitor = CustomVisitorFactory(
-        summary_body_terminals,
-        cp_summary_body_nonterminals,
-        [("sentence_length", visit_sentence_length)],
-    ).create_instance()
+def md_summary_body_text(pages_xml_tree: etree.Element) -> str:
+    """
+    Combine the body sections of each page of an md summary into one text, without the lines
+    that overflow from one page to the next.
+    """
+    return "\n".join(mdj_summary_overflow.stitch(summary_info_lines(pages_xml_tree)))
 
-    summary_body_xml_tree = etree.fromstring(
-        summary_info_visitor.visit(parsed_summary_body)
+
+def parse_cp_summary(pages_xml_tree: etree.Element, as_xml: bool = False) -> Tuple[etree.Element, etree.Element]:
+    """ handle parsing the rest of a cp summary pdf
+
+    (After parse_summary_pages has separated pages) """
+    summary_body_xml_tree = parse_summary_body(
+        cp_summary_body_text(pages_xml_tree), cp_processors, as_xml=as_xml
     )
     return pages_xml_tree, summary_body_xml_tree
 
 
+def cp_summary_body_text(pages_xml_tree: etree.Element) -> str:
+    """
+    Combine the body sections of each page of a cp summary into one text, without the lines
+    that overflow from one page to the next.
+    """
+    return "\n".join(cp_summary_overflow.stitch(summary_info_lines(pages_xml_tree)))
+
+
 def get_defendant(summary_xml: etree.Element) -> Person:
     full_name = summary_xml.find("caption/defendant_name").text
     last_first = [n.strip() for n in full_name.split(",")]
     def_dob = summary_xml.find("caption/def_dob").text.strip()
-    aliases = [el.text.strip() for el in summary_xml.xpath("//alias")]
+    aliases = [el.text.strip() for el in summary_xml.findall(".//alias")]
     try:
         def_dob = datetime.strptime(def_dob, "%m/%d/%Y").date()
     except ValueError:
@@ -311,9 +253,9 @@ def get_cp_cases(summary_xml: etree.Element) -> List:
     Return a list of the cases described in this Summary sheet.
     """
     cases = []
-    case_elements = summary_xml.xpath("//case")
+    case_elements = summary_xml.findall(".//case")
     for case in case_elements:
-        closed_sequences = case.xpath(".//closed_sequence")
+        closed_sequences = case.findall(".//closed_sequence")
         closed_charges = []
         for seq in closed_sequences:
             charge = Charge(
@@ -323,8 +265,9 @@ def get_cp_cases(summary_xml: etree.Element) -> List:
                 disposition=text_or_blank(seq.find("sequence_disposition")),
                 disposition_date=None,
                 sentences=[],
+                sequence=int_or_none(seq.find("sequence_num")),
             )
-            for sentence in seq.xpath(".//sentencing_info"):
+            for sentence in seq.findall(".//sentencing_info"):
                 charge.sentences.append(
                     Sentence(
                         sentence_date=date_or_none(sentence.find("sentence_date")),
@@ -352,7 +295,7 @@ def get_cp_cases(summary_xml: etree.Element) -> List:
                 )
             closed_charges.append(charge)
 
-        open_sequences = case.xpath(".//open_sequence")
+        open_sequences = case.findall(".//open_sequence")
         open_charges = []
         for seq in open_sequences:
             charge = Charge(
@@ -362,8 +305,9 @@ def get_cp_cases(summary_xml: etree.Element) -> List:
                 disposition=text_or_blank(seq.find("sequence_disposition")),
                 disposition_date=None,
                 sentences=[],
+                sequence=int_or_none(seq.find("sequence_num")),
             )
-            for sentence in seq.xpath(".//sentencing_info"):
+            for sentence in seq.findall(".//sentencing_info"):
                 charge.sentences.append(
                     Sentence(
                         sentence_date=date_or_none(sentence.find("sentence_date")),
@@ -396,7 +340,7 @@ def get_cp_cases(summary_xml: etree.Element) -> List:
             docket_number=text_or_blank(case.find("case_basics/docket_num")),
             otn=text_or_blank(case.find("case_basics/otn_num")),
             dc=text_or_blank(case.find("case_basics/dc_num")),
-            charges=closed_charges + open_charges,
+            charges=Charge.reduce_merge(closed_charges + open_charges),
             total_fines=None,  # a summary docket never has info about this.
             fines_paid=None,
             arrest_date=date_or_none(
@@ -427,12 +371,12 @@ def get_md_cases(summary_xml: etree.Element) -> List:
     Return a list of the cases described in this Summary sheet.
     """
     cases = []
-    case_elements = summary_xml.xpath("//case")
+    case_elements = summary_xml.findall(".//case")
     for case in case_elements:
         # in mdj summaries, there's only one "charge" element, not different "open" and "closed" elements.
         # And there are no sentences recorded.
         md_charges = []
-        md_charge_elems = case.xpath(".//charge")
+        md_charge_elems = case.findall(".//charge")
         for charge in md_charge_elems:
             charge = Charge(
                 offense=text_or_blank(charge.find("description")),
@@ -468,42 +412,121 @@ def get_md_cases(summary_xml: etree.Element) -> List:
 
 
 cp_processors = {
+    "court": COURTS.CP,
+    "parse_pages": parse_cp_summary_pages,
     "parse_summary": parse_cp_summary,
     "summary_page_grammar": cp_summary_page_grammar,
+    "summary_body_text": cp_summary_body_text,
+    "summary_body_grammar": cp_summary_body_grammar,
+    "summary_body_nonterminals": cp_summary_body_nonterminals,
+    "case_start": CP_CASE_START,
+    "continued_heading": CP_CONTINUED_HEADING,
     "get_cases": get_cp_cases,
 }
 
 
 md_processors = {
+    "court": COURTS.MDJ,
+    "parse_pages": None,
     "parse_summary": parse_md_summary,
     "summary_page_grammar": md_summary_page_grammar,
+    "summary_body_text": md_summary_body_text,
+    "summary_body_grammar": md_summary_body_grammar,
+    "summary_body_nonterminals": md_summary_body_nonterminals,
+    "case_start": MDJ_CASE_START,
+    "continued_heading": MDJ_CONTINUED_HEADING,
     "get_cases": get_md_cases,
 }
 
 
-def parse_pdf(pdf: Union[BinaryIO, str]) -> Tuple[Person, List[Case], List[str]]:
+def parse_pdf(
+    pdf: Union[BinaryIO, str], as_xml: bool = False
+) -> Tuple[Person, List[Case], List[str]]:
     """
     PEGParser-based parser method that can take a CP or MD source and return a Summary
     used to build a CRecord.
     """
-    text = get_text_from_pdf(pdf)
-    inputs_dictionary = get_processors(text)
+    return parse_pdf_pages(iter_pages_from_pdf(pdf), as_xml=as_xml)
+
+
+def _remember(pages: Iterable[str], seen: List[str]) -> Iterable[str]:
+    """ Yield the pages, and keep them in `seen`. """
+    for page in pages:
+        seen.append(page)
+        yield page
+
+
+def parse_pdf_pages(
+    pages: Iterable[str],
+    as_xml: bool = False,
+    pool: Optional[Executor] = None,
+    grammars_only: bool = False,
+) -> Tuple[Person, List[Case], List[str]]:
+    """
+    Parse a CP or MD summary from the text of its pages, as they arrive.
+
+    Args:
+        pages: The text of each page, ending with its page break, such as the pages yielded
+            by `iter_pages_from_pdf`.
+        as_xml: Parse the summary into lxml trees instead of ParseNodes, for debugging.
+        pool: Parses the blocks of cases of long summaries in parallel (see
+            `parse_cases_in_blocks`). Defaults to `summary_parse_pool()`. Without a pool, the
+            blocks are parsed one at a time. Summaries are parsed whole if `as_xml` is set.
+        grammars_only: Parse the summary with the grammars, without trying the regex parser
+            first. The grammars are always used if `as_xml` is set.
+
+    The pages are read one at a time, but a CP summary's pages are all kept until the regex
+    parser is done with them, so that the grammars can parse them if the regex parser can't.
+    """
+    pages = iter(pages)
+    first_page = next(pages, None)
+    if first_page is None:
+        return None, None, ["could not extract text from pdf"]
+    inputs_dictionary = get_processors(first_page)
+    parse_pages = inputs_dictionary["parse_pages"]
+    if parse_pages is not None and not (as_xml or grammars_only):
+        seen = []
+        try:
+            return parse_pages(_remember(itertools.chain([first_page], pages), seen))
+        except SummaryLayoutError as e:
+            logging.info(f"Parsing summary with the grammars: {e}")
+        except Exception as e:
+            logging.warning(
+                f"The regex parser failed, so parsing summary with the grammars: {e!r}"
+            )
+        first_page = seen[0]
+        pages = itertools.chain(seen[1:], pages)
     summary_page_grammar = inputs_dictionary["summary_page_grammar"]
     errors = []
     try:
-        parsed_pages = summary_page_grammar.parse(text)
+        pages_xml_tree = parse_summary_pages(
+            itertools.chain([first_page], pages), summary_page_grammar, as_xml=as_xml
+        )
     except Exception as e:
-        # slines = text.split("\n")
         errors.append(f"Grammar cannot parse summary: {str(e)}")
+        return None, None, errors
 
-    parse_summary = inputs_dictionary["parse_summary"]
-    pages_xml_tree, summary_body_xml_tree = parse_summary(parsed_pages)
-
-    summary_xml = etree.Element("Summary")
-    summary_xml.append(pages_xml_tree.xpath("//header")[0])
-    summary_xml.append(pages_xml_tree.xpath("//caption")[0])
-    summary_xml.append(summary_body_xml_tree)
+    summary_body_text = inputs_dictionary["summary_body_text"](pages_xml_tree)
+    summary_xml = etree.Element("Summary") if as_xml else ParseNode("Summary")
+    summary_xml.append(pages_xml_tree.findall(".//header")[0])
+    summary_xml.append(pages_xml_tree.findall(".//caption")[0])
     defendant = get_defendant(summary_xml)
+
+    if not as_xml and summary_body_text.count("\n") >= 2 * DEFAULT_BLOCK_LINES:
+        if pool is None:
+            pool = summary_parse_pool()
+        try:
+            return (
+                defendant,
+                parse_cases_in_blocks(summary_body_text, inputs_dictionary, pool),
+                errors,
+            )
+        except Exception as e:
+            logging.warning(f"Could not parse summary in blocks, so parsing it whole: {e}")
+
+    summary_xml.append(
+        parse_summary_body(summary_body_text, inputs_dictionary, as_xml=as_xml)
+    )
     get_cases = inputs_dictionary["get_cases"]
     cases = get_cases(summary_xml)
     return defendant, cases, errors
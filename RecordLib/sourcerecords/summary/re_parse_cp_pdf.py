@@ -0,0 +1,497 @@
+"""
+Regex parsing functions for Common Pleas court summaries.
+
+The summary grammars parse a summary a character at a time, and parsimonious remembers every
+node it tries along the way, so they are slow on long summaries. `parse_cp_summary_pages`
+reads a CP summary a line at a time with regular expressions instead, and finds the same
+defendant and cases the grammars do.
+
+Each line has to be the kind of line the grammars would accept at that point of the summary.
+The patterns below follow the rules of `cp_summary_page_grammar` and `cp_summary_body_grammar`,
+including where the grammars never give back what they have matched. When a line is not what
+the grammars expect, the parser gives up with a `SummaryLayoutError`, and `parse_pdf_pages`
+parses the summary with the grammars instead.
+"""
+from __future__ import annotations
+from typing import Iterable, List, Optional, Pattern, Tuple
+from datetime import date, datetime
+import itertools
+import re
+from RecordLib.crecord import Case, Charge, Person, Sentence, SentenceLength
+from RecordLib.sourcerecords.overflow import cp_summary_overflow
+from RecordLib.sourcerecords.summary.utilities import (
+    section_lines,
+    sentence_length_terms,
+)
+
+
+class SummaryLayoutError(ValueError):
+    """
+    A summary is not laid out the way the regex parser expects.
+    """
+
+
+# The grammars only accept these characters (see `single_content_char`), so once a page has
+# been checked for anything else, "[^ ]" matches the same characters as `content_char_no_ws`.
+_unexpected_character = re.compile(
+    r"[^\n\\“”a-z0-9`\ \"=_\.,\-\(\)'\$\?\*%;:#&\[\]/@§\+<>!]", re.I
+)
+
+_atomic_names = itertools.count()
+
+
+def _atomic(pattern: str, name: Optional[str] = None) -> str:
+    """
+    Match `pattern` the way a parsimonious expression does: once it has matched, the rest of
+    the regex can't backtrack into it.
+    """
+    if name is None:
+        name = f"_atomic{next(_atomic_names)}"
+    return f"(?=(?P<{name}>{pattern}))(?P={name})"
+
+
+_WORD = r"[^ ]+"
+_DATE = r"[0-9]+/[0-9]+/[0-9]+"
+
+
+def _words() -> str:
+    """ The `words` rule: words separated by single spaces. """
+    return _atomic(rf"{_WORD}(?: {_WORD})*")
+
+
+def _optional_space() -> str:
+    """ The `ws?` rule. """
+    return _atomic(" ?")
+
+
+# The pages of a summary.
+_court_name_line = re.compile(r"^ *[^ ]")
+_court_summary_line = re.compile(r"^ *Court Summary *$")
+_continuation_line = re.compile(r"^.* \(Continued\)$")
+_footer_line = re.compile(r"^ *CPCMS.")
+_blank_line = re.compile(r"^ *$")
+
+# The caption on the first page.
+_name_line = re.compile(
+    rf"^(?P<name>{_words()}) +DOB: *(?P<dob>{_DATE})? *Sex: *(?:{_words()})? *$"
+)
+_address_line = re.compile(
+    rf"^{_atomic(' *')}(?:{_words()})? +Eyes: *(?:{_words()})? *$"
+)
+_hair_line = re.compile(rf"^Aliases: +Hair: *(?:{_words()})? *$")
+_race_line = re.compile(
+    rf"^{_atomic(rf'(?: ?(?P<alias>{_WORD}(?: {_WORD})*))?')} +Race: *(?:{_words()})? *$"
+)
+_alias_line = re.compile(rf"^ ?(?P<alias>{_WORD}(?: {_WORD})*)$")
+
+# Lines of the body, in the order they appear in a case.
+_heading_line = re.compile(rf"^ *(?P<heading>{_words()}) *$")
+_CASE_BASICS = (
+    rf"(?P<docket_number>[^ ]+) +Proc Status: (?:{_words()})?"
+    r" +DC No: (?P<dc>[^ ]*) +OTN: *(?P<otn>[^ ]*)$"
+)
+_case_line = re.compile(rf"^ *{_CASE_BASICS}")
+# The first line of a case, repeated after a page break.
+_repeated_case_line = re.compile(rf"^{_CASE_BASICS}")
+_arrest_disp_line = re.compile(
+    rf"^ *Arrest Dt:{_optional_space()}(?P<arrest_date>{_DATE})?"
+    rf" +Disp Date:{_optional_space()}(?P<disp_date>{_DATE})?"
+    rf" +Disp Judge:{_optional_space()}(?P<judge>{_words()})?(?: +{_words()})?$"
+)
+_arrest_trial_line = re.compile(
+    rf"^ *Arrest Dt:{_optional_space()}(?P<arrest_date>{_DATE})?"
+    rf" +Trial Dt:{_optional_space()}(?:{_DATE})?"
+    rf" +Legacy No: *(?:{_words()})?$"
+)
+_legacy_num_cont_line = re.compile(r"^ +[^ ]+$")
+_def_atty_line = re.compile(r"^ *Def Atty: +[^ ].*$")
+_last_actions_line = re.compile(
+    rf"^ +Last Action:{_optional_space()}(?:{_words()})?"
+    rf" +Last Action Date:{_optional_space()}(?:{_DATE})?"
+    rf" +Last Action Room:{_optional_space()}(?:{_words()})?$"
+)
+_next_actions_line = re.compile(
+    rf"^ +Next Action:{_optional_space()}(?:{_words()})?"
+    rf" +Next Action Date:{_optional_space()}(?:{_DATE})?"
+    rf" +Next Action Room:{_optional_space()}(?:{_words()})?$"
+)
+_disp_date_and_judge_line = re.compile(
+    rf"^ +Disp Date:{_optional_space()}(?:{_DATE})?"
+    rf" +Disp Judge:{_optional_space()}(?:{_words()})?$"
+)
+_prob_psi_line = re.compile(r"^ +Prob #: +[^ ]+ +PSI#: *$")
+
+# The lines that may follow the first line of a case, each at most once, in this order.
+# The first line of the case may be repeated between them.
+_arrest_disp_actions = [
+    ("arrest_disp", _arrest_disp_line),
+    ("case_basics", _repeated_case_line),
+    ("arrest_trial", _arrest_trial_line),
+    ("legacy_num_cont", _legacy_num_cont_line),
+    ("case_basics", _repeated_case_line),
+    ("def_atty", _def_atty_line),
+    ("case_basics", _repeated_case_line),
+    ("last_actions", _last_actions_line),
+    ("case_basics", _repeated_case_line),
+    ("next_actions", _next_actions_line),
+    ("case_basics", _repeated_case_line),
+    ("disp_date_and_judge", _disp_date_and_judge_line),
+    ("case_basics", _repeated_case_line),
+    ("prob_psi", _prob_psi_line),
+    ("case_basics", _repeated_case_line),
+]
+
+# The tables of charges.
+_seq_no_header_line = re.compile(
+    r"^ +Seq No +Statute +Grade +Description +Disposition$"
+)
+_sentence_dt_header_line = re.compile(
+    r"^ +Sentence Dt\. +Sentence Type +Program Period +Sentence Length$"
+)
+_open_sequence_header_line = re.compile(r"^ +Seq No.")
+_STATUTE = (
+    rf"(?:[0-9]+(?= )|(?![0-9]){_WORD}) +§ +{_WORD}(?: +§+ {_WORD})?"
+    r"|Migration +§ +Migration"
+)
+_SEQUENCE = (
+    rf"^ *(?P<sequence_num>[0-9]+) +{_atomic(_STATUTE, 'statute')}"
+    rf" *{_atomic(r'(?:(?P<grade>[^ ][^ ]?) +)?')}(?P<description>{_words()})?"
+)
+_closed_sequence_line = re.compile(_SEQUENCE + rf" *(?P<disposition>{_words()})? *$")
+_open_sequence_line = re.compile(_SEQUENCE + rf"(?: +(?P<disposition>{_words()}))?$")
+_sequence_continued_line = re.compile(
+    rf"^ +(?:(?![0-9]+ )(?!{_DATE})|[0-9]+ ){_words()} *(?:{_words()})?$"
+)
+_sentencing_info_line = re.compile(
+    rf"^ +(?P<sentence_date>{_DATE})  +(?P<sentence_type>{_words()})?"
+    rf"(?: +(?P<program_period>{_words()})? *(?P<sentence_length>{_words()})? *)?$"
+)
+_archived_line = re.compile(r"^ +Archived *$")
+_archived_case_line = re.compile(rf"^ +[^ ]+ +{_words()}$")
+
+
+def _date_or_none(text: Optional[str]) -> Optional[date]:
+    try:
+        return datetime.strptime(text, "%m/%d/%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class _Lines:
+    """
+    A list of lines, read from the first to the last.
+    """
+
+    def __init__(self, lines: List[str], description: str):
+        self.lines = lines
+        self.description = description
+        self.i = 0
+
+    def match(self, pattern: Pattern, ahead: int = 0) -> Optional[re.Match]:
+        """ Match a pattern against the current line, or a line `ahead` of it. """
+        i = self.i + ahead
+        if i < len(self.lines):
+            return pattern.match(self.lines[i])
+        return None
+
+    def take(self, pattern: Pattern) -> Optional[re.Match]:
+        """ Match a pattern against the current line, and move past the line if it matched. """
+        match = self.match(pattern)
+        if match is not None:
+            self.i += 1
+        return match
+
+    def expect(self, pattern: Pattern) -> re.Match:
+        """ Like `take`, but the line has to match. """
+        match = self.take(pattern)
+        if match is None:
+            raise self.error()
+        return match
+
+    def skip(self, pattern: Pattern) -> None:
+        """ Move past the lines that match a pattern. """
+        while self.take(pattern) is not None:
+            pass
+
+    def done(self) -> bool:
+        return self.i >= len(self.lines)
+
+    def error(self) -> SummaryLayoutError:
+        line = self.lines[self.i] if not self.done() else "<end>"
+        return SummaryLayoutError(
+            f"Unexpected line {self.i + 1} of {self.description}: {line!r}"
+        )
+
+
+def read_page(page: str, first_page: bool) -> Tuple[Optional[Person], str]:
+    """
+    Separate the header, caption, body and footer of a page of a CP summary.
+
+    Args:
+        page: The text of the page, ending with its page break.
+        first_page: Only the first page has a caption.
+
+    Returns:
+        The defendant in the caption of the first page (None for the other pages), and the
+        text of the page's body, as the grammars would leave it in a `summary_info` node.
+    """
+    if not page.endswith("\n\f"):
+        raise SummaryLayoutError("A page does not end with a page break.")
+    page = page[:-2]
+    unexpected = _unexpected_character.search(page)
+    if unexpected is not None:
+        raise SummaryLayoutError(f"Unexpected character {unexpected.group()!r}.")
+    lines = _Lines(page.split("\n"), "a page")
+    lines.expect(_court_name_line)
+    lines.expect(_court_summary_line)
+    while not lines.done() and lines.lines[lines.i] == "":
+        lines.i += 1
+
+    defendant = None
+    if first_page:
+        name = lines.expect(_name_line)
+        lines.expect(_address_line)
+        lines.expect(_hair_line)
+        race = lines.expect(_race_line)
+        aliases = [race.group("alias")] if race.group("alias") else []
+        alias = lines.take(_alias_line)
+        while alias is not None:
+            aliases.append(alias.group("alias"))
+            alias = lines.take(_alias_line)
+        lines.expect(_blank_line)
+        last_first = [n.strip() for n in name.group("name").split(",")]
+        if len(last_first) < 2:
+            raise SummaryLayoutError("The defendant's name is not 'Last, First'.")
+        defendant = Person(
+            last_first[1],
+            last_first[0],
+            _date_or_none(name.group("dob")),
+            aliases=aliases,
+        )
+    else:
+        lines.expect(_continuation_line)
+
+    # The body ends at the last line that isn't empty before the footer. It has at least two
+    # lines, and the footer at least one line after its first.
+    start = lines.i
+    footer = next(
+        (
+            i
+            for i in range(start + 1, len(lines.lines))
+            if _footer_line.match(lines.lines[i])
+        ),
+        None,
+    )
+    if footer is None or footer == len(lines.lines) - 1:
+        raise SummaryLayoutError("Could not find the footer of a page.")
+    end = footer
+    while end > start and lines.lines[end - 1] == "":
+        end -= 1
+    if end - start < 2:
+        raise SummaryLayoutError("A page's body is too short.")
+    return defendant, " " + "\n".join(lines.lines[start:end]) + "\n "
+
+
+def read_charges(lines: _Lines) -> List[Charge]:
+    """
+    Read the table of charges of a case, if there is one. Closed cases have a table with
+    sentences, and other cases a table without.
+    """
+    if _closed_sequence_header_ahead(lines) > 0:
+        return _read_closed_sequences(lines)
+    if lines.match(_open_sequence_header_line):
+        return _read_open_sequences(lines)
+    return []
+
+
+def _closed_sequence_header_ahead(lines: _Lines, ahead: int = 0) -> int:
+    """ The number of lines in the closed sequence header starting `ahead` lines ahead, if any. """
+    seq_no_lines = 0
+    while lines.match(_seq_no_header_line, ahead + seq_no_lines):
+        seq_no_lines += 1
+    sentence_dt_lines = 0
+    if seq_no_lines > 0:
+        while lines.match(
+            _sentence_dt_header_line, ahead + seq_no_lines + sentence_dt_lines
+        ):
+            sentence_dt_lines += 1
+    return seq_no_lines + sentence_dt_lines if sentence_dt_lines > 0 else 0
+
+
+def _skip_closed_sequence_headers(lines: _Lines) -> bool:
+    header_lines = _closed_sequence_header_ahead(lines)
+    lines.i += header_lines
+    return header_lines > 0
+
+
+def _charge(match: re.Match) -> Charge:
+    return Charge(
+        offense=match.group("description") or "",
+        statute=match.group("statute"),
+        grade=match.group("grade") or "",
+        disposition=match.group("disposition") or "",
+        disposition_date=None,
+        sentences=[],
+        sequence=int(match.group("sequence_num")),
+    )
+
+
+def _sentence(match: re.Match) -> Sentence:
+    min_length, max_length = (None, None)
+    if match.group("sentence_length") is not None:
+        min_length, max_length = sentence_length_terms(match.group("sentence_length"))
+    return Sentence(
+        sentence_date=_date_or_none(match.group("sentence_date")),
+        sentence_type=match.group("sentence_type") or "",
+        sentence_period=match.group("program_period") or "",
+        sentence_length=SentenceLength.from_tuples(
+            min_time=min_length or ("", ""), max_time=max_length or ("", "")
+        ),
+    )
+
+
+def _read_closed_sequences(lines: _Lines) -> List[Charge]:
+    while _skip_closed_sequence_headers(lines):
+        pass
+    charges = []
+    sequence = lines.take(_closed_sequence_line)
+    while sequence is not None:
+        charge = _charge(sequence)
+        lines.skip(_sequence_continued_line)
+        _skip_closed_sequence_headers(lines)
+        if lines.match(_blank_line) and _closed_sequence_header_ahead(lines, 1) > 0:
+            lines.i += 1
+            _skip_closed_sequence_headers(lines)
+        sentence = lines.take(_sentencing_info_line)
+        while sentence is not None:
+            charge.sentences.append(_sentence(sentence))
+            lines.take(_blank_line)
+            _skip_closed_sequence_headers(lines)
+            sentence = lines.take(_sentencing_info_line)
+        charges.append(charge)
+        sequence = lines.take(_closed_sequence_line)
+    return charges
+
+
+def _read_open_sequences(lines: _Lines) -> List[Charge]:
+    lines.skip(_open_sequence_header_line)
+    if not lines.match(_open_sequence_line):
+        if (
+            lines.done()
+            or lines.lines[lines.i] == ""
+            or not lines.match(_open_sequence_header_line, 1)
+        ):
+            return []
+        # A line that isn't a sequence, and another header.
+        lines.i += 2
+    charges = []
+    sequence = lines.take(_open_sequence_line)
+    while sequence is not None:
+        charges.append(_charge(sequence))
+        lines.skip(_sequence_continued_line)
+        lines.take(_open_sequence_header_line)
+        sequence = lines.take(_open_sequence_line)
+    return charges
+
+
+def read_case(lines: _Lines, status: str, county: str) -> Case:
+    """
+    Read a case, from its first line up to the next case.
+    """
+    case_basics = lines.expect(_case_line)
+    actions = {}
+    for name, pattern in _arrest_disp_actions:
+        match = lines.take(pattern)
+        if match is not None:
+            actions[name] = match
+    charges = read_charges(lines)
+    lines.skip(_blank_line)
+
+    arrest_disp = actions.get("arrest_disp")
+    if arrest_disp is not None:
+        arrest_date = _date_or_none(arrest_disp.group("arrest_date"))
+        disposition_date = _date_or_none(arrest_disp.group("disp_date"))
+        judge = arrest_disp.group("judge") or ""
+    else:
+        arrest_trial = actions.get("arrest_trial")
+        arrest_date = (
+            _date_or_none(arrest_trial.group("arrest_date"))
+            if arrest_trial is not None
+            else None
+        )
+        disposition_date = None
+        judge = ""
+    case = Case(
+        status=status,
+        county=county,
+        docket_number=case_basics.group("docket_number"),
+        otn=case_basics.group("otn"),
+        dc=case_basics.group("dc"),
+        charges=Charge.reduce_merge(charges),
+        total_fines=None,  # a summary docket never has info about this.
+        fines_paid=None,
+        arrest_date=arrest_date,
+        disposition_date=disposition_date,
+        judge=judge,
+    )
+    # Charges inherit the disposition date of the case, like in `get_cp_cases`.
+    if disposition_date is not None:
+        for charge in case.charges:
+            charge.disposition_date = disposition_date
+    return case
+
+
+def read_body(body_lines: List[str]) -> List[Case]:
+    """
+    Read the cases in the body of a CP summary, stitched together from its pages.
+
+    The cases are listed under a status, like "Closed", and under that, by county.
+    """
+    if not body_lines or body_lines[-1].strip() != "":
+        raise SummaryLayoutError("The body of the summary does not end with a newline.")
+    # The last line is blank, and ends the body instead of a newline.
+    lines = _Lines(body_lines[:-1], "the body")
+    cases = []
+    while True:
+        status = lines.expect(_heading_line).group("heading")
+        if not (lines.match(_heading_line) and lines.match(_case_line, 1)):
+            raise lines.error()
+        while lines.match(_heading_line) and lines.match(_case_line, 1):
+            county = lines.take(_heading_line).group("heading")
+            while lines.match(_case_line):
+                cases.append(read_case(lines, status, county))
+        if lines.take(_archived_line):
+            lines.expect(_archived_case_line)
+            lines.skip(_blank_line)
+            while lines.take(_archived_case_line):
+                lines.skip(_blank_line)
+        if all(_blank_line.match(line) for line in lines.lines[lines.i :]):
+            return cases
+
+
+def parse_cp_summary_pages(
+    pages: Iterable[str],
+) -> Tuple[Person, List[Case], List[str]]:
+    """
+    Parse a CP summary from the text of its pages, without the grammars.
+
+    Args:
+        pages: The text of each page, ending with its page break.
+
+    Returns:
+        The defendant, the cases, and a list of errors, like `parse_pdf_pages`.
+
+    Raises:
+        SummaryLayoutError: The summary is not laid out the way the grammars expect.
+    """
+    defendant = None
+    sections = []
+    for i, page in enumerate(pages):
+        page_defendant, section = read_page(page, first_page=(i == 0))
+        if i == 0:
+            defendant = page_defendant
+        sections.append(section)
+    if not sections:
+        raise SummaryLayoutError("The summary has no pages.")
+    body_lines = cp_summary_overflow.stitch(section_lines(sections))
+    return defendant, read_body(body_lines), []
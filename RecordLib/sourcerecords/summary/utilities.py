@@ -4,106 +4,104 @@ Simple functions used for reading summary sheets.
 
 
 import re
+from typing import List, Optional, Tuple
 from lxml import etree
 from datetime import datetime
 
-def visit_sentence_length(self, node, vc):
+# Sentence lengths can appear in lots of formats, so these patterns try to find different
+# possibilities.
+min_pattern = re.compile(
+    r".*(?:min of|Min:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+max_pattern = re.compile(
+    r".*(?:max of|Max:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+# Original from DocketParse
+# range_pattern = re.compile(r".*?(?P<min_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<min_unit>\w+ )?(?:to|-)? (?P<max_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<max_unit>\w+).*", flags=re.IGNORECASE|re.DOTALL)
+
+range_pattern = re.compile(
+    r".*: (?P<min_time>[0-9\.\/]+) (?P<min_unit>\w+)?(?:to|-)?.*: (?P<max_time>[0-9\.\/]+) (?P<max_unit>\w+).*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
+single_term_pattern = re.compile(
+    r".*\s{5,}(?P<time>[0-9\./]+)\s(?P<unit>\w+)$.*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
+
+def sentence_length_terms(
+    text: str,
+) -> Tuple[Optional[Tuple[str, str]], Optional[Tuple[str, str]]]:
     """
-    Custom node visitor for parsing a setence in a conviction.
-
-    Returns an xml tree along the lines of
-    
-    .. code-block:: xml 
+    Find the minimum and maximum terms of a sentence length, such as
+    "Min: 1 Year(s) Max: 2 Year(s)".
 
-        <sentence_length>
-            <min_length> <time> __ </time> <unit> __ </unit> </min_length>
-            <max_length> <time> __ </time> <unit> __ </unit> </max_length>
-        </sentence_length>
+    Returns:
+        The (time, unit) of the minimum and of the maximum, or (None, None) if the length
+        isn't in a format we recognize.
     """
-
-    # Sentence lengths can appear in lots of formats, so this attempts to parse different
-    # possibilities.
-    min_pattern = re.compile(
-        r".*(?:min of|Min:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    max_pattern = re.compile(
-        r".*(?:max of|Max:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    # Original from DocketParse
-    # range_pattern = re.compile(r".*?(?P<min_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<min_unit>\w+ )?(?:to|-)? (?P<max_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<max_unit>\w+).*", flags=re.IGNORECASE|re.DOTALL)
-
-    range_pattern = re.compile(
-        r".*: (?P<min_time>[0-9\.\/]+) (?P<min_unit>\w+)?(?:to|-)?.*: (?P<max_time>[0-9\.\/]+) (?P<max_unit>\w+).*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-
-    single_term_pattern = re.compile(
-        r".*\s{5,}(?P<time>[0-9\./]+)\s(?P<unit>\w+)$.*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    # temp_string = node.text
-    #    print(temp_string)
     min_length = None
     max_length = None
-    min_length_match = re.match(min_pattern, node.text)
-    max_length_match = re.match(max_pattern, node.text)
-    range = re.match(range_pattern, node.text)
-    single_term = re.match(single_term_pattern, node.text)
+    min_length_match = min_pattern.match(text)
+    max_length_match = max_pattern.match(text)
+    range = range_pattern.match(text)
+    single_term = single_term_pattern.match(text)
+
     if min_length_match is not None:
-        min_length = (
-            f"<min_length> <time> {min_length_match.group('time')} </time> "
-            + f"<unit> {min_length_match.group('unit')} </unit> </min_length>"
-        )
+        min_length = min_length_match.group("time", "unit")
         if max_length_match is None:
-            max_length = (
-                f"<max_length> <time> {min_length_match.group('time')} </time> "
-                + f" <unit> {min_length_match.group('unit')} </unit> </max_length>"
-            )
+            max_length = min_length
 
     if max_length_match is not None:
-        max_length = (
-            "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
-            % (max_length_match.group("time"), max_length_match.group("unit"))
-        )
+        max_length = max_length_match.group("time", "unit")
         if min_length_match is None:
-            min_length = (
-                "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-                % (max_length_match.group("time"), max_length_match.group("unit"))
-            )
+            min_length = max_length
 
     if range is not None:
+        max_length = range.group("max_time", "max_unit")
         if range.group("min_unit") is not None:
-            min_length = (
-                "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-                % (range.group("min_time"), range.group("min_unit"))
-            )
+            min_length = range.group("min_time", "min_unit")
         else:
-            min_length = (
-                "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-                % (range.group("min_time"), range.group("max_unit"))
-            )
-        max_length = (
-            "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
-            % (range.group("max_time"), range.group("max_unit"))
-        )
+            min_length = (range.group("min_time"), range.group("max_unit"))
 
     if single_term is not None:
-        min_length = (
-            "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-            % (single_term.group("time"), single_term.group("unit"))
-        )
-        max_length = (
-            "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
-            % (single_term.group("time"), single_term.group("unit"))
+        min_length = single_term.group("time", "unit")
+        max_length = min_length
+
+    if min_length is None or max_length is None:
+        return None, None
+    return min_length, max_length
+
+
+def visit_sentence_length(self, node, vc):
+    """
+    Custom node visitor for parsing a setence in a conviction.
+
+    Returns a tree (an xml string, or ParseNodes, depending on the visitor) along the lines of
+    
+    .. code-block:: xml 
+
+        <sentence_length>
+            <min_length> <time> __ </time> <unit> __ </unit> </min_length>
+            <max_length> <time> __ </time> <unit> __ </unit> </max_length>
+        </sentence_length>
+    """
+    min_length, max_length = sentence_length_terms(node.text)
+
+    def length(tag, term):
+        time, unit = term
+        return self.element(
+            tag, [self.element("time", [time]), " ", self.element("unit", [unit])]
         )
 
-    contents = self.stringify(vc)
-    if min_length is not None and max_length is not None:
-        contents = min_length + " " + max_length
+    contents = vc
+    if min_length is not None:
+        contents = [length("min_length", min_length), " ", length("max_length", max_length)]
 
-    return " <sentence_length> %s </sentence_length> " % contents
+    return self.element("sentence_length", contents)
 
 
 def text_or_blank(element: etree.Element) -> str:
@@ -124,3 +122,28 @@ def date_or_none(date_element: etree.Element, fmtstr: str = "%m/%d/%Y") -> datet
         return datetime.strptime(date_element.text.strip(), fmtstr).date()
     except (ValueError, AttributeError):
         return None
+
+
+def int_or_none(element: etree.Element) -> int:
+    """
+    Return the integer in an element, or None.
+    """
+    try:
+        return int(element.text.strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def section_lines(section_texts: List[str]) -> List[List[str]]:
+    """
+    Split the text of the body section of each page of a summary into lines.
+
+    When a case continues onto the next page, the section ends with a newline that would
+    leave an empty line in the middle of the case once the pages are stitched together, so
+    it's dropped, to help the grammars.
+    """
+    texts = list(section_texts)
+    for i, text in enumerate(texts[:-1]):
+        if text[-2:] == "\n " and "(Continued)" in texts[i + 1][0:50]:
+            texts[i] = text[:-2]
+    return [text.split("\n") for text in texts]
@@ -0,0 +1,246 @@
+"""
+A cache of text extracted from pdfs.
+
+The same dockets and summaries get uploaded and downloaded over and over. Extracted text is
+cached under the SHA-256 of the pdf's bytes plus a string identifying the extractor, so a
+document is only converted once per version of the extractor.
+
+There are two layers:
+
+- a small, in-process LRU cache of the most recently used texts, and
+- an optional on-disk store, shared by every process using the same directory. The store is
+  kept under a size limit by evicting the least recently used texts.
+
+Configure the on-disk store with the environment variables `TEXT_CACHE_DIR` (no disk store
+is used unless this is set) and `TEXT_CACHE_MAX_BYTES` (defaults to 500MB).
+"""
+from __future__ import annotations
+from typing import Optional
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class TextCache:
+    """
+    Two-layer cache of extracted texts.
+
+    Args:
+        directory: Where the on-disk store lives. If None, only the in-process cache is used.
+        max_bytes: The most bytes of text the on-disk store may hold.
+        memory_items: How many texts the in-process cache holds.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_items: int = 64,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # Bytes held on disk. Counted the first time something is written.
+        self._disk_bytes = None
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key(pdf_bytes: bytes, extractor_version: str) -> str:
+        """
+        The cache key for a pdf.
+        """
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(extractor_version.encode("utf8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def _remember(self, key: str, text: str) -> None:
+        """ Add a text to the in-process cache. Caller holds the lock. """
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up the text for a key.
+
+        Returns:
+            The cached text, or None if the key isn't cached.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                return self._memory[key]
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf8") as f:
+                    text = f.read()
+                # Reading a text makes it the most recently used.
+                os.utime(path)
+            except OSError:
+                text = None
+            if text is not None:
+                with self._lock:
+                    self._counts["disk_hits"] += 1
+                    self._remember(key, text)
+                return text
+        with self._lock:
+            self._counts["misses"] += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        """
+        Store the text for a key.
+        """
+        with self._lock:
+            self._remember(key, text)
+        writer = self.writer(key)
+        if writer is not None:
+            writer.write(text)
+            writer.commit()
+
+    def writer(self, key: str) -> Optional[PendingText]:
+        """
+        Start storing a text in the on-disk store a piece at a time, so the whole text
+        never needs to be in memory. The text isn't added to the in-process cache.
+
+        Returns:
+            A PendingText to write the text to, or None if there's no on-disk store.
+        """
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first, so other processes never read half a text.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError as e:
+            logger.error(f"Could not write extracted text to the cache: {e}")
+            return None
+        return PendingText(self, path, os.fdopen(fd, "w", encoding="utf8"), tmp_path)
+
+    def _stored(self, size: int) -> None:
+        """ Account for a text that was added to the on-disk store. """
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan()[1]
+            else:
+                self._disk_bytes += size
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """
+        List the texts in the on-disk store.
+
+        Returns:
+            A list of (mtime, size, path) tuples and the total size of the texts.
+        """
+        entries = []
+        for subdir in os.scandir(self.directory):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if entry.name.endswith(".txt"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries, sum(size for _, size, _ in entries)
+
+    def _evict(self) -> None:
+        """
+        Delete the least recently used texts until the store is under its size limit.
+
+        Caller holds the lock.
+        """
+        entries, total = self._scan()
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self._counts["evictions"] += 1
+        self._disk_bytes = total
+        logger.info(f"Evicted texts from the text cache. Stats: {self._counts}")
+
+    def stats(self) -> dict:
+        """
+        Counts of how the cache has been used, since the process started.
+        """
+        with self._lock:
+            stats = dict(self._counts)
+            stats["memory_items"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+class PendingText:
+    """
+    A text being written to a TextCache's on-disk store. Nothing can be read from the cache
+    until `commit` is called.
+    """
+
+    def __init__(self, cache: TextCache, path: str, file, tmp_path: str):
+        self.cache = cache
+        self.path = path
+        self.file = file
+        self.tmp_path = tmp_path
+
+    def write(self, text: str) -> None:
+        self.file.write(text)
+
+    def commit(self) -> None:
+        try:
+            self.file.close()
+            size = os.path.getsize(self.tmp_path)
+            os.replace(self.tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not write extracted text to the cache: {e}")
+            self.discard()
+            return
+        self.cache._stored(size)
+
+    def discard(self) -> None:
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+def cache_from_environment() -> TextCache:
+    """
+    Create a TextCache configured by the environment variables `TEXT_CACHE_DIR` and
+    `TEXT_CACHE_MAX_BYTES`.
+    """
+    try:
+        max_bytes = int(os.environ.get("TEXT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    except ValueError:
+        max_bytes = DEFAULT_MAX_BYTES
+    return TextCache(
+        directory=os.environ.get("TEXT_CACHE_DIR") or None, max_bytes=max_bytes
+    )
@@ -119,7 +119,10 @@ class EmailBuilder:
             return None
         
         crecord = self.analysis.record
-        global_rules = ssr.full_record_requirements_for_petition_sealing(crecord)
+        # Decide in the analysis's context, to share the decisions its rules already made about the record.
+        with self.analysis.context:
+            global_rules = ssr.full_record_requirements_for_petition_sealing(crecord)
+            ten_years_decision = ssr.ten_years_since_last_conviction(crecord)
         if sum(list(map(int,map(bool, global_rules.reasoning)))) != len(global_rules.reasoning) - 1:
             # If there was not one and only one reason that the record can't be sealed (i.e. the correspoding decision isn't false), 
             # then date-of-last-conviction cannot be the only reason the case isn't sealable.
@@ -127,7 +130,6 @@ class EmailBuilder:
             # then the date-of-last-conviction cant be the only reason the case isn't sealable.
             return None
 
-        ten_years_decision = ssr.ten_years_since_last_conviction(crecord)
         if bool(ten_years_decision) is True:
             # This record passes the ten years since conviction requirement, so 
             # that rule is not what's preventing this case from being sealable. 
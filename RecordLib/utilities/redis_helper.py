@@ -1,6 +1,6 @@
 import functools
 from RecordLib.crecord import CRecord
-from RecordLib.crecord import Sentence, Charge
+from RecordLib.crecord import Sentence, Charge, DispositionTypes
 from RecordLib.crecord import Case
 import re
 import redis
@@ -47,6 +47,14 @@ class RedisHelper:
         for sentence in charge.sentences:
             self.sadd_sentence(sentence)
 
+    def disposition_types(self) -> dict:
+        """
+        Classify every disposition collected so far, to check how `DispositionTypes` reads them.
+        """
+        dispositions = self.r.smembers(self.env + ":charge:disposition")
+        dispositions = (d.decode() if isinstance(d, bytes) else d for d in dispositions)
+        return {d: DispositionTypes.classify(d) for d in dispositions}
+
     def sadd_case(self, case: Case) -> None:
         """
         Store components of a Case in the redis store.
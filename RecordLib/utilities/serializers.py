@@ -5,7 +5,7 @@ Transform RecordLib objects into json representations.
 
 
 import functools
-from typing import Union
+from typing import Any, Iterable, Tuple, Union
 from datetime import date, datetime, timedelta
 from lxml import etree
 from lxml.etree import _ElementTree
@@ -17,6 +17,7 @@ from RecordLib.petitions import Expungement, Sealing
 from RecordLib.analysis import Decision
 from RecordLib.crecord import CRecord
 from RecordLib.crecord import Attorney
+from RecordLib.crecord.evaluation import EvaluationContext
 from RecordLib.sourcerecords import Docket, Summary, SourceRecord
 
 
@@ -70,6 +71,22 @@ def ts_sourcerecord(sr):
     }
 
 
+@to_serializable.register(EvaluationContext)
+def ts_evaluation_context(context):
+    return {"as_of": to_serializable(context.as_of)}
+
+
+def attributes(an_object) -> Iterable[Tuple[str, Any]]:
+    """
+    The names and values of an object's attributes, from its `__dict__`, or from its
+    `__slots__` for the classes that keep their attributes there, like Case and Charge.
+    """
+    try:
+        return an_object.__dict__.items()
+    except AttributeError:
+        return ((k, getattr(an_object, k)) for k in an_object.__slots__)
+
+
 @to_serializable.register(Case)
 @to_serializable.register(Charge)
 @to_serializable.register(Person)
@@ -85,7 +102,7 @@ def ts_sourcerecord(sr):
 @to_serializable.register(Address)
 def ts_object(an_object):
     return {
-        k: to_serializable(v) for k, v in an_object.__dict__.items() if v is not None
+        k: to_serializable(v) for k, v in attributes(an_object) if v is not None
     }
     # return {k: to_serializable(v) for k, v in an_object.__dict__.items()}
 
@@ -7,10 +7,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.db.models.signals import post_save
-from RecordLib.sourcerecords.docket.re_parse_pdf import (
-    re_parse_pdf as docket_pdf_parser,
-)
-from RecordLib.sourcerecords.summary.parse_pdf import parse_pdf as summary_pdf_parser
+from RecordLib.sourcerecords.dispatch import parse_pdf
 
 
 class DocumentTemplate(models.Model):
@@ -194,10 +191,13 @@ class SourceRecord(models.Model):
         """
 
         Based on the record_type of this SourceRecord, identify the parser it should use.
+
+        Dockets and summaries both use the dispatcher, which tells the courts apart
+        by reading the header of the document.
         """
         return {
-            "SUMMARY_PDF": summary_pdf_parser,
-            "DOCKET_PDF": docket_pdf_parser,
+            "SUMMARY_PDF": parse_pdf,
+            "DOCKET_PDF": parse_pdf,
         }.get(self.record_type)
 
     class FetchStatuses:
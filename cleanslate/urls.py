@@ -8,4 +8,5 @@ urlpatterns = [
     path('analysis/', AnalysisView.as_view()),
     path('petitions/', RenderDocumentsView.as_view()),
     path('profile/', UserProfileView.as_view()),
+    path('sourcerecords/textcache/', TextCacheStatsView.as_view()),
 ]
\ No newline at end of file
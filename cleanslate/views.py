@@ -11,6 +11,7 @@ from rest_framework.views import APIView
 from rest_framework import permissions, status
 from RecordLib.crecord import CRecord
 from RecordLib.sourcerecords import SourceRecord as RLSourceRecord
+from RecordLib.sourcerecords.pdfextraction import default_extractor
 from RecordLib.analysis import Analysis
 from RecordLib.utilities.serializers import to_serializable
 from RecordLib.analysis.ruledefs import (
@@ -175,8 +176,9 @@ def integrate_summaries(
 
     # compare the dockets_in_summaries to dockets already collected as source records
     # to see what dockets are missing from the set of source records.
+    docket_nums = {sr.docket_num for sr in docket_source_records}
     missing_dockets = [
-        dn for dn in dockets_in_summaries if dn not in docket_source_records
+        dn for dn in dict.fromkeys(dockets_in_summaries) if dn not in docket_nums
     ]
     new_source_dockets = download_service.dockets(missing_dockets, owner=owner)
     logger.info("Downloaded %d", len(new_source_dockets))
@@ -392,3 +394,16 @@ class UserProfileView(APIView):
             }
         )
 
+
+class TextCacheStatsView(APIView):
+    """
+    Report how well the cache of text extracted from pdfs is working.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        cache = default_extractor().cache
+        if cache is None:
+            return Response({"text_cache": None})
+        return Response({"text_cache": cache.stats()})
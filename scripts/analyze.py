@@ -2,8 +2,6 @@ import click
 import logging
 from RecordLib.utilities.serializers import to_serializable
 from RecordLib.crecord import CRecord
-from RecordLib.sourcerecords.summary import Summary
-from RecordLib.sourcerecords.docket import Docket
 from RecordLib.analysis import Analysis
 from RecordLib.utilities.redis_helper import RedisHelper
 from RecordLib.analysis.ruledefs import (
@@ -13,17 +11,18 @@ from RecordLib.analysis.ruledefs import (
     expunge_over_70,
     seal_convictions,
 )
-from RecordLib.analysis.ruledefs.sealing_rules import (
+from RecordLib.analysis.ruledefs.simple_sealing_rules import (
     no_f1_convictions,
     any_felony_convictions_n_years,
     more_than_x_convictions_y_grade_z_years,
 )
-from RecordLib.sourcerecords.summary.pdf import parse_pdf as parse_pdf_summary
-import pytest
+from RecordLib.analysis.batch import analyze_directories, finished_directories, read_record
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.sourcerecords.summary.parse_pdf import parse_pdf as parse_pdf_summary
 import json
-import glob
 import os
 import csv
+import time
 
 
 @click.group()
@@ -32,9 +31,8 @@ def cli():
 
 @cli.command()
 @click.option("--directory", "-d", type=click.Path(), required=True)
-@click.option("--tempdir", "-td", type=click.Path(), default="tests/data/tmp")
 @click.option("--output", "-o", type=click.Path(), required=True)
-def triage(directory, tempdir, output):
+def triage(directory, output):
     """
     Read through a set of directories each containing records for a single person. Screen each person for obviously disqualifying elements in their record.
     """
@@ -46,18 +44,8 @@ def triage(directory, tempdir, output):
     recs = []
     logging.info(f"Constructing {len(subdirs)} records.")
     for sd in subdirs:
-        rec = CRecord()
-        pdfs = glob.glob(os.path.join(directory, sd, "*_Summary.pdf"))
         try:
-            for pdf in pdfs: 
-                try:
-                    rec.add_summary(parse_pdf_summary(pdf, tempdir=tempdir))
-                except:
-                    try:
-                        d, _ = Docket.from_pdf(pdf, tempdir=tempdir)
-                        rec.add_docket(d)
-                    except Exception as e:
-                        raise e
+            rec, _ = read_record(os.path.join(directory, sd))
             logging.info(f"Constructed a record for {rec.person.full_name()}, with {len(rec.cases)} cases.")
             recs.append((sd, rec))
         except Exception as e:
@@ -94,16 +82,16 @@ def triage(directory, tempdir, output):
 
 @cli.command()
 @click.option("--pdf-summary", "-ps", type=click.Path(), required=True, default=None)
-@click.option("--tempdir", "-td", type=click.Path(), default="tests/data/tmp")
 @click.option("--redis-collect", "-rc", default=None, type=str, help="connection to redis, in the form [host]:[port]:[db number]:[environment name]. For example, 'localhost:6379:0:development'")
-def summary(pdf_summary: str, tempdir: str, redis_collect: str) -> None:
+def summary(pdf_summary: str, redis_collect: str) -> None:
     """
     Analyze a single summary sheet for all sealings and expungements.
     """
 
     rec = CRecord()
     if pdf_summary is not None:
-        rec.add_summary(parse_pdf_summary(pdf_summary, tempdir = tempdir))
+        rec.add_sourcerecord(SourceRecord(
+            pdf_summary, parser=parse_pdf_summary, record_type=SourceRecord.RECORD_TYPES.SUMMARY))
 
     if redis_collect is not None:
         try:
@@ -124,3 +112,46 @@ def summary(pdf_summary: str, tempdir: str, redis_collect: str) -> None:
     )
 
     print(json.dumps(analysis, indent=4, default=to_serializable)) #cls=DataClassJSONEncoder))
+
+
+@cli.command()
+@click.option("--directory", "-d", type=click.Path(exists=True, file_okay=False), required=True,
+              help="A directory of directories, each with the dockets and summaries of one person.")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), required=True,
+              help="File to write one line of json to for each person.")
+@click.option("--workers", "-w", type=int, default=None, help="Number of processes. Defaults to the number of cpus.")
+@click.option("--max-in-flight", type=int, default=None,
+              help="Most people being analyzed at once. Defaults to twice the number of workers.")
+@click.option("--as-of", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Analyze the records as of this date, instead of today.")
+@click.option("--full", is_flag=True, help="Write out each whole analysis, not just the petitions.")
+@click.option("--restart", is_flag=True,
+              help="Analyze everyone again, instead of resuming after the people already in the output.")
+def batch(directory, output, workers, max_in_flight, as_of, full, restart):
+    """
+    Analyze the records of a directory of people in a pool of processes.
+
+    Writes a line of json to the output for each person as soon as they're done. If the output already has
+    results in it, the people they're for are skipped, so an interrupted batch picks up where it stopped.
+    """
+    logging.basicConfig(level=logging.ERROR)
+    if restart and os.path.exists(output):
+        os.remove(output)
+    finished = finished_directories(output)
+    directories = sorted(
+        os.path.join(directory, sd) for sd in os.listdir(directory) if os.path.isdir(os.path.join(directory, sd)))
+    remaining = [d for d in directories if d not in finished]
+    click.echo(f"Analyzing {len(remaining)} of {len(directories)} records. {len(directories) - len(remaining)} are already done.",
+               err=True)
+    started = time.perf_counter()
+    count = 0
+    with open(output, "a") as f:
+        for result in analyze_directories(
+                remaining, workers=workers, max_in_flight=max_in_flight,
+                as_of=as_of.date() if as_of else None, full=full):
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            count += 1
+    elapsed = time.perf_counter() - started
+    click.echo(f"Analyzed {count} records in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.2f} records/sec).",
+               err=True)
@@ -0,0 +1,225 @@
+"""
+Frozen copies of functions and classes that have since been rewritten for speed, or to save
+memory.
+
+The benchmarks compare the current functions against these, for speed and to check that
+they still agree. Don't use them for anything else.
+"""
+from __future__ import annotations
+import copy
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+from RecordLib.analysis import Analysis
+from RecordLib.analysis.decision import Decision, PetitionDecision
+from RecordLib.crecord import Charge, CRecord, DispositionTypes
+from RecordLib.crecord.evaluation import EvaluationContext
+from RecordLib.petitions import Expungement
+from RecordLib.sourcerecords.parsingutilities import date_or_none
+
+
+logger = logging.getLogger(__name__)
+
+
+# re_parse_cp_pdf.parse_charges, before it read the disposition section in a single pass.
+def parse_charges(txt: str) -> Tuple[Optional[List[Charge]], List[str]]:
+    """
+    Find the charges in the text of a docket.
+    
+
+    Returns:
+        Tuple[0] is either None or a list of Charges.
+        Tuple[1] is a list of strings describing errors encountered.
+    """
+    logger.info("      parsing charges")
+    disposition_section_searcher = re.compile(
+        r"(?:.*\s+)DISPOSITION SENTENCING/PENALTIES\s*\n(?P<disposition_section>(.+\n+(?=[A-Z ]+))+.*)"
+    )
+    errs = []
+    disposition_sections = disposition_section_searcher.findall(txt)
+    if disposition_section_searcher == []:
+        errs.append("Could not find the disposition/sentencing section.")
+        return None, errs
+    charges = []
+    charges_pattern = r"(?P<sequence>\d)\s+\/\s+(?P<offense>.+)\s{12,}(?P<disposition>\w.+?)(?=\s\s)\s{12,}(?P<grade>\w{0,2})\s+(?P<statute>\w{1,2}\s?\u00A7\s?\d+(\-|\u00A7|\w+)*)"
+    # there may be multiple disposition sections
+    for disposition_section in disposition_sections:
+        section_text = disposition_section[0]
+        section_lines = section_text.split("\n")
+        for idx, ln in enumerate(section_lines):
+            # Need to use a copy of the index, to advance if we find a charge overflow line, so that
+            # when we reach forward for the disposition date, we compensate if we've also found a charge overflow line.
+            idx_copy = idx
+            # not using the find_pattern function here because we're doing repeated searches on every line,
+            # and failing to match is not an error, in that case.
+            charge_line_search = re.search(charges_pattern, ln)
+            if charge_line_search is not None:
+                logger.debug(f"found a charge in line: {ln}")
+                offense = charge_line_search.group("offense").strip()
+                charge_overflow_search = re.search(
+                    r"^\s+(?P<offense_overflow>\w+\s*\w*)\s*$",
+                    section_lines[idx + 1],
+                    re.I,
+                )
+                if charge_overflow_search is not None:
+                    offense += (
+                        " " + charge_overflow_search.group("offense_overflow").strip()
+                    )
+                    idx_copy += 1
+                try:
+                    sequence = int(charge_line_search.group("sequence").strip())
+                except Exception:
+                    sequence = None
+                charge = Charge(
+                    sequence=sequence,
+                    offense=offense,
+                    grade=charge_line_search.group("grade"),
+                    statute=charge_line_search.group("statute"),
+                    disposition=charge_line_search.group("disposition"),
+                    sentences=[],  # TODO: re_parse_cp_pdf parser does not collect Sentences yet.
+                )
+
+                # sometimes a single charge may have multiple successive disposition dates. We need the last one.
+                next_line_index = idx_copy + 1
+                disp_date_search = re.search(
+                    r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",
+                    section_lines[next_line_index],
+                )
+                while re.search(
+                    r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",
+                    section_lines[next_line_index],
+                ):
+                    disp_date_search = re.search(
+                        r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",
+                        section_lines[next_line_index],
+                    )
+                    next_line_index += 1
+
+                #
+                # disposition_date_line = section_lines[idx_copy + 1]
+                # disp_date_search = re.search(r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})",disposition_date_line)
+                if disp_date_search is not None:
+                    charge.disposition_date = date_or_none(
+                        disp_date_search.group("disposition_date")
+                    )
+                    if charge.disposition_date is None:
+                        errs.append(
+                            f"For the offense, {charge.sequence}/ {offense}, we found, but could not parse, the disposition date: {disp_date_search.group('disposition_date')}"
+                        )
+                charges.append(charge)
+    charges = Charge.reduce_merge(charges)
+    missing_disposition_dates = [
+        f"Could not find disposition date for {c.sequence} / {c.offense} with disposition {c.disposition}"
+        for c in charges
+        if c.disposition_date is None
+    ]
+    errs += missing_disposition_dates
+    return charges, errs
+
+
+# SentenceLength, Sentence and Charge, before they kept their fields in __slots__. Only their
+# fields are kept.
+@dataclass
+class DictSentenceLength:
+    min_time: timedelta
+    max_time: timedelta
+
+
+@dataclass
+class DictSentence:
+    sentence_date: date
+    sentence_type: str
+    sentence_period: str
+    sentence_length: DictSentenceLength
+
+
+@dataclass
+class DictCharge:
+    offense: str
+    grade: str
+    statute: str
+    disposition: str
+    disposition_date: Optional[date] = None
+    sentences: Optional[List[DictSentence]] = None
+    sequence: Optional[int] = None
+
+
+# Analysis and petition_rules.expunge_nonconvictions, before rules shared the cases and charges
+# of the records they split, instead of copying them.
+class CopyingAnalysis:
+    def __init__(self, rec: CRecord) -> None:
+        self.record = rec
+        self.remaining_record = copy.deepcopy(rec)
+        self.decisions = []
+
+    def rule(self, ruledef: Callable) -> CopyingAnalysis:
+        remaining_record, petition_decision = ruledef(self.remaining_record)
+        self.remaining_record = remaining_record
+        self.decisions.append(petition_decision)
+        return self
+
+
+def expunge_nonconvictions(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
+    conclusion = Decision(
+        name="Expungements of nonconvictions.", value=[], reasoning=[]
+    )
+
+    remaining_recordord = CRecord(person=crecord.person)
+    for case in crecord.cases:
+        case_d = Decision(
+            name=f"Does {case.docket_number} have expungeable nonconvictions?",
+            reasoning=[],
+        )
+        unexpungeable_case = case.partialcopy()
+        expungeable_case = case.partialcopy()
+        for charge in case.charges:
+            conviction = charge.disposition_type() == DispositionTypes.CONVICTION
+            charge_d = Decision(
+                name=f"Is the charge for {charge.offense} a nonconviction?",
+                value=not conviction,
+                reasoning=f"The charge's disposition {charge.disposition} indicates a conviction"
+                if conviction
+                else f"The charge's disposition {charge.disposition} indicates its not a conviction.",
+            )
+
+            if bool(charge_d) is True:
+                expungeable_case.charges.append(charge)
+            else:
+                unexpungeable_case.charges.append(charge)
+            case_d.reasoning.append(charge_d)
+
+        if len(expungeable_case.charges) > 0:
+            case_d.value = True
+            exp = Expungement(client=crecord.person, cases=[expungeable_case])
+            if len(expungeable_case.charges) == len(case.charges):
+                exp.expungement_type = Expungement.ExpungementTypes.FULL_EXPUNGEMENT
+            else:
+                exp.expungement_type = Expungement.ExpungementTypes.PARTIAL_EXPUNGEMENT
+            conclusion.value.append(exp)
+        else:
+            case_d.value = False
+
+        if len(unexpungeable_case.charges) > 0:
+            remaining_recordord.cases.append(unexpungeable_case)
+        conclusion.reasoning.append(case_d)
+
+    return remaining_recordord, conclusion
+
+
+# An EvaluationContext, before rules shared the decisions they make about whole records and single
+# cases. Each rule decides everything again, but counts years up to the same `as_of` date.
+class UnsharedContext(EvaluationContext):
+    def decide(self, ruledef: Callable, record, *args, **kwargs):
+        return ruledef(record, *args, **kwargs)
+
+    def decide_about_case(self, ruledef: Callable, case, *args):
+        return ruledef(case, *args)
+
+
+# Analysis, before rules shared their decisions.
+class UnsharedAnalysis(Analysis):
+    def __init__(self, rec: CRecord, as_of: Optional[date] = None) -> None:
+        super().__init__(rec, as_of=as_of)
+        self.context = UnsharedContext(as_of)
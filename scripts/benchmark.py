@@ -0,0 +1,723 @@
+"""
+Benchmarks and conformance checks for parsing source records.
+
+These read the example documents in tests/data by default, so they are mostly useful on a
+developer's machine that has a collection of dockets and summaries.
+"""
+import click
+import difflib
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from RecordLib.analysis import Analysis
+from RecordLib.analysis.batch import RULES
+from RecordLib.analysis.ruledefs import expunge_nonconvictions
+from RecordLib.crecord import Case, Charge, CRecord, Person, Sentence, SentenceLength
+from RecordLib.sourcerecords.pdfbackends import BACKENDS, ExtractionError
+from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf, iter_pages_from_pdf
+from RecordLib.sourcerecords.docket import re_parse_cp_pdf, parse_cp_pdf
+from RecordLib.sourcerecords.docket import grammars as docket_grammars
+from RecordLib.sourcerecords.grammarregistry import (
+    GrammarRegistry,
+    default_grammar_registry,
+)
+from RecordLib.sourcerecords import dispatch
+from RecordLib.sourcerecords.customnodevisitorfactory import CustomVisitorFactory
+from RecordLib.sourcerecords.summary import grammars as summary_grammars
+from RecordLib.sourcerecords.summary.utilities import visit_sentence_length
+from RecordLib.sourcerecords.summary.parse_pdf import get_processors, parse_pdf_pages
+from RecordLib.sourcerecords.summary.re_parse_cp_pdf import (
+    SummaryLayoutError,
+    parse_cp_summary_pages,
+)
+from RecordLib.utilities.serializers import to_serializable
+from scripts import baselines
+
+
+def find_pdfs(directory: str):
+    return sorted(glob.glob(os.path.join(directory, "**", "*.pdf"), recursive=True))
+
+
+def parse_text(text: str):
+    """
+    Parse the text of a docket or summary. Returns the docket numbers found, or an error.
+    """
+    try:
+        _, cases, errors = dispatch.parse_text(text)
+    except Exception as e:
+        return f"error: {e}"
+    return sorted(c.docket_number for c in cases or [])
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option(
+    "--data-dir",
+    "-d",
+    type=click.Path(exists=True),
+    default="tests/data",
+    show_default=True,
+    help="Directory to search for pdfs.",
+)
+@click.option(
+    "--reference", default="pdftotext", show_default=True, type=click.Choice(BACKENDS)
+)
+@click.option(
+    "--candidate", default="pdfminer", show_default=True, type=click.Choice(BACKENDS)
+)
+@click.option("--show-diff", is_flag=True, help="Print a diff of each document's text.")
+def backends(data_dir, reference, candidate, show_diff):
+    """
+    Compare two pdf text backends across a directory of pdfs.
+
+    For each pdf, report how similar the two texts are, whether the parsers find the same
+    cases in both, and how much faster the candidate backend is.
+    """
+    reference_backend = BACKENDS[reference]()
+    candidate_backend = BACKENDS[candidate]()
+    pdfs = find_pdfs(data_dir)
+    if len(pdfs) == 0:
+        click.echo(f"No pdfs found in {data_dir}.")
+        return
+    click.echo(f"{'document':40} {'similarity':>10} {'parses':>7} {'speedup':>8}")
+    total_reference_time = 0.0
+    total_candidate_time = 0.0
+    agreements = 0
+    for pdf in pdfs:
+        with open(pdf, "rb") as f:
+            pdf_bytes = f.read()
+        texts = []
+        for backend in [reference_backend, candidate_backend]:
+            start = time.perf_counter()
+            try:
+                text = backend.extract(None, pdf_bytes)
+            except ExtractionError as e:
+                text = ""
+                click.echo(f"{backend.name} could not extract {pdf}: {e}")
+            texts.append((text, time.perf_counter() - start))
+        (reference_text, reference_time), (candidate_text, candidate_time) = texts
+        total_reference_time += reference_time
+        total_candidate_time += candidate_time
+        reference_lines = reference_text.splitlines()
+        candidate_lines = candidate_text.splitlines()
+        similarity = difflib.SequenceMatcher(
+            None, reference_lines, candidate_lines, autojunk=False
+        ).ratio()
+        agrees = parse_text(reference_text) == parse_text(candidate_text)
+        agreements += agrees
+        speedup = reference_time / candidate_time if candidate_time else float("inf")
+        click.echo(
+            f"{os.path.basename(pdf)[:40]:40} {similarity:>10.3f} {'yes' if agrees else 'NO':>7} {speedup:>7.2f}x"
+        )
+        if show_diff:
+            for line in difflib.unified_diff(
+                reference_lines, candidate_lines, reference, candidate, lineterm=""
+            ):
+                click.echo(line)
+    click.echo(
+        f"\n{len(pdfs)} documents. Parsers agreed on {agreements}. "
+        + f"{reference}: {total_reference_time:.2f}s, {candidate}: {total_candidate_time:.2f}s, "
+        + f"speedup {total_reference_time / max(total_candidate_time, 1e-9):.2f}x."
+    )
+
+
+def summarize_charges(charges):
+    return [
+        (c.sequence, c.offense, c.disposition, c.disposition_date)
+        for c in charges or []
+    ]
+
+
+def time_calls(func, arg, repeat: int):
+    """ Call func(arg) `repeat` times. Returns the last result and the seconds per call. """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(arg)
+    return result, (time.perf_counter() - start) / repeat
+
+
+@cli.command()
+@click.option(
+    "--data-dir",
+    "-d",
+    type=click.Path(exists=True),
+    default="tests/data",
+    show_default=True,
+    help="Directory to search for pdfs.",
+)
+@click.option(
+    "--largest",
+    "-n",
+    default=10,
+    show_default=True,
+    help="How many of the largest CP and MC dockets to use.",
+)
+@click.option(
+    "--repeat",
+    "-r",
+    default=20,
+    show_default=True,
+    help="How many times to parse each docket.",
+)
+def charges(data_dir, largest, repeat):
+    """
+    Compare the speed of finding the charges on CP and MC dockets with the old parser.
+    """
+    dockets = []
+    for pdf in find_pdfs(data_dir):
+        text = get_text_from_pdf(pdf)
+        if "DISPOSITION SENTENCING/PENALTIES" in text:
+            dockets.append((len(text), pdf, text))
+    if len(dockets) == 0:
+        click.echo(f"No CP or MC dockets found in {data_dir}.")
+        return
+    dockets = sorted(dockets, reverse=True)[:largest]
+    click.echo(
+        f"{'document':40} {'charges':>7} {'old/sec':>9} {'new/sec':>9} {'agree':>6}"
+    )
+    total_charges = 0
+    total_old_time = 0.0
+    total_new_time = 0.0
+    for _, pdf, text in dockets:
+        (old_charges, _), old_time = time_calls(baselines.parse_charges, text, repeat)
+        (new_charges, _), new_time = time_calls(
+            re_parse_cp_pdf.parse_charges, text, repeat
+        )
+        agrees = summarize_charges(old_charges) == summarize_charges(new_charges)
+        count = len(new_charges)
+        total_charges += count
+        total_old_time += old_time
+        total_new_time += new_time
+        click.echo(
+            f"{os.path.basename(pdf)[:40]:40} {count:>7} "
+            + f"{count / max(old_time, 1e-9):>9.0f} {count / max(new_time, 1e-9):>9.0f} "
+            + f"{'yes' if agrees else 'NO':>6}"
+        )
+    click.echo(
+        f"\n{len(dockets)} dockets, {total_charges} charges. "
+        + f"Old: {total_charges / max(total_old_time, 1e-9):.0f} charges/sec, "
+        + f"new: {total_charges / max(total_new_time, 1e-9):.0f} charges/sec, "
+        + f"speedup {total_old_time / max(total_new_time, 1e-9):.2f}x."
+    )
+
+
+def docket_grammar_sources():
+    """ The sources of the grammars the grammar-based CP docket parser uses. """
+    return [docket_grammars.docket_sections] + [
+        source for _, source, _, _, _ in docket_grammars.section_grammars
+    ]
+
+
+def time_parse_docket(text: str, repeat: int, compile_grammars: bool) -> float:
+    """
+    Seconds per parse of a docket with the grammar-based parser.
+
+    If `compile_grammars`, the grammars are compiled again for every parse, like the parser
+    did before it shared compiled grammars.
+    """
+    registry = default_grammar_registry()
+    total = 0.0
+    for _ in range(repeat):
+        if compile_grammars:
+            registry.clear()
+        start = time.perf_counter()
+        parse_cp_pdf.parse_cp_pdf_text(text)
+        total += time.perf_counter() - start
+    return total / repeat
+
+
+@cli.command()
+@click.option(
+    "--data-dir",
+    "-d",
+    type=click.Path(exists=True),
+    default="tests/data",
+    show_default=True,
+    help="Directory to search for pdfs.",
+)
+@click.option(
+    "--largest",
+    "-n",
+    default=10,
+    show_default=True,
+    help="How many of the largest CP and MC dockets to use.",
+)
+@click.option(
+    "--repeat",
+    "-r",
+    default=5,
+    show_default=True,
+    help="How many times to parse each docket.",
+)
+def grammars(data_dir, largest, repeat):
+    """
+    Compare per-docket parse times of the grammar-based CP docket parser, compiling its
+    grammars for every docket and sharing compiled grammars. Also compare compiling the
+    grammars with loading them from a disk cache, which is what a new worker process pays.
+    """
+    sources = docket_grammar_sources()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # The first registry compiles the grammars and stores them, the second loads them.
+        times = []
+        for _ in range(2):
+            registry = GrammarRegistry(directory=cache_dir)
+            start = time.perf_counter()
+            for source in sources:
+                registry.get(source)
+            times.append(time.perf_counter() - start)
+        compile_time, load_time = times
+    click.echo(
+        f"Start-up: compiling {len(sources)} grammars takes {compile_time * 1000:.1f}ms, "
+        + f"loading them from disk takes {load_time * 1000:.1f}ms.\n"
+    )
+
+    dockets = []
+    for pdf in find_pdfs(data_dir):
+        text = get_text_from_pdf(pdf)
+        if "DISPOSITION SENTENCING/PENALTIES" in text:
+            dockets.append((len(text), pdf, text))
+    if len(dockets) == 0:
+        click.echo(f"No CP or MC dockets found in {data_dir}.")
+        return
+    dockets = sorted(dockets, reverse=True)[:largest]
+    click.echo(f"{'document':40} {'compiling ms':>12} {'shared ms':>10} {'speedup':>8}")
+    total_compiling_time = 0.0
+    total_shared_time = 0.0
+    for _, pdf, text in dockets:
+        compiling_time = time_parse_docket(text, repeat, compile_grammars=True)
+        shared_time = time_parse_docket(text, repeat, compile_grammars=False)
+        total_compiling_time += compiling_time
+        total_shared_time += shared_time
+        click.echo(
+            f"{os.path.basename(pdf)[:40]:40} {compiling_time * 1000:>12.1f} "
+            + f"{shared_time * 1000:>10.1f} "
+            + f"{compiling_time / max(shared_time, 1e-9):>7.2f}x"
+        )
+    click.echo(
+        f"\n{len(dockets)} dockets. "
+        + f"Compiling grammars: {total_compiling_time / len(dockets) * 1000:.1f}ms per docket, "
+        + f"sharing them: {total_shared_time / len(dockets) * 1000:.1f}ms per docket, "
+        + f"speedup {total_compiling_time / max(total_shared_time, 1e-9):.2f}x."
+    )
+
+
+def summary_visitor_factories():
+    """ The factories for the visitors that parsing a CP summary uses. """
+    return [
+        CustomVisitorFactory(
+            summary_grammars.summary_page_terminals,
+            summary_grammars.summary_page_nonterminals,
+            dict(),
+            as_xml=False,
+        ),
+        CustomVisitorFactory(
+            summary_grammars.summary_body_terminals,
+            summary_grammars.cp_summary_body_nonterminals,
+            [("sentence_length", visit_sentence_length)],
+            as_xml=False,
+        ),
+    ]
+
+
+@cli.command()
+@click.option(
+    "--repeat",
+    "-r",
+    default=1000,
+    show_default=True,
+    help="How many summaries' worth of visitors to set up.",
+)
+@click.option(
+    "--documents",
+    default=100000,
+    show_default=True,
+    help="How many summaries to estimate the total setup time for.",
+)
+def visitors(repeat, documents):
+    """
+    Time setting up the node visitors for parsing one summary, when every summary gets newly
+    made visitor classes, and when the classes are reused.
+    """
+    times = []
+    for make_visitor in [
+        lambda factory: factory.create_subclass()(),
+        lambda factory: factory.create_instance(),
+    ]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for factory in summary_visitor_factories():
+                make_visitor(factory)
+        times.append((time.perf_counter() - start) / repeat)
+    new_classes, reused_classes = times
+    click.echo(f"{'visitor classes':16} {'us/summary':>11} {f'secs/{documents}':>14}")
+    for label, seconds in [("new", new_classes), ("reused", reused_classes)]:
+        click.echo(f"{label:16} {seconds * 1e6:>11.1f} {seconds * documents:>14.2f}")
+    click.echo(
+        f"\nReusing visitor classes saves {(new_classes - reused_classes) * 1e6:.1f}us "
+        + f"per summary, {new_classes / max(reused_classes, 1e-12):.1f}x less setup."
+    )
+
+
+def parse_summary_with_grammars(pages):
+    """ Parse a summary with the grammars alone. Returns the defendant and cases, or an error. """
+    try:
+        defendant, cases, errors = parse_pdf_pages(pages, grammars_only=True)
+    except Exception as e:
+        return f"error: {e}"
+    if defendant is None:
+        return f"error: {errors}"
+    return to_serializable(defendant), to_serializable(cases)
+
+
+@cli.command()
+@click.option(
+    "--data-dir",
+    "-d",
+    type=click.Path(exists=True),
+    default="tests/data/summaries",
+    show_default=True,
+    help="Directory to search for pdfs.",
+)
+def summaries(data_dir):
+    """
+    Compare reading CP summaries with regular expressions to parsing them with the grammars.
+
+    For each CP summary, report whether the regex parser reads it, whether it finds the same
+    defendant and cases the grammars do, and how much faster it is. Summaries the regex parser
+    can't read are parsed with the grammars, as `parse_pdf_pages` does, and that time counts
+    against it.
+    """
+    documents = []
+    for pdf in find_pdfs(data_dir):
+        pages = list(iter_pages_from_pdf(pdf))
+        if pages and get_processors(pages[0])["parse_pages"] is not None:
+            documents.append((pdf, pages))
+    if len(documents) == 0:
+        click.echo(f"No CP summaries found in {data_dir}.")
+        return
+    click.echo(
+        f"{'document':40} {'cases':>5} {'grammar ms':>10} {'regex ms':>9} {'result':>9}"
+    )
+    total_grammar_time = 0.0
+    total_fast_time = 0.0
+    read = 0
+    agreements = 0
+    for pdf, pages in documents:
+        expected, grammar_time = time_calls(parse_summary_with_grammars, pages, 1)
+        start = time.perf_counter()
+        try:
+            defendant, cases, _ = parse_cp_summary_pages(pages)
+            found = to_serializable(defendant), to_serializable(cases)
+        except SummaryLayoutError:
+            found = None
+        fast_time = time.perf_counter() - start
+        if found is None:
+            result = "fallback"
+            fast_time += grammar_time
+        else:
+            read += 1
+            if found == expected:
+                agreements += 1
+                result = "agree"
+            else:
+                result = "DIFFERENT"
+        total_grammar_time += grammar_time
+        total_fast_time += fast_time
+        case_count = len(found[1]) if found is not None else 0
+        click.echo(
+            f"{os.path.basename(pdf)[:40]:40} {case_count:>5} "
+            + f"{grammar_time * 1000:>10.1f} {fast_time * 1000:>9.1f} {result:>9}"
+        )
+    click.echo(
+        f"\n{len(documents)} CP summaries. The regex parser read {read}, "
+        + f"and agreed with the grammars on {agreements} "
+        + f"({agreements / max(read, 1):.1%} agreement). "
+        + "Speedup, counting fallbacks to the grammars: "
+        + f"{total_grammar_time / max(total_fast_time, 1e-9):.2f}x."
+    )
+
+
+def build_charges(charge_class, sentence_class, length_class, count: int):
+    """ Make `count` charges, each with one sentence. """
+    return [
+        charge_class(
+            offense="Theft By Unlaw Taking",
+            grade="M1",
+            statute="18 § 3921 §§ A",
+            disposition="Guilty",
+            disposition_date=date(2015, 6, 1),
+            sentences=[
+                sentence_class(
+                    sentence_date=date(2015, 6, 1),
+                    sentence_type="Probation",
+                    sentence_period="Min: 1 Year(s) Max: 1 Year(s)",
+                    sentence_length=length_class(
+                        min_time=timedelta(days=365), max_time=timedelta(days=365)
+                    ),
+                )
+            ],
+            sequence=n % 20 + 1,
+        )
+        for n in range(count)
+    ]
+
+
+def object_size(an_object) -> int:
+    """ The size of an object itself, and of its __dict__, if it has one. """
+    size = sys.getsizeof(an_object)
+    if hasattr(an_object, "__dict__"):
+        size += sys.getsizeof(an_object.__dict__)
+    return size
+
+
+@cli.command()
+@click.option(
+    "--charges",
+    "-n",
+    "count",
+    default=100000,
+    show_default=True,
+    help="How many charges to build.",
+)
+def memory(count):
+    """
+    Compare the memory that charges, with their sentences, take up with a __dict__ per object,
+    as they used to, and with __slots__.
+    """
+    kinds = [
+        (
+            "dict",
+            (
+                baselines.DictCharge,
+                baselines.DictSentence,
+                baselines.DictSentenceLength,
+            ),
+        ),
+        ("slots", (Charge, Sentence, SentenceLength)),
+    ]
+    results = []
+    for label, classes in kinds:
+        tracemalloc.start()
+        charges = build_charges(*classes, count)
+        total, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        charge = charges[0]
+        sentence = charge.sentences[0]
+        sizes = [
+            object_size(charge),
+            object_size(sentence),
+            object_size(sentence.sentence_length),
+        ]
+        results.append((label, sizes, total / count))
+        del charges
+    click.echo(
+        f"{'objects':8} {'Charge':>7} {'Sentence':>9} {'SentenceLength':>15} "
+        + f"{'bytes/charge':>13}"
+    )
+    for label, (charge_size, sentence_size, length_size), per_charge in results:
+        click.echo(
+            f"{label:8} {charge_size:>7} {sentence_size:>9} {length_size:>15} "
+            + f"{per_charge:>13.0f}"
+        )
+    (_, _, dict_per_charge), (_, _, slots_per_charge) = results
+    saved = (dict_per_charge - slots_per_charge) * count
+    click.echo(
+        f"\n{count} charges. __slots__ save {saved / 2**20:.1f}MB, "
+        + f"{1 - slots_per_charge / dict_per_charge:.0%} of the memory the charges take up."
+    )
+
+
+def build_record(case_count: int, charges_per_case: int) -> CRecord:
+    """
+    Make a record with `case_count` cases. Every other case has only convictions, and the rest
+    have a nonconviction for every third charge.
+    """
+    cases = []
+    for n in range(case_count):
+        charges = build_charges(Charge, Sentence, SentenceLength, charges_per_case)
+        if n % 2 == 1:
+            for charge in charges[::3]:
+                charge.disposition = "Nolle Prossed"
+        cases.append(
+            Case(
+                docket_number=f"CP-51-CR-{n:07d}-2015",
+                otn=f"N {n:07d}",
+                dc=None,
+                charges=charges,
+                status="Closed",
+                county="Philadelphia",
+                arrest_date=date(2015, 1, 1),
+                disposition_date=date(2015, 6, 1),
+            )
+        )
+    return CRecord(
+        person=Person("Jane", "Smith", date_of_birth=date(1980, 1, 1)), cases=cases
+    )
+
+
+def time_analysis(analysis_class, rule, record: CRecord, repeat: int):
+    """ The best time and the peak memory of analysing `record` with one rule. """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analysis_class(record).rule(rule)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    analysis = analysis_class(record).rule(rule)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return analysis, best, peak
+
+
+@cli.command()
+@click.option(
+    "--cases", "case_count", default=500, show_default=True, help="Cases in the record."
+)
+@click.option(
+    "--charges",
+    "charges_per_case",
+    default=10,
+    show_default=True,
+    help="Charges in each case.",
+)
+@click.option("--repeat", default=5, show_default=True, help="Runs to take the best of.")
+def analysis(case_count, charges_per_case, repeat):
+    """
+    Compare analysing a large made-up record when the Analysis deep-copies the record and the
+    rule copies every case it splits, as they used to, with sharing the record's cases and
+    charges.
+    """
+    record = build_record(case_count, charges_per_case)
+    kinds = [
+        (
+            "copying",
+            baselines.CopyingAnalysis,
+            baselines.expunge_nonconvictions,
+        ),
+        ("sharing", Analysis, expunge_nonconvictions),
+    ]
+    results = []
+    for label, analysis_class, rule in kinds:
+        analysis, best, peak = time_analysis(analysis_class, rule, record, repeat)
+        results.append((label, analysis, best, peak))
+    click.echo(f"{'record':8} {'seconds':>8} {'peak MB':>8}")
+    for label, _, best, peak in results:
+        click.echo(f"{label:8} {best:>8.3f} {peak / 2**20:>8.1f}")
+    (_, copied, copying_time, copying_peak), (_, shared, sharing_time, sharing_peak) = (
+        results
+    )
+    agree = to_serializable(copied.decisions) == to_serializable(shared.decisions)
+    click.echo(
+        f"\n{case_count} cases, {case_count * charges_per_case} charges. "
+        + f"Speedup: {copying_time / max(sharing_time, 1e-9):.1f}x. "
+        + f"Peak memory saved: {1 - sharing_peak / copying_peak:.0%}. "
+        + ("The decisions agree." if agree else "The decisions DISAGREE.")
+    )
+
+
+@cli.command()
+@click.option(
+    "--cases", "case_count", default=500, show_default=True, help="Cases in the record."
+)
+@click.option(
+    "--charges",
+    "charges_per_case",
+    default=10,
+    show_default=True,
+    help="Charges in each case.",
+)
+@click.option("--repeat", default=5, show_default=True, help="Runs to take the best of.")
+def decisions(case_count, charges_per_case, repeat):
+    """
+    Compare analysing a large made-up record with the rules a batch uses, when every rule decides
+    everything again, as they used to, with sharing their decisions within the analysis.
+    """
+    record = build_record(case_count, charges_per_case)
+    # Recent enough that the record isn't free of arrests for five years, so the summary
+    # convictions rule passes every case on to the sealing rule.
+    as_of = date(2018, 1, 1)
+    results = []
+    for label, analysis_class in [
+        ("deciding", baselines.UnsharedAnalysis),
+        ("sharing", Analysis),
+    ]:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            analysis = analysis_class(record, as_of=as_of)
+            for rule in RULES:
+                analysis.rule(rule)
+            best = min(best, time.perf_counter() - start)
+        results.append((label, analysis, best))
+    click.echo(f"{'record':8} {'seconds':>8}")
+    for label, _, best in results:
+        click.echo(f"{label:8} {best:>8.3f}")
+    (_, decided, deciding_time), (_, shared, sharing_time) = results
+    context = shared.context
+    click.echo(f"\n{'rule':48} {'decided':>8} {'shared':>8}")
+    for name in sorted(context.decision_misses):
+        click.echo(
+            f"{name:48} {context.decision_misses[name]:>8} {context.decision_hits[name]:>8}"
+        )
+    agree = to_serializable(decided.decisions) == to_serializable(shared.decisions)
+    click.echo(
+        f"\n{case_count} cases, {case_count * charges_per_case} charges. "
+        + f"Speedup: {deciding_time / max(sharing_time, 1e-9):.2f}x. "
+        + ("The decisions agree." if agree else "The decisions DISAGREE.")
+    )
+
+
+@cli.command()
+@click.option(
+    "--cases", "case_count", default=500, show_default=True, help="Cases in the record."
+)
+@click.option(
+    "--charges",
+    "charges_per_case",
+    default=10,
+    show_default=True,
+    help="Charges in each case.",
+)
+@click.option("--repeat", default=5, show_default=True, help="Runs to take the best of.")
+def verdicts(case_count, charges_per_case, repeat):
+    """
+    Compare analysing a large made-up record with each of the rules a batch uses, when the rules
+    explain what they decide about each case and charge, and when they only decide.
+    """
+    record = build_record(case_count, charges_per_case)
+    # Late enough that the convictions can be sealed, so every rule looks at every charge.
+    as_of = date(2030, 1, 1)
+    charge_count = case_count * charges_per_case
+    click.echo(f"{'rule':28} {'explaining':>11} {'verdicts':>11} {'speedup':>8}")
+    totals = {True: 0.0, False: 0.0}
+    agree = True
+    for rule in RULES:
+        best = {}
+        petitions = {}
+        for explain in (True, False):
+            best[explain] = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                analysis = Analysis(record, as_of=as_of, explain=explain).rule(rule)
+                best[explain] = min(best[explain], time.perf_counter() - start)
+            totals[explain] += best[explain]
+            petitions[explain] = to_serializable(analysis.decisions[0].value)
+        agree = agree and petitions[True] == petitions[False]
+        click.echo(
+            f"{rule.__name__:28} {best[True]:>10.3f}s {best[False]:>10.3f}s "
+            + f"{best[True] / max(best[False], 1e-9):>7.1f}x"
+        )
+    click.echo(
+        f"\n{case_count} cases, {charge_count} charges. Charges per second with every rule: "
+        + f"{charge_count / totals[True]:.0f} explaining, {charge_count / totals[False]:.0f} "
+        + f"verdicts only. Speedup: {totals[True] / max(totals[False], 1e-9):.1f}x. "
+        + ("The petitions agree." if agree else "The petitions DISAGREE.")
+    )
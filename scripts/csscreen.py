@@ -4,9 +4,8 @@ from ujs_search.services.searchujs import search_by_docket, search_by_name
 from RecordLib.utilities.serializers import to_serializable
 from RecordLib.crecord import CRecord, Person
 from RecordLib.sourcerecords import SourceRecord
-from RecordLib.sourcerecords.docket.re_parse_cp_pdf import parse_cp_pdf_text
-from RecordLib.sourcerecords.docket.parse_mdj_pdf import parse_mdj_pdf_text
-from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.dispatch import detect
+from RecordLib.sourcerecords.parsingutilities import get_texts_from_pdfs
 from RecordLib.analysis import Analysis
 from RecordLib.analysis import ruledefs as rd
 from RecordLib.utilities.email_builder import EmailBuilder
@@ -24,15 +23,19 @@ import shutil
 logger = logging.getLogger(__name__)
 
 
-def pick_pdf_parser(docket_num):
-    if "CP" in docket_num or "MC" in docket_num:
-        parser = parse_cp_pdf_text
-    elif "MJ" in docket_num:
-        parser = parse_mdj_pdf_text
-    else:
-        logger.error(f"   Cannot determine the right parser for: {docket_num}")
-        parser = None
-    return parser
+def pick_pdf_parser(name: str, text: str) -> Optional[Callable]:
+    """
+    Find the parser for the text of a document, by reading the document's header.
+
+    Args:
+        name: Identifies the document, in logs.
+        text: The text of the document.
+    """
+    registration = detect(text)
+    if registration is None:
+        logger.error(f"   Cannot determine the right parser for: {name}")
+        return None
+    return registration.parse_text
 
 
 def communicate_results(
@@ -121,6 +124,7 @@ def name(
     # Download the source records
     # and xtract text from the source records.
     with tempfile.TemporaryDirectory() as td:
+        downloads = []
         for case in search_results:
             for source_type in ["docket_sheet", "summary"]:
                 try:
@@ -139,7 +143,11 @@ def name(
                 filename = os.path.join(td, f"{case['docket_number']}_{source_type}")
                 with open(filename, "wb") as fp:
                     fp.write(resp.content)
-                case[f"{source_type}_text"] = get_text_from_pdf(filename)
+                downloads.append((case, source_type, filename))
+        # Extract all the downloaded texts at once, so the pdftotext workers stay busy.
+        texts = get_texts_from_pdfs(filename for _, _, filename in downloads)
+        for (case, source_type, _), text in zip(downloads, texts):
+            case[f"{source_type}_text"] = text
         if output_dir is not None:
             for doc in os.listdir(td):
                 shutil.copy(os.path.join(td, doc), os.path.join(output_dir, doc))
@@ -173,15 +181,16 @@ def name(
     )
 
     logger.info(f"   -time so far:{(datetime.now() - starttime).seconds}")
-    for dn in new_docket_numbers:
-        cases = search_by_docket(dn)
-        if len(cases) > 0:
-            case = cases[0]
-        else:
-            logger.error(f"Did not find case for docket {dn}")
-            continue
-        search_results.append(case)
-        with tempfile.TemporaryDirectory() as td:
+    with tempfile.TemporaryDirectory() as td:
+        downloads = []
+        for dn in new_docket_numbers:
+            cases = search_by_docket(dn)
+            if len(cases) > 0:
+                case = cases[0]
+            else:
+                logger.error(f"Did not find case for docket {dn}")
+                continue
+            search_results.append(case)
             for source_type in ["docket_sheet"]:
                 resp = requests.get(
                     case[f"{source_type}_url"],
@@ -192,10 +201,13 @@ def name(
                 filename = os.path.join(td, case["docket_number"])
                 with open(filename, "wb") as fp:
                     fp.write(resp.content)
-                case[f"{source_type}_text"] = get_text_from_pdf(filename)
-            if output_dir is not None:
-                for doc in os.listdir(td):
-                    shutil.copy(os.path.join(td, doc), os.path.join(output_dir, doc))
+                downloads.append((case, source_type, filename))
+        texts = get_texts_from_pdfs(filename for _, _, filename in downloads)
+        for (case, source_type, _), text in zip(downloads, texts):
+            case[f"{source_type}_text"] = text
+        if output_dir is not None:
+            for doc in os.listdir(td):
+                shutil.copy(os.path.join(td, doc), os.path.join(output_dir, doc))
 
     # Read the source records and integrate them into a CRecord
     # representing the person't full criminal record.
@@ -204,7 +216,7 @@ def name(
         person=Person(first_name=first_name, last_name=last_name, date_of_birth=dob)
     )
     for case in search_results:
-        parser = pick_pdf_parser(case["docket_number"])
+        parser = pick_pdf_parser(case["docket_number"], case["docket_sheet_text"])
         if parser is None:
             continue
         sr = SourceRecord(case["docket_sheet_text"], parser)
@@ -257,14 +269,13 @@ def dir(input_dir, output_json, output_html, email, log_level):
     logger.setLevel(log_level)
     docket_files = [f for f in os.listdir(input_dir) if "docket_sheet" in f]
 
+    texts = get_texts_from_pdfs(os.path.join(input_dir, df) for df in docket_files)
     source_records = []
-    for df in docket_files:
-        parser = pick_pdf_parser(df)
+    for df, text in zip(docket_files, texts):
+        parser = pick_pdf_parser(df, text)
         if parser is None:
             continue
-        source_records.append(
-            SourceRecord(get_text_from_pdf(os.path.join(input_dir, df)), parser)
-        )
+        source_records.append(SourceRecord(text, parser))
 
     crecord = CRecord()
     for source_rec in source_records:
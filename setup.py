@@ -12,6 +12,10 @@ setup(
     install_requires=[
             "Click",
     ],
+    extras_require={
+        # For the in-process pdf text backend (PDF_TEXT_BACKEND=pdfminer).
+        "pdfminer": ["pdfminer.six"],
+    },
     entry_points='''
         [console_scripts]
         download_docs=scripts.download_dockets:cli
@@ -19,5 +23,6 @@ setup(
         parse=scripts.parse:parse
         expunge=scripts.expunge:cli
         csscreen=scripts.csscreen:cli
+        benchmark=scripts.benchmark:cli
     ''',
 )
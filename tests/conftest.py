@@ -42,6 +42,168 @@ def example_summary():
     return summary
 
 
+def cp_summary_case(n, disposition="Guilty"):
+    """ The text of a case on a CP court summary, as pdftotext lays it out. """
+    return (
+        f"   CP-51-CR-000000{n}-2015     Proc Status: Completed     DC No: 151234567{n}     OTN: N123456{n}\n"
+        "     Arrest Dt: 01/01/2015     Disp Date: 06/01/2015     Disp Judge: Smith, John\n"
+        "     Def Atty: Public Defender\n"
+        "       Seq No     Statute              Grade   Description                          Disposition\n"
+        "         Sentence Dt.     Sentence Type        Program Period       Sentence Length\n"
+        f"       1          18 § 3921 §§ A       M1      Theft By Unlaw Taking                {disposition}\n"
+        "         06/01/2015  Probation                  Min: 1 Year(s) Max: 1 Year(s)\n"
+        "       2          18 § 3925 §§ A       M1      Receiving Stolen Property            Nolle Prossed\n"
+        "\n"
+    )
+
+
+CP_SUMMARY_HEADER = (
+    "                     Court of Common Pleas of Philadelphia County\n"
+    "                                   Court Summary\n"
+)
+
+CP_SUMMARY_FOOTER = (
+    "\n"
+    "CPCMS 9082                                                     Printed: 01/01/2020\n"
+    "Recent entries made in the court filing offices may not be immediately reflected.\n"
+    "\f"
+)
+
+
+def cp_summary_pages(page_bodies):
+    """ The text of each page of a CP court summary, given the cases listed on each page. """
+    caption = (
+        "Doe, Jane                          DOB: 01/01/1980      Sex: Female\n"
+        "   1234 Main St Philadelphia, PA 19103            Eyes: Brown\n"
+        "Aliases:                                          Hair: Black\n"
+        " Doe, J                                           Race: White\n"
+        " Doe, Janey\n"
+        "\n"
+    )
+    continuation = "Doe, Jane                             (Continued)\n"
+    return [
+        CP_SUMMARY_HEADER
+        + (caption if page_number == 0 else continuation)
+        + body
+        + CP_SUMMARY_FOOTER
+        for page_number, body in enumerate(page_bodies)
+    ]
+
+
+@pytest.fixture
+def example_cp_summary_pages():
+    """
+    The text of a two-page CP court summary, one string per page.
+    """
+    return cp_summary_pages(
+        [
+            "Closed\n  Philadelphia\n" + cp_summary_case(1) + cp_summary_case(2),
+            "Active\n  Philadelphia\n" + cp_summary_case(3, "Proceed to Court"),
+        ]
+    )
+
+
+@pytest.fixture
+def long_cp_summary_pages():
+    """
+    The text of a CP court summary of 200 cases on 40 pages, under several statuses and
+    counties.
+    """
+    page_bodies = []
+    for page_number in range(40):
+        body = ""
+        if page_number % 10 == 0:
+            body += ["Closed", "Active", "Inactive", "Closed"][page_number // 10]
+            body += "\n  Philadelphia\n"
+        for n in range(page_number * 5 + 1, page_number * 5 + 6):
+            if n % 7 == 0:
+                body += ["  Bucks\n", "  Philadelphia\n"][n % 2]
+            body += cp_summary_case(n, ["Guilty", "Nolle Prossed"][n % 2])
+        page_bodies.append(body)
+    return cp_summary_pages(page_bodies)
+
+
+@pytest.fixture
+def example_cp_docket_text():
+    """
+    The text of a two-page CP docket, as pdftotext lays it out.
+    """
+    page_header = (
+        "                           COURT OF COMMON PLEAS OF PHILADELPHIA COUNTY\n"
+        "                                            DOCKET\n"
+        "                                                                 Docket Number: CP-51-CR-0001234-2015\n"
+        "                                                                 CRIMINAL DOCKET\n"
+        "                                                                 Court Case\n"
+        "                           Commonwealth of Pennsylvania\n"
+        "                                        v.\n"
+        "                                     Jane Doe\n"
+    )
+    footer = (
+        "\n"
+        "CPCMS 9082                                                                   Printed: 01/01/2020\n"
+        "\f"
+    )
+    page1 = (
+        page_header
+        + "                                                                                           Page 1 of 2\n"
+        "                                         CASE INFORMATION\n"
+        "Judge Assigned: Smith, John                        Date Filed: 01/01/2015          Initiation Date: 01/01/2015\n"
+        "OTN: N 1234567-1                 LOTN:                       Originating Docket No: MC-51-CR-0001234-2015\n"
+        "Initial Issuing Authority: Jones, Pat               Final Issuing Authority: Brown, Lee\n"
+        "Arresting Agency: Philadelphia Pd                  Arresting Officer: Affiant\n"
+        "Complaint/Citation No.:                            Incident Number: 1512345678\n"
+        "County: Philadelphia                               Township: Philadelphia City\n"
+        "Case Local Number Type(s)                          Case Local Number(s)\n"
+        "District Control Number                            1512345678\n"
+        "                                          STATUS INFORMATION\n"
+        "Case Status:     Closed                  Status Date        Processing Status\n"
+        "                                         06/01/2015         Completed\n"
+        "Arrest Date:     01/01/2015\n"
+        "Complaint Date:  01/01/2015\n"
+        "                                        DEFENDANT INFORMATION\n"
+        "Date Of Birth:          01/01/1980              City/State/Zip: Philadelphia, PA 19103\n"
+        "Alias Name\n"
+        "Doe, Janey\n"
+        "Doe, J\n"
+        "                                          CASE PARTICIPANTS\n"
+        "Participant Type                     Name\n"
+        "Defendant                            Doe, Jane\n"
+        + footer
+    )
+    page2 = (
+        page_header
+        + "                                                                                           Page 2 of 2\n"
+        "                                              CHARGES\n"
+        "Seq.     Orig Seq.     Grade     Statute          Statute Description            Offense Dt.     OTN\n"
+        "1        1             M1        18 § 3921 §§ A   Theft By Unlaw Taking          01/01/2015      N 1234567-1\n"
+        "                                   DISPOSITION SENTENCING/PENALTIES\n"
+        "Disposition\n"
+        "  Case Event                                   Disposition Date      Final Disposition\n"
+        "    Sequence/Description                         Offense Disposition               Grade      Section\n"
+        "Lower Court Disposition\n"
+        "  Preliminary Hearing                          02/01/2015            Not Final\n"
+        "    1 / Theft By Unlaw Taking-Movable            Held for Court                    M1         18 § 3921 §§ A\n"
+        "    2 / Receiving Stolen Property                Held for Court                    M1         18 § 3925 §§ A\n"
+        "Plea                                           06/01/2015            Final Disposition\n"
+        "    1 / Theft By Unlaw Taking-Movable            Guilty Plea                       M1         18 § 3921 §§ A\n"
+        "        Prop\n"
+        "       Smith, John                                    06/01/2015\n"
+        "    2 / Receiving Stolen Property                Nolle Prossed                     M1         18 § 3925 §§ A\n"
+        "       Smith, John                                    06/01/2015\n"
+        "                                         COMMONWEALTH INFORMATION                     ATTORNEY INFORMATION\n"
+        "Name:    District Attorney                                  Name:    Public Defender\n"
+        "                                               ENTRIES\n"
+        "Sequence Number        CP Filed Date          Document Date          Filed By\n"
+        "1                      01/01/2015                                    Court Of Common Pleas\n"
+        "                                       CASE FINANCIAL INFORMATION\n"
+        "Last Payment Date:                                      Total of Last Payment:\n"
+        "                         Assessment        Payments        Adjustments      Non Monetary      Total\n"
+        "Totals:                  $1,234.50         ($234.50)       $0.00            $0.00             $1,000.00\n"
+        + footer
+    )
+    return page1 + page2
+
+
 @pytest.fixture
 def example_sourcerecord():
     return SourceRecord("tests/data/CourtSummaryReport.pdf", parser=summary_parser)
@@ -1,8 +1,12 @@
 from RecordLib.analysis import Analysis
 from RecordLib.analysis.ruledefs import (
-    expunge_over_70, expunge_summary_convictions
+    expunge_over_70, expunge_summary_convictions, expunge_nonconvictions, seal_convictions
 )
 import pytest
+from RecordLib.analysis.ruledefs.simple_sealing_rules import no_f1_convictions
+from RecordLib.utilities.serializers import to_serializable
+from datetime import date
+import copy
 
 
 
@@ -29,3 +33,46 @@ def test_rule_chaining(example_crecord):
         )
     except:
         pytest.fail("Could not chain analysis rule operations.")
+
+
+def test_rules_share_the_record(example_crecord):
+    case = example_crecord.cases[0]
+    conviction = copy.deepcopy(case.charges[0])
+    conviction.disposition = "Guilty"
+    case.charges[0].disposition = "Nolle Prossed"
+    case.charges.append(conviction)
+    ans = Analysis(example_crecord).rule(expunge_nonconvictions)
+    remaining_case = ans.remaining_record.cases[0]
+    assert remaining_case is not case
+    assert remaining_case.charges == [conviction]
+    assert remaining_case.charges[0] is conviction
+    assert ans.decisions[0].value[0].cases[0].charges[0] is case.charges[0]
+    assert len(ans.record.cases[0].charges) == 2
+
+
+def test_analysis_without_explaining(example_crecord):
+    case = example_crecord.cases[0]
+    conviction = copy.deepcopy(case.charges[0])
+    conviction.disposition = "Guilty"
+    conviction.grade = "F1"
+    case.charges[0].disposition = "Nolle Prossed"
+    case.charges.append(conviction)
+    rules = [expunge_nonconvictions, expunge_summary_convictions, seal_convictions]
+    explained = Analysis(example_crecord, as_of=date(2030, 1, 1))
+    verdicts = Analysis(example_crecord, as_of=date(2030, 1, 1), explain=False)
+    for rule in rules:
+        explained.rule(rule)
+        verdicts.rule(rule)
+    assert [to_serializable(d.value) for d in verdicts.decisions] == [
+        to_serializable(d.value) for d in explained.decisions
+    ]
+    assert len(verdicts.decisions[0].value) == 1
+    # Only the decisions about the whole record are kept as reasoning.
+    assert len(explained.decisions[0].reasoning) == len(example_crecord.cases)
+    assert verdicts.decisions[0].reasoning == []
+    assert len(verdicts.decisions[2].reasoning) == 1
+    # and those give the charges that failed them.
+    with verdicts.context:
+        no_f1 = no_f1_convictions(example_crecord)
+    assert bool(no_f1) is False
+    assert no_f1.reasoning == [conviction]
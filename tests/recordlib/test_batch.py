@@ -0,0 +1,66 @@
+from RecordLib.analysis import batch
+from RecordLib.utilities.serializers import to_serializable
+from datetime import date
+import json
+
+
+def analyze_name(directory, as_of, full):
+    return {"directory": directory, "as_of": as_of.isoformat() if as_of else None}
+
+
+def test_analyze_directories_in_one_process():
+    results = list(
+        batch.analyze_directories(
+            ["a", "b", "c"], workers=1, as_of=date(2020, 1, 1), analyzer=analyze_name
+        )
+    )
+    assert results == [
+        {"directory": "a", "as_of": "2020-01-01"},
+        {"directory": "b", "as_of": "2020-01-01"},
+        {"directory": "c", "as_of": "2020-01-01"},
+    ]
+
+
+def test_analyze_directories_bounds_work_in_flight():
+    handed_out = []
+
+    def directories():
+        for n in range(20):
+            handed_out.append(n)
+            yield str(n)
+
+    results = batch.analyze_directories(
+        directories(), workers=2, max_in_flight=3, analyzer=analyze_name
+    )
+    first = next(results)
+    assert len(handed_out) <= 3
+    finished = [first] + list(results)
+    assert sorted(int(r["directory"]) for r in finished) == list(range(20))
+
+
+def test_analyze_directory_reports_errors(tmp_path):
+    (tmp_path / "not a record.pdf").write_bytes(b"not a pdf")
+    result = batch.analyze_directory(str(tmp_path))
+    assert result["directory"] == str(tmp_path)
+    assert len(result["errors"]) > 0
+    json.dumps(result)
+
+
+def test_finished_directories(tmp_path):
+    output = tmp_path / "results.jsonl"
+    assert batch.finished_directories(str(output)) == set()
+    output.write_text(
+        json.dumps({"directory": "a"}) + "\n"
+        + json.dumps({"directory": "b"}) + "\n"
+        + '{"directory": "c", "na'
+    )
+    assert batch.finished_directories(str(output)) == {"a", "b"}
+    # The partial result at the end is cut off.
+    assert output.read_text().endswith('{"directory": "b"}\n')
+
+
+def test_analyze_record(example_crecord):
+    analysis = batch.analyze_record(example_crecord, as_of=date(2020, 1, 1))
+    assert len(analysis.decisions) == len(batch.RULES)
+    assert analysis.context.as_of == date(2020, 1, 1)
+    json.dumps(analysis, default=to_serializable)
@@ -91,6 +91,14 @@ def test_partialcopy(example_case):
     assert len(new_case.charges) == 0
 
 
+def test_with_charges(example_case):
+    assert example_case.with_charges(list(example_case.charges)) is example_case
+    split_case = example_case.with_charges(example_case.charges[1:])
+    assert split_case is not example_case
+    assert split_case.docket_number == example_case.docket_number
+    assert split_case.charges == example_case.charges[1:]
+
+
 def test_years_passed_disposition(example_case):
     example_case.disposition_date = date(2000, 1, 1)
     assert example_case.years_passed_disposition() > 18
@@ -113,3 +121,10 @@ def test_case_completenes(example_case):
     assert no_judge_completeness > 1
     example_case.judge_address = "1234 Market St."
     assert original_completeness > no_judge_completeness
+
+
+def test_case_has_slots(example_case):
+    assert not hasattr(example_case, "__dict__")
+    assert set(to_serializable(example_case)) <= set(Case.__slots__)
+    copy = example_case.partialcopy()
+    assert copy.completeness() == example_case.completeness() - 1
@@ -0,0 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+import tracemalloc
+from RecordLib.utilities.serializers import to_serializable
+from RecordLib.sourcerecords.summary.caseblocks import (
+    split_case_blocks,
+    CP_CASE_START,
+    CP_CONTINUED_HEADING,
+    MDJ_CASE_START,
+)
+from RecordLib.sourcerecords.summary.parse_pdf import (
+    parse_pdf_pages,
+    parse_cases_in_blocks,
+    parse_summary_pages,
+    parse_summary_body,
+    cp_processors,
+    cp_summary_body_text,
+    get_cp_cases,
+)
+from RecordLib.sourcerecords.summary.grammars import cp_summary_page_grammar
+import pytest
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def cp_summary_body(pages):
+    return cp_summary_body_text(parse_summary_pages(pages, cp_summary_page_grammar))
+
+
+def peak_memory(function):
+    """ The most memory allocated at once while running a function. """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_split_case_blocks(example_cp_summary_pages):
+    text = cp_summary_body(example_cp_summary_pages)
+    blocks = split_case_blocks(text, CP_CASE_START, CP_CONTINUED_HEADING, block_lines=1)
+    assert len(blocks) == 2
+    assert blocks[1].startswith(CP_CONTINUED_HEADING + "   CP-51-CR-0000002-2015")
+    assert blocks[0] + blocks[1][len(CP_CONTINUED_HEADING) :] == text
+    assert split_case_blocks(text, CP_CASE_START, CP_CONTINUED_HEADING) == [text]
+
+
+def test_case_blocks_start_with_their_county():
+    text = (
+        "  MJ-1 OTN: 1\n"
+        "    A charge\n"
+        "\n"
+        "  Cambria\n"
+        "\n"
+        "  MJ-2 Processing Status: Completed OTN/LOTN: 2\n"
+        "    A charge\n"
+        "\n"
+        "  MJ-3 OTN: 3\n"
+    )
+    blocks = split_case_blocks(text, MDJ_CASE_START, "", block_lines=1)
+    assert blocks == [text[: text.index("  MJ-3")], text[text.index("  MJ-3") :]]
+
+
+def test_parse_cases_in_blocks_matches_serial(example_cp_summary_pages, pool):
+    _, cases, _ = parse_pdf_pages(example_cp_summary_pages)
+    text = cp_summary_body(example_cp_summary_pages)
+    block_cases = parse_cases_in_blocks(text, cp_processors, pool, block_lines=1)
+    assert [to_serializable(c) for c in block_cases] == [
+        to_serializable(c) for c in cases
+    ]
+
+
+def test_parse_pdf_pages_in_blocks(long_cp_summary_pages, pool, caplog):
+    cases = get_cp_cases(
+        parse_summary_body(cp_summary_body(long_cp_summary_pages), cp_processors)
+    )
+    assert len(cases) == 200
+    assert {c.county for c in cases} == {"Philadelphia", "Bucks"}
+    for block_pool in [None, pool]:
+        defendant, block_cases, errors = parse_pdf_pages(
+            long_cp_summary_pages, pool=block_pool, grammars_only=True
+        )
+        assert [to_serializable(c) for c in block_cases] == [
+            to_serializable(c) for c in cases
+        ]
+        assert defendant.last_name == "Doe"
+        assert errors == []
+    assert "Could not parse summary in blocks" not in caplog.text
+
+
+def test_parsing_in_blocks_bounds_memory(long_cp_summary_pages):
+    text = cp_summary_body(long_cp_summary_pages)
+    largest_block = max(
+        split_case_blocks(text, CP_CASE_START, CP_CONTINUED_HEADING, block_lines=50),
+        key=len,
+    )
+    block_peak = peak_memory(
+        lambda: get_cp_cases(parse_summary_body(largest_block, cp_processors))
+    )
+    # Only the cases found so far are kept, besides the tree of the block being parsed.
+    assert (
+        peak_memory(lambda: parse_cases_in_blocks(text, cp_processors, block_lines=50))
+        < 1.5 * block_peak
+    )
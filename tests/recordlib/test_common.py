@@ -2,6 +2,7 @@ from RecordLib.crecord.common import *
 from dataclasses import asdict
 from datetime import date, timedelta
 import pytest
+import pickle
 from RecordLib.utilities.serializers import to_serializable
 
 def test_sentence():
@@ -43,6 +44,20 @@ def test_charge():
     assert char.grade == "M2"
     assert char.disposition == "Guilty Plea"
 
+def test_charges_have_slots(example_charge):
+    assert not hasattr(example_charge, "__dict__")
+    assert not hasattr(example_charge.sentences[0], "__dict__")
+    assert not hasattr(example_charge.sentences[0].sentence_length, "__dict__")
+    with pytest.raises(AttributeError):
+        example_charge.not_a_field = 1
+    blank = Charge(offense="", grade="", statute="", disposition="Held for Court")
+    blank.combine_with(example_charge)
+    assert blank.offense == example_charge.offense
+    assert blank.sentences == example_charge.sentences
+    assert Charge.from_dict(asdict(example_charge)) == example_charge
+    assert pickle.loads(pickle.dumps(example_charge)) == example_charge
+
+
 def test_charge_merge_reduce():
     charges = [
         Charge(
@@ -73,6 +88,42 @@ def test_charge_merge_reduce():
     reduced_charges = Charge.reduce_merge(charges)
     assert len(reduced_charges) == 2
 
+def test_reduce_merge_keeps_order_and_final_dispositions():
+    def charge(sequence, disposition, disposition_date=None):
+        return Charge(
+            sequence=sequence,
+            offense=f"Offense {sequence}",
+            grade="M1",
+            statute="18 § 3921",
+            disposition=disposition,
+            disposition_date=disposition_date,
+            sentences=[])
+    charges = [
+        charge(2, "Held for Court"),
+        charge(1, "Held for Court"),
+        charge(None, "Guilty"),
+        charge(2, "Nolle Prossed", date(2011,1,1)),
+        charge(None, "Guilty"),
+        charge(1, "Continued", date(2011,2,2)),
+    ]
+    reduced_charges = Charge.reduce_merge(charges)
+    assert [(c.sequence, c.disposition, c.disposition_date) for c in reduced_charges] == [
+        (2, "Nolle Prossed", date(2011,1,1)),
+        # A disposition that isn't final doesn't replace the existing one, but fills in the missing date.
+        (1, "Held for Court", date(2011,2,2)),
+        # Charges without sequence numbers are never merged.
+        (None, "Guilty", None),
+        (None, "Guilty", None),
+    ]
+
+def test_charge_merger():
+    merger = ChargeMerger()
+    first = Charge("Offense", "M1", "18 § 3921", "Held for Court", sequence=1)
+    assert merger.add(first) is first
+    assert merger.add(Charge("Offense", "M1", "18 § 3921", "Guilty Plea", sequence=1)) is first
+    assert first.disposition == "Guilty Plea"
+    assert merger.charges == [first]
+
 
 @pytest.mark.parametrize("disposition, is_a_conviction", (
     ("Guilty",True),
@@ -85,6 +136,22 @@ def test_charge_is_conviction(example_charge, disposition, is_a_conviction):
     example_charge.disposition = disposition
     assert example_charge.is_conviction() == is_a_conviction
 
+@pytest.mark.parametrize("disposition, disposition_type", (
+    ("Guilty Plea - Negotiated", DispositionTypes.CONVICTION),
+    ("  Guilty", DispositionTypes.CONVICTION),
+    ("Not Guilty", DispositionTypes.NON_CONVICTION),
+    ("Nolle Prossed", DispositionTypes.NON_CONVICTION),
+    ("ARD - County", DispositionTypes.ARD),
+    ("Held for Court (Lower Court)", DispositionTypes.PENDING),
+    ("Unknown", DispositionTypes.UNKNOWN),
+    ("", DispositionTypes.UNKNOWN),
+))
+def test_charge_disposition_type(example_charge, disposition, disposition_type):
+    example_charge.disposition = disposition
+    assert example_charge.disposition_type() == disposition_type
+    assert DispositionTypes.classify(disposition) is example_charge.disposition_type()
+    assert example_charge.is_conviction() == (disposition_type == DispositionTypes.CONVICTION)
+
 def test_charge_get_section(example_charge):
     example_charge.statute = "18 § 1234"
     assert example_charge.get_statute_section() == 1234
@@ -100,6 +167,31 @@ def test_charge_get_statute_subsections(example_charge):
     assert example_charge.get_statute_subsections() == "A1*"
 
 
+@pytest.mark.parametrize("text, title, section, subsections, key", (
+    ("18 § 3921 §§ A", 18, 3921, "A", "3921"),
+    ("18 § 6301(a)(1)", 18, 6301, "", "6301a1"),
+    ("18 § 4915.1", 18, 4915.1, "", "4915.1"),
+    ("75 § 3802 §§ A1*", 75, 3802, "A1*", "3802"),
+    ("24 &sect; 102", None, None, "", None),
+    ("", None, None, "", None),
+))
+def test_statute_parse(text, title, section, subsections, key):
+    statute = Statute.parse(text)
+    assert (statute.title, statute.section, statute.subsections, statute.key) == (
+        title, section, subsections, key)
+    assert Statute.parse(text) is statute
+    with pytest.raises(AttributeError):
+        statute.section = 1
+
+
+def test_charges_share_statutes(example_charge):
+    other = Charge(offense="", grade="", statute=example_charge.statute, disposition="")
+    assert other.parsed_statute() is example_charge.parsed_statute()
+    example_charge.statute = "18 § 5515"
+    assert example_charge.parsed_statute().is_section(18, 5510, 5515)
+    assert not example_charge.parsed_statute().is_section(75, 5515)
+
+
 def test_charge_gte(example_charge):
     example_charge.grade = "M1"
     assert Charge.grade_GTE(example_charge.grade, "M3") == True
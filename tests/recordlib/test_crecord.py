@@ -1,6 +1,6 @@
-from RecordLib.crecord import CRecord
+from RecordLib.crecord import CRecord, Cases
 from RecordLib.crecord import Person
-from RecordLib.sourcerecords import SourceRecord
+from RecordLib.sourcerecords import SourceRecord, Docket
 import pytest
 from datetime import date
 from dateutil.relativedelta import relativedelta
@@ -69,6 +69,57 @@ def test_add_summary_merge_strategies(example_summary):
     assert rec.cases[0].otn != summary2.get_cases()[0].otn
     assert rec.person.first_name == summary2.get_defendant().first_name
 
+def test_overwrite_old_replaces_the_matching_case(example_case):
+    other_case = copy.deepcopy(example_case)
+    other_case.docket_number = "CP-51-CR-0000001-2020"
+    rec = CRecord(Person("Dummy", "Name", None), cases=[other_case, example_case])
+    new_case = copy.deepcopy(example_case)
+    new_case.otn = "a_different_otn"
+    sr = SourceRecord("anysource", parser=None)
+    sr.cases = [new_case]
+    rec.add_sourcerecord(sr, case_merge_strategy="overwrite_old")
+    assert rec.cases[0] is other_case
+    assert rec.cases[1] is new_case
+    assert len(rec.cases) == 2
+
+
+def test_merge_case_with_a_function(example_crecord):
+    old_case = example_crecord.cases[0]
+    new_case = copy.deepcopy(old_case)
+    new_case.otn = "a_different_otn"
+    example_crecord.merge_case(
+        new_case, case_merge_strategy=lambda old, new: old if old.otn else new
+    )
+    assert example_crecord.cases[0] is old_case
+    old_case.otn = None
+    example_crecord.merge_case(
+        new_case, case_merge_strategy=lambda old, new: old if old.otn else new
+    )
+    assert example_crecord.cases[0] is new_case
+
+
+def test_cases_index(example_case):
+    cases = Cases()
+    for n in range(3):
+        case = copy.deepcopy(example_case)
+        case.docket_number = f"CP-{n}"
+        cases.append(case)
+    assert cases.find("CP-1") is cases[1]
+    cases.reverse()
+    assert cases.find("CP-1") is cases[1]
+    assert cases.find("CP-0") is cases[2]
+    cases.pop(0)
+    assert cases.find("CP-2") is None
+    assert cases.find("CP-0") is cases[1]
+    cases.replace("CP-0", example_case)
+    assert cases.find("CP-0") is None
+    assert cases.find(example_case.docket_number) is example_case
+    rec = CRecord(cases=[example_case])
+    rec.cases = [example_case]
+    assert rec.indexed_cases().find(example_case.docket_number) is example_case
+    assert to_serializable(rec)["cases"] == [to_serializable(example_case)]
+
+
 def test_add_sourcerecord(example_sourcerecord):
     rec = CRecord(Person("dummy", "name", None))
     rec.add_sourcerecord(example_sourcerecord, override_person=True)
@@ -76,6 +127,16 @@ def test_add_sourcerecord(example_sourcerecord):
     assert rec.person.first_name != "dummy"
 
 
+def test_add_docket_replaces_every_case_with_its_docket_number(example_person, example_case):
+    rec = CRecord(Person("dummy", "name", None))
+    rec.cases = [copy.deepcopy(example_case) for _ in range(2)]
+    docket = Docket(example_person, example_case)
+    rec.add_docket(docket)
+    assert len(rec.cases) == 2
+    assert all(case is example_case for case in rec.cases)
+    assert rec.person is example_person
+
+
 def test_add_empty_sourcerecord():
     rec = CRecord(Person("dummy", "name", None))
     sr = SourceRecord("anysource", parser=None)
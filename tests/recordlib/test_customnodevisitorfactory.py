@@ -0,0 +1,30 @@
+from RecordLib.sourcerecords.customnodevisitorfactory import CustomVisitorFactory
+from RecordLib.sourcerecords.summary.utilities import visit_sentence_length
+from parsimonious.grammar import Grammar
+
+
+def test_visitor_classes_are_reused():
+    def make(as_xml=True):
+        return CustomVisitorFactory(
+            ["word", "ws"],
+            ["phrase"],
+            [("sentence_length", visit_sentence_length)],
+            as_xml=as_xml,
+        ).create_instance()
+
+    visitor = make()
+    assert type(make()) is type(visitor)
+    assert make() is not visitor
+    assert type(make(as_xml=False)) is not type(visitor)
+    assert type(
+        CustomVisitorFactory(["word"], ["phrase"], dict()).create_instance()
+    ) is not type(visitor)
+    grammar = Grammar(
+        r"""
+        phrase = word (ws word)*
+        word = ~"[a-z]+"
+        ws = " "
+        """
+    )
+    assert visitor.visit(grammar.parse("two words")) == "<phrase> two words </phrase>"
+    assert make(as_xml=False).tree(grammar.parse("two words")).text == " two words "
@@ -0,0 +1,94 @@
+from RecordLib.sourcerecords.dispatch import (
+    ParserRegistry,
+    COURTS,
+    HEADER_LENGTH,
+    default_registry,
+    detect,
+    document_header,
+    parse_text,
+)
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.sourcerecords.docket.re_parse_pdf import which_court
+import pytest
+
+
+MDJ_DOCKET_HEADER = (
+    "                     MAGISTERIAL DISTRICT JUDGE 05-2-21\n"
+    "                                 DOCKET\n"
+    "                                              Docket Number: MJ-05221-CR-0000123-2015\n"
+)
+
+
+def test_detect_dockets(example_cp_docket_text):
+    registration = detect(example_cp_docket_text)
+    assert registration.court == COURTS.CP
+    assert registration.record_type == SourceRecord.RECORD_TYPES.DOCKET
+    mc_docket = example_cp_docket_text.replace("CP-51-CR", "MC-51-CR").replace(
+        "COURT OF COMMON PLEAS", "MUNICIPAL COURT"
+    )
+    assert detect(mc_docket).court == COURTS.MC
+    assert detect(MDJ_DOCKET_HEADER).court == COURTS.MDJ
+    assert which_court(mc_docket) == "CP"
+    assert which_court(MDJ_DOCKET_HEADER) == "MDJ"
+
+
+def test_detect_summaries(example_cp_summary_pages):
+    registration = detect(example_cp_summary_pages[0])
+    assert registration.court == COURTS.CP
+    assert registration.record_type == SourceRecord.RECORD_TYPES.SUMMARY
+    mdj_summary = (
+        "  Magisterial District Court 05-2-21\n  Public Court Summary\n"
+        + example_cp_summary_pages[0]
+    )
+    assert detect(mdj_summary).court == COURTS.MDJ
+
+
+def test_detect_reads_only_the_header():
+    assert (
+        detect("Some other document\n" + " " * HEADER_LENGTH + "Common Pleas") is None
+    )
+    assert document_header("page one\fpage two") == "page one"
+    assert detect("") is None
+
+
+def test_registry_priorities():
+    registry = ParserRegistry()
+    registry.register(
+        "low", COURTS.CP, "DOCKET", lambda h: True, text_parser=lambda t: "low"
+    )
+    registry.register(
+        "high",
+        COURTS.CP,
+        "DOCKET",
+        lambda h: "special" in h,
+        text_parser=lambda t: "high",
+        priority=5,
+    )
+    assert registry.detect("a special docket").name == "high"
+    assert registry.detect("a docket").name == "low"
+    assert registry.parse_pages(["a special ", "docket"]) == "high"
+    with pytest.raises(ValueError):
+        registry.register("no parser", COURTS.CP, "DOCKET", lambda h: True)
+
+
+def test_parse_text(example_cp_docket_text, example_cp_summary_pages):
+    _, cases, errs = parse_text(example_cp_docket_text)
+    assert [c.docket_number for c in cases] == ["CP-51-CR-0001234-2015"]
+    _, cases, errs = parse_text("".join(example_cp_summary_pages))
+    assert len(cases) == 3
+    _, cases, errs = parse_text("Not a docket")
+    assert cases is None
+    assert errs == ["Could not tell what kind of document this is."]
+
+
+def test_detect_and_parse_pages(example_cp_summary_pages):
+    registration, (_, cases, errs) = default_registry().detect_and_parse_pages(
+        example_cp_summary_pages
+    )
+    assert registration.record_type == SourceRecord.RECORD_TYPES.SUMMARY
+    assert len(cases) == 3
+    registration, (_, cases, errs) = default_registry().detect_and_parse_pages(
+        ["Not a docket\f"]
+    )
+    assert registration is None
+    assert errs == ["Could not tell what kind of document this is."]
@@ -7,6 +7,11 @@ from RecordLib.crecord import Case
 from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import parse_mdj_pdf
 from RecordLib.sourcerecords.docket.re_parse_cp_pdf import (
     parse_cp_pdf as re_parse_cp_pdf,
+    parse_cp_pdf_text,
+    parse_case,
+    parse_charges,
+    split_sections,
+    DOCKET_HEADER,
 )
 
 
@@ -125,3 +130,76 @@ def test_regex_cp_parser(caplog):
         logging.error(f"Only {successes}/{total_dockets} parsed.")
         pytest.fail(f"Only {successes}/{total_dockets} parsed.")
 
+
+
+def test_split_sections(example_cp_docket_text):
+    sections = split_sections(example_cp_docket_text)
+    assert "Docket Number: CP-51-CR-0001234-2015" in sections[DOCKET_HEADER]
+    assert "CASE INFORMATION" not in sections[DOCKET_HEADER]
+    assert sections["CASE PARTICIPANTS"].startswith("Participant Type")
+    # The defendant's section runs up to the next header, across nothing else.
+    assert "Alias Name" in sections["DEFENDANT INFORMATION"]
+    assert "Participant Type" not in sections["DEFENDANT INFORMATION"]
+    # A header that shares its line with another heading still starts a section.
+    assert sections["COMMONWEALTH INFORMATION"].startswith("Name:")
+    assert "Totals:" in sections["CASE FINANCIAL INFORMATION"]
+
+
+def test_parse_cp_pdf_text(example_cp_docket_text):
+    person, cases, errs = parse_cp_pdf_text(example_cp_docket_text)
+    assert errs == []
+    assert person.first_name == "Jane"
+    assert person.last_name == "Doe"
+    assert person.aliases == ["Doe, Janey", "Doe, J"]
+    assert person.address.line_one == "Philadelphia, PA 19103"
+    case = cases[0]
+    assert case.docket_number == "CP-51-CR-0001234-2015"
+    assert case.county == "PHILADELPHIA"
+    assert case.otn == "N 1234567-1"
+    assert case.status.strip() == "Closed"
+    assert case.judge == "Brown, Lee"
+    assert case.dc == "1512345678"
+    assert case.affiant == "Unknown Officer"
+    assert case.disposition_date.isoformat() == "2015-06-01"
+    assert case.total_fines == 1234.5
+    assert [c.disposition for c in case.charges] == ["Guilty Plea", "Nolle Prossed"]
+
+
+def test_parse_case_falls_back_to_whole_text(example_cp_docket_text):
+    """ A field that isn't where we expect it is still found. """
+    txt = example_cp_docket_text.replace("Arrest Date:     01/01/2015\n", "").replace(
+        "Totals:", "Arrest Date:     02/02/2015\nTotals:"
+    )
+    case, _ = parse_case(txt)
+    assert case.arrest_date.isoformat() == "2015-02-02"
+
+
+def test_parse_charges(example_cp_docket_text):
+    charges, errs = parse_charges(example_cp_docket_text)
+    assert errs == []
+    assert [(c.sequence, c.disposition) for c in charges] == [
+        (1, "Guilty Plea"),
+        (2, "Nolle Prossed"),
+    ]
+    assert all(c.disposition_date.isoformat() == "2015-06-01" for c in charges)
+
+
+def test_parse_charges_keeps_last_of_successive_dates():
+    txt = (
+        "                    DISPOSITION SENTENCING/PENALTIES\n"
+        "    1 / Simple Assault                           Guilty                            M2         18 § 2701 §§ A\n"
+        "        Bodily Injury\n"
+        "       Smith, John                                    06/01/2015\n"
+        "       Smith, John                                    07/01/2015\n"
+        "Sentencing\n"
+        "       Smith, John                                    08/01/2015\n"
+        "    2 / Recklessly Endangering                   Guilty                            M2         18 § 2705\n"
+    )
+    charges, errs = parse_charges(txt)
+    assert charges[0].offense == "Simple Assault Bodily Injury"
+    assert charges[0].disposition_date.isoformat() == "2015-07-01"
+    # A charge on the last line of the section has no disposition date.
+    assert charges[1].disposition_date is None
+    assert errs == [
+        "Could not find disposition date for 2 / Recklessly Endangering with disposition Guilty"
+    ]
@@ -0,0 +1,76 @@
+from RecordLib.crecord import evaluation
+from RecordLib.crecord.evaluation import EvaluationContext
+from RecordLib.analysis import Analysis
+from RecordLib.analysis.ruledefs import (
+    expunge_nonconvictions,
+    expunge_over_70,
+    seal_convictions,
+)
+from RecordLib.analysis.ruledefs import simple_sealing_rules as ssr
+from RecordLib.crecord import CRecord
+from RecordLib.utilities.serializers import to_serializable
+from datetime import date
+import copy
+
+
+def test_years_since_as_of(example_case, example_person):
+    example_case.disposition_date = date(2000, 6, 1)
+    example_person.date_of_birth = date(1950, 6, 1)
+    with EvaluationContext(as_of=date(2010, 5, 31)) as context:
+        assert evaluation.today() == date(2010, 5, 31)
+        assert example_case.years_passed_disposition() == 9
+        assert example_person.age() == 59
+        with EvaluationContext(as_of=date(2010, 6, 1)):
+            assert example_case.years_passed_disposition() == 10
+            assert example_person.age() == 60
+        assert example_case.years_passed_disposition() == 9
+        assert context.years_since(date(2000, 6, 1)) == 9
+    assert evaluation.current_context() is None
+    assert evaluation.today() == date.today()
+
+
+def test_analysis_evaluates_rules_as_of_a_date(example_crecord):
+    example_crecord.person.date_of_birth = date(1940, 1, 1)
+    rules_saw = []
+
+    def looks_at_the_date(crecord):
+        rules_saw.append((evaluation.today(), crecord.person.age()))
+        return expunge_over_70(crecord)
+
+    analysis = Analysis(example_crecord, as_of=date(2000, 1, 1))
+    analysis.rule(looks_at_the_date)
+    assert rules_saw == [(date(2000, 1, 1), 60)]
+    assert to_serializable(analysis)["context"] == {"as_of": "2000-01-01"}
+
+
+def test_rules_share_decisions_about_the_record(example_crecord):
+    analysis = Analysis(example_crecord).rule(seal_convictions)
+    assert analysis.context.decision_misses["ten_years_since_last_conviction"] == 1
+    with analysis.context:
+        # The rule decided about a copy of the record that shares its cases.
+        decision = ssr.ten_years_since_last_conviction(example_crecord)
+        same_cases = CRecord(
+            person=example_crecord.person, cases=list(example_crecord.cases)
+        )
+        assert ssr.ten_years_since_last_conviction(same_cases) is decision
+    assert analysis.context.decision_hits["ten_years_since_last_conviction"] == 2
+    # Outside of a context, rules decide again each time.
+    assert ssr.ten_years_since_last_conviction(same_cases) is not decision
+
+
+def test_rules_share_decisions_about_cases(example_crecord):
+    convicted = example_crecord.cases[0]
+    convicted.charges[0].disposition = "Guilty"
+    split = copy.deepcopy(convicted)
+    split.docket_number = "CP-51-CR-7654321-2019"
+    split.charges.append(copy.deepcopy(split.charges[0]))
+    split.charges[0].disposition = "Nolle Prossed"
+    example_crecord.cases.append(split)
+    analysis = Analysis(example_crecord).rule(expunge_nonconvictions)
+    assert analysis.context.decision_misses["convictions"] == 2
+    analysis.rule(seal_convictions)
+    # The sealing rule shares the convictions of the case the first rule didn't split, and only
+    # finds the convictions of the new case holding what's left of the split one.
+    assert analysis.remaining_record.cases[0] is convicted
+    assert analysis.context.decision_misses["convictions"] == 3
+    assert analysis.context.decision_hits["convictions"] >= 1
@@ -0,0 +1,63 @@
+from RecordLib.sourcerecords.grammarregistry import (
+    GrammarRegistry,
+    get_grammar,
+    parsimonious_version,
+)
+from RecordLib.sourcerecords.docket.grammars import docket_sections, section_grammars
+import os
+
+
+GREETING = r"""
+    greeting = hello ws name
+    hello = "Hello" / "Hi"
+    ws = " "+
+    name = ~"[a-z]+"i
+"""
+
+
+def test_grammars_are_compiled_once():
+    registry = GrammarRegistry()
+    grammar = registry.get(GREETING)
+    assert registry.get(GREETING) is grammar
+    assert grammar.parse("Hi  Jane").children[2].text == "Jane"
+    assert registry.stats() == {
+        "hits": 1,
+        "disk_hits": 0,
+        "compiled": 1,
+        "grammars": 1,
+    }
+    registry.clear()
+    assert registry.get(GREETING) is not grammar
+
+
+def test_default_registry_shares_grammars():
+    assert get_grammar(docket_sections) is get_grammar(docket_sections)
+    _, defendant_info_section, *_ = section_grammars[0]
+    assert get_grammar(defendant_info_section) is get_grammar(defendant_info_section)
+
+
+def test_disk_cache(tmp_path):
+    GrammarRegistry(directory=str(tmp_path)).get(GREETING)
+    assert len(os.listdir(tmp_path)) == 1
+    other_process = GrammarRegistry(directory=str(tmp_path))
+    grammar = other_process.get(GREETING)
+    assert other_process.stats()["disk_hits"] == 1
+    assert other_process.stats()["compiled"] == 0
+    assert grammar.parse("Hello Sam").children[2].text == "Sam"
+    assert grammar["name"].parse("Sam").text == "Sam"
+
+
+def test_unreadable_cache_files_are_recompiled(tmp_path):
+    registry = GrammarRegistry(directory=str(tmp_path))
+    with open(os.path.join(tmp_path, f"{registry.key(GREETING)}.grammar"), "wb") as f:
+        f.write(b"not a pickle")
+    grammar = registry.get(GREETING)
+    assert registry.stats()["compiled"] == 1
+    assert grammar.parse("Hello Sam").children[2].text == "Sam"
+    other_process = GrammarRegistry(directory=str(tmp_path))
+    other_process.get(GREETING)
+    assert other_process.stats()["disk_hits"] == 1
+
+
+def test_parsimonious_version():
+    assert parsimonious_version() not in ("", "unknown")
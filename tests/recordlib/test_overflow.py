@@ -1,7 +1,10 @@
 from RecordLib.sourcerecords.overflow import (
     MDJFirstCoupleLinesOverflow,
     MDJOverflowInChargeList,
-    OverflowFilter
+    OverflowFilter,
+    OverflowPipeline,
+    cp_summary_overflow,
+    mdj_summary_overflow,
 )
 import pytest
 import re
@@ -115,3 +118,61 @@ def test_MDJFirstCoupleLinesOverflowInStatewideSection():
     assert MDJFirstCoupleLinesOverflow.condition(prev, next) is True
     prev, next = MDJFirstCoupleLinesOverflow.remove_overflow(prev, next)
     assert "\n".join(prev) == "\n"
+
+
+def test_OverflowPipelineAppliesTheFirstMatchingFilter():
+    class DropFirstLine(OverflowFilter):
+        @staticmethod
+        def condition(prev, next):
+            return next[0] == "repeated"
+
+        @staticmethod
+        def remove_overflow(prev, next):
+            return prev[:-1], next[1:]
+
+    class DropEverything(OverflowFilter):
+        @staticmethod
+        def condition(prev, next):
+            return True
+
+        @staticmethod
+        def remove_overflow(prev, next):
+            return [], []
+
+    pipeline = OverflowPipeline([DropFirstLine, DropEverything])
+    pages = [["a", "b", ""], ["repeated", "c", ""], ["repeated", "d"]]
+    assert pipeline.stitch(pages) == ["a", "b", "c", "d"]
+    assert OverflowPipeline([DropEverything]).stitch(pages) == []
+    assert OverflowPipeline([]).stitch(pages) == ["a", "b", "", "repeated", "c", "", "repeated", "d"]
+
+
+def test_mdj_summary_overflow():
+    prev = \
+"""  MJ-02201-CR-0000001-2019     OTN: T 123456-1
+      Arrest Date: 01/01/2019          Disp. Event Date: 02/01/2019
+       Statute          Grade       Description   Disposition      Counts
+
+""".split("\n")
+    next = \
+"""County: Blair
+  Closed
+       Statute          Grade       Description   Disposition      Counts
+       18 § 3921 §§ A         M1           Theft   Guilty    1
+""".split("\n")
+    lines = mdj_summary_overflow.stitch([prev, next])
+    assert lines[2].strip().startswith("Statute")
+    assert lines[3].strip().startswith("18 § 3921")
+
+
+def test_cp_summary_overflow():
+    prev = \
+"""   CP-51-CR-0000001-2015     Proc Status: Completed     DC No: 1512345671     OTN: N1234561
+     Arrest Dt: 01/01/2015     Disp Date: 06/01/2015     Disp Judge: Smith, John
+       1          18 § 3921 §§ A       M1      Theft By Unlaw Taking                Guilty""".split("\n")
+    next = \
+"""Closed (Continued)
+  Philadelphia (Continued)
+   CP-51-CR-0000001-2015     Proc Status: Completed     DC No: 1512345671     OTN: N1234561
+     Arrest Dt: 01/01/2015     Disp Date: 06/01/2015     Disp Judge: Smith, John
+       2          18 § 3925 §§ A       M1      Receiving Stolen Property            Nolle Prossed""".split("\n")
+    assert cp_summary_overflow.stitch([prev, next]) == prev + next[4:]
@@ -0,0 +1,41 @@
+from RecordLib.sourcerecords.parsenode import ParseNode, build_node
+from lxml import etree
+
+
+def example_tree():
+    alias = build_node("alias", ["Doe, J"])
+    caption = build_node("caption", ["Jane Doe\n", alias, "\n"])
+    case = build_node("case", [build_node("docket_num", ["CP-1"])])
+    cases = build_node("cases_in_county", ["Philadelphia", case])
+    return build_node("summary", [caption, cases])
+
+
+def test_text_matches_xml():
+    tree = example_tree()
+    xml = etree.fromstring(
+        "<summary> <caption> Jane Doe\n<alias> Doe, J </alias>\n </caption>"
+        + "<cases_in_county> Philadelphia<case> <docket_num> CP-1 </docket_num> </case> "
+        + "</cases_in_county> </summary>"
+    )
+    assert etree.tostring(tree.to_xml()) == etree.tostring(xml)
+    assert tree.find("caption").text == " Jane Doe\n"
+    assert tree.find("caption/alias").tail == "\n "
+
+
+def test_find():
+    tree = example_tree()
+    assert tree.find("caption/alias").text.strip() == "Doe, J"
+    assert tree.find("case") is None
+    assert [n.tag for n in tree.findall(".//docket_num")] == ["docket_num"]
+    case = tree.findall(".//case")[0]
+    assert case.getparent().tag == "cases_in_county"
+    assert [n.tag for n in tree.iter()][:3] == ["summary", "caption", "alias"]
+    assert len(tree.findall("*")) == 2
+
+
+def test_append_moves_nodes():
+    tree = example_tree()
+    other = ParseNode("Summary")
+    other.append(tree.find("caption"))
+    assert tree.find("caption") is None
+    assert other.find("caption/alias").getparent().getparent() is other
@@ -0,0 +1,109 @@
+from RecordLib.sourcerecords.pdfbackends import (
+    ExtractionBackend,
+    PdfMinerBackend,
+    PdfToTextBackend,
+    backend_from_environment,
+)
+import pytest
+
+
+def make_pdf(pages):
+    """
+    Write a pdf with text in 10pt Courier, which is 6pt wide.
+
+    Args:
+        pages: For each page, a list of (column, row, text) tuples.
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>")
+    pages_id = add(None)
+    kids = []
+    for runs in pages:
+        ops = []
+        for col, row, text in runs:
+            esc = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(
+                f"BT /F1 10 Tf 1 0 0 1 {36 + col * 6} {756 - row * 12} Tm ({esc}) Tj ET"
+            )
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, font, content)
+            )
+        )
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        catalog,
+        xref,
+    )
+    return out
+
+
+def test_pdfminer_emulates_layout():
+    pytest.importorskip("pdfminer")
+    pdf = make_pdf(
+        [
+            [
+                (0, 0, "Docket Number:"),
+                (20, 0, "CP-51-CR-0000001-2015"),
+                (4, 1, "Theft By Unlaw Taking"),
+                (40, 1, "Guilty"),
+                (0, 3, "CPCMS 9082"),
+            ],
+            [(2, 0, "Page two")],
+        ]
+    )
+    text = PdfMinerBackend().extract(None, pdf)
+    assert text == (
+        "Docket Number:      CP-51-CR-0000001-2015\n"
+        "    Theft By Unlaw Taking" + " " * 15 + "Guilty\n"
+        "\n"
+        "CPCMS 9082\n"
+        "\f"
+        "Page two\n"
+        "\f"
+    )
+
+
+def test_pdfminer_pages():
+    pytest.importorskip("pdfminer")
+    pdf = make_pdf([[(0, 0, "one")], [(0, 0, "two")]])
+    assert list(PdfMinerBackend().iter_pages(None, pdf)) == ["one\n\f", "two\n\f"]
+
+
+def test_backend_from_environment(monkeypatch):
+    monkeypatch.setenv("PDF_TEXT_BACKEND", "pdftotext")
+    assert isinstance(backend_from_environment(), PdfToTextBackend)
+    monkeypatch.setenv("PDF_TEXT_BACKEND", "not-a-backend")
+    with pytest.raises(ValueError):
+        backend_from_environment()
+
+
+def test_incomplete_backend_cannot_be_made():
+    class NoPages(ExtractionBackend):
+        version = "no pages"
+
+    with pytest.raises(TypeError):
+        NoPages()
@@ -0,0 +1,107 @@
+from RecordLib.sourcerecords.pdfextraction import PdfTextExtractor, split_pages
+from RecordLib.sourcerecords.textcache import TextCache
+import io
+import sys
+import pytest
+
+
+# Stands in for pdftotext. It "extracts" text by upper-casing whatever it reads.
+FAKE_PDFTOTEXT = [
+    sys.executable,
+    "-c",
+    "import sys; src = sys.argv[1]; "
+    "data = sys.stdin.buffer.read() if src == '-' else open(src, 'rb').read(); "
+    "sys.stdout.write(data.decode('utf8').upper())",
+]
+
+
+@pytest.fixture
+def extractor():
+    ext = PdfTextExtractor(max_workers=2, command=FAKE_PDFTOTEXT)
+    yield ext
+    ext.shutdown()
+
+
+def test_extract_from_path(extractor, tmp_path):
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"some docket")
+    assert extractor.extract(str(pdf)) == "SOME DOCKET"
+
+
+def test_extract_from_file_object(extractor):
+    assert extractor.extract(io.BytesIO(b"a summary")) == "A SUMMARY"
+
+
+def test_extract_many_keeps_order(extractor):
+    pdfs = [io.BytesIO(f"doc {i}".encode("utf8")) for i in range(10)]
+    assert list(extractor.extract_many(pdfs)) == [f"DOC {i}" for i in range(10)]
+
+
+def test_failed_extraction_is_blank(tmp_path):
+    ext = PdfTextExtractor(max_workers=1, command=[sys.executable, "-c", "exit(1)"])
+    assert ext.extract(str(tmp_path / "missing.pdf")) == ""
+    ext.shutdown()
+
+
+def test_missing_command_is_blank(tmp_path):
+    ext = PdfTextExtractor(max_workers=1, command=["not-a-real-pdftotext"])
+    assert ext.extract(io.BytesIO(b"pdf")) == ""
+    ext.shutdown()
+
+
+def test_extraction_uses_cache(tmp_path):
+    cache = TextCache(directory=str(tmp_path))
+    ext = PdfTextExtractor(max_workers=1, command=FAKE_PDFTOTEXT, cache=cache)
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"some docket")
+    assert ext.extract(str(pdf)) == "SOME DOCKET"
+    assert ext.extract(io.BytesIO(b"some docket")) == "SOME DOCKET"
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+    ext.shutdown()
+
+
+# Stands in for pdftotext, writing three pages, each followed by a form feed.
+FAKE_PAGED_PDFTOTEXT = [
+    sys.executable,
+    "-c",
+    "import sys; sys.stdin.buffer.read(); "
+    "sys.stdout.write(''.join(f'page {i}\\n\\f' for i in range(3)))",
+]
+
+
+def test_iter_pages():
+    ext = PdfTextExtractor(max_workers=1, command=FAKE_PAGED_PDFTOTEXT)
+    pages = list(ext.iter_pages(io.BytesIO(b"pdf")))
+    assert pages == ["page 0\n\f", "page 1\n\f", "page 2\n\f"]
+    assert "".join(pages) == ext.extract(io.BytesIO(b"pdf"))
+    ext.shutdown()
+
+
+def test_iter_pages_uses_cache(tmp_path):
+    cache = TextCache(directory=str(tmp_path), memory_items=0)
+    ext = PdfTextExtractor(max_workers=1, command=FAKE_PAGED_PDFTOTEXT, cache=cache)
+    streamed = list(ext.iter_pages(io.BytesIO(b"pdf")))
+    assert list(ext.iter_pages(io.BytesIO(b"pdf"))) == streamed
+    assert cache.stats()["disk_hits"] == 1
+    ext.shutdown()
+
+
+def test_split_pages():
+    assert list(split_pages("a\fb\f")) == ["a\f", "b\f"]
+    assert list(split_pages("a\fb")) == ["a\f", "b"]
+    assert list(split_pages("")) == []
+
+
+def test_paused_stream_does_not_hold_a_worker():
+    ext = PdfTextExtractor(max_workers=1, command=FAKE_PAGED_PDFTOTEXT)
+    pages = ext.iter_pages(io.BytesIO(b"pdf"))
+    try:
+        assert next(pages) == "page 0\n\f"
+        # The stream is paused with the only slot free, so another pdf can still be read.
+        future = ext.submit(io.BytesIO(b"a summary"))
+        assert future.result(timeout=10) == "page 0\n\fpage 1\n\fpage 2\n\f"
+        assert list(pages) == ["page 1\n\f", "page 2\n\f"]
+    finally:
+        pages.close()
+        ext.shutdown()
@@ -5,6 +5,7 @@ from RecordLib.crecord import CRecord, Charge
 import json
 from RecordLib.utilities.serializers import to_serializable
 from datetime import date
+from RecordLib.crecord.evaluation import EvaluationContext
 from RecordLib.petitions import Sealing, Petition
 
 def test_seal(example_crecord):
@@ -236,6 +237,23 @@ def test_no_indecent_exposure(example_crecord):
     d = no_indecent_exposure(example_crecord,1,15)
     assert bool(d) is True
  
+@pytest.mark.parametrize("statute, exclusions", (
+    ("18 § 2501 §§ A", {Exclusions.ARTICLE_B}),
+    ("18 § 3300", set()),
+    ("18 § 3126(a)(1)", {Exclusions.ARTICLE_B, Exclusions.TIERED_SEX_OFFENSE}),
+    ("18 § 4304", {Exclusions.AGAINST_FAMILY}),
+    ("18 § 6106 §§ A1", {Exclusions.FIREARMS}),
+    ("18 § 6301(a)(1)", {Exclusions.CORRUPTION_OF_MINORS}),
+    ("18 § 6312", {Exclusions.TIERED_SEX_OFFENSE}),
+    ("75 § 3802 §§ A1*", set()),
+    ("14 s 123", set()),
+))
+def test_statute_exclusions(example_charge, statute, exclusions):
+    example_charge.statute = statute
+    assert statute_exclusions(example_charge) == exclusions
+    assert statute_exclusions(example_charge) is statute_exclusions(example_charge)
+
+
 def test_no_corruption_of_minors_offense(example_charge):
     example_charge.statute = "18 § 1201.1"
     d = no_corruption_of_minors_offense(example_charge, penalty_limit=20, conviction_limit=1, within_years=20)
@@ -298,4 +316,41 @@ def test_is_felony_conviction(example_charge):
 
 @pytest.mark.skip("Not unit-tested. Shame on me.")
 def test_more_than_x_convictions_y_grade_y_years(example_crecord):
-    pass
\ No newline at end of file
+    pass
+
+
+@pytest.mark.parametrize("statute", [
+    "18 § 2501 §§ A", "18 § 3126(a)(1)", "18 § 4304", "18 § 6106 §§ A1",
+    "18 § 6301(a)(1)", "18 § 6312", "14 s 123", "",
+])
+@pytest.mark.parametrize("grade", ["M1", "M", "F1", "F3", "S", ""])
+@pytest.mark.parametrize("disposition", ["Guilty", "Nolle Prossed", "", None])
+def test_rules_decide_the_same_without_explaining(
+    example_crecord, statute, grade, disposition
+):
+    example_crecord.cases[0].disposition_date = date(2010, 1, 1)
+    charge = example_crecord.cases[0].charges[0]
+    charge.statute = statute
+    charge.grade = grade
+    charge.disposition = disposition
+    charge.offense = "Murder" if grade == "F1" else "Theft"
+    assert charge_is_sealable(charge) == all(
+        petition_sealing_for_single_charge(charge).reasoning
+    )
+    for rule in [
+        full_record_requirements_for_petition_sealing,
+        no_f1_convictions,
+        lambda rec: no_danger_to_person_offense(
+            rec, penalty_limit=7, conviction_limit=1, within_years=20),
+        lambda rec: no_offense_against_family(
+            rec, penalty_limit=7, conviction_limit=1, within_years=20),
+        lambda rec: no_firearms_offense(
+            rec, penalty_limit=7, conviction_limit=1, within_years=20),
+        lambda rec: no_sexual_offense(
+            rec, penalty_limit=7, conviction_limit=1, within_years=20),
+    ]:
+        with EvaluationContext(as_of=date(2020, 1, 1)):
+            explained = rule(example_crecord)
+        with EvaluationContext(as_of=date(2020, 1, 1), explain=False):
+            decided = rule(example_crecord)
+        assert bool(decided) == bool(explained)
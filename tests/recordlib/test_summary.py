@@ -8,6 +8,25 @@ import logging
 import pytest
 from RecordLib.sourcerecords import Summary
 from RecordLib.crecord import CRecord, Person, Case
+from lxml import etree
+from RecordLib.utilities.serializers import to_serializable
+from parsimonious.grammar import Grammar
+from RecordLib.sourcerecords.customnodevisitorfactory import CustomVisitorFactory
+from RecordLib.sourcerecords.summary.utilities import (
+    sentence_length_terms,
+    visit_sentence_length,
+)
+from RecordLib.sourcerecords.summary.re_parse_cp_pdf import (
+    SummaryLayoutError,
+    parse_cp_summary_pages,
+)
+from RecordLib.sourcerecords.summary import parse_pdf
+from RecordLib.sourcerecords.summary.parse_pdf import parse_pdf_pages, parse_summary_pages
+from RecordLib.sourcerecords.summary.grammars import (
+    cp_summary_page_grammar,
+    summary_page_terminals,
+    summary_page_nonterminals,
+)
 
 
 def test_init():
@@ -99,3 +118,139 @@ def test_get_arrest_date():
     # find a different summary to use for testing.
     arrest_dates = [case.arrest_date for case in cases if case.arrest_date is not None]
     assert len(arrest_dates) > 0
+
+
+def test_parse_pdf_pages(example_cp_summary_pages):
+    defendant, cases, errors = parse_pdf_pages(iter(example_cp_summary_pages))
+    assert errors == []
+    assert defendant.last_name == "Doe"
+    assert [c.docket_number for c in cases] == [
+        "CP-51-CR-0000001-2015",
+        "CP-51-CR-0000002-2015",
+        "CP-51-CR-0000003-2015",
+    ]
+    assert [c.status for c in cases] == ["Closed", "Closed", "Active"]
+    assert [ch.disposition for ch in cases[2].charges] == [
+        "Proceed to Court",
+        "Nolle Prossed",
+    ]
+
+
+def test_parse_summary_pages_matches_whole_document(example_cp_summary_pages):
+    """ Parsing a page at a time finds the same pages as parsing the whole text at once. """
+    visitor = CustomVisitorFactory(
+        summary_page_terminals, summary_page_nonterminals, dict()
+    ).create_instance()
+    whole = etree.fromstring(
+        visitor.visit(cp_summary_page_grammar.parse("".join(example_cp_summary_pages))),
+        etree.XMLParser(encoding="UTF-8", recover=True),
+    )
+    paged = parse_summary_pages(
+        example_cp_summary_pages, cp_summary_page_grammar, as_xml=True
+    )
+    assert [etree.tostring(page).strip() for page in whole] == [
+        etree.tostring(page).strip() for page in paged
+    ]
+
+
+def test_parse_pdf_pages_without_pages():
+    defendant, cases, errors = parse_pdf_pages([])
+    assert defendant is None
+    assert len(errors) == 1
+
+
+def test_parse_pdf_pages_finds_sequences(example_cp_summary_pages):
+    _, cases, _ = parse_pdf_pages(example_cp_summary_pages)
+    assert [[c.sequence for c in case.charges] for case in cases] == [[1, 2]] * 3
+
+
+def test_parse_nodes_match_xml(example_cp_summary_pages):
+    """ Building ParseNodes gives the same trees, and summaries, as going through xml. """
+    nodes = parse_summary_pages(example_cp_summary_pages, cp_summary_page_grammar)
+    xml = parse_summary_pages(
+        example_cp_summary_pages, cp_summary_page_grammar, as_xml=True
+    )
+    assert etree.tostring(nodes.to_xml()) == etree.tostring(xml)
+    defendant, cases, errors = parse_pdf_pages(example_cp_summary_pages)
+    xml_defendant, xml_cases, xml_errors = parse_pdf_pages(
+        example_cp_summary_pages, as_xml=True
+    )
+    assert to_serializable(defendant) == to_serializable(xml_defendant)
+    assert [to_serializable(c) for c in cases] == [
+        to_serializable(c) for c in xml_cases
+    ]
+    assert errors == xml_errors
+
+
+@pytest.mark.parametrize("as_xml", [True, False])
+def test_visit_sentence_length(as_xml):
+    grammar = Grammar(
+        r"""
+        sentencing_info = sentence_type sentence_length
+        sentence_type = "Probation"
+        sentence_length = ~".+"
+        """
+    )
+    visitor = CustomVisitorFactory(
+        ["sentence_type"],
+        ["sentencing_info"],
+        [("sentence_length", visit_sentence_length)],
+        as_xml=as_xml,
+    ).create_instance()
+    tree = visitor.tree(grammar.parse("Probation     Min of 1.00 Years Max of 2.00 Years"))
+    assert tree.find("sentence_length/min_length/time").text.strip() == "1.00"
+    assert tree.find("sentence_length/max_length/unit").text.strip() == "Years"
+
+
+def test_sentence_length_terms():
+    assert sentence_length_terms("Min: 1 Year(s) Max: 2 Year(s)") == (
+        ("1", "Year"),
+        ("2", "Year"),
+    )
+    assert sentence_length_terms("Max of 6 Months") == (("6", "Months"), ("6", "Months"))
+    assert sentence_length_terms("Life") == (None, None)
+
+
+@pytest.mark.parametrize(
+    "pages", ["example_cp_summary_pages", "long_cp_summary_pages"]
+)
+def test_regex_parser_matches_grammars(pages, request):
+    pages = request.getfixturevalue(pages)
+    defendant, cases, errors = parse_pdf_pages(pages, grammars_only=True)
+    re_defendant, re_cases, re_errors = parse_cp_summary_pages(pages)
+    assert to_serializable(re_defendant) == to_serializable(defendant)
+    assert [to_serializable(c) for c in re_cases] == [
+        to_serializable(c) for c in cases
+    ]
+    assert re_errors == errors == []
+
+
+def test_parse_pdf_pages_falls_back_to_grammars(example_cp_summary_pages, caplog):
+    caplog.set_level(logging.INFO)
+    pages = list(example_cp_summary_pages)
+    pages[1] = pages[1].replace("Court Summary", "Court Report")
+    with pytest.raises(SummaryLayoutError):
+        parse_cp_summary_pages(pages)
+    defendant, cases, errors = parse_pdf_pages(iter(pages))
+    assert "Parsing summary with the grammars" in caplog.text
+    assert defendant is None
+    assert len(errors) == 1 and errors[0].startswith("Grammar cannot parse summary")
+
+
+def test_parse_pdf_pages_falls_back_to_grammars_on_any_error(
+    example_cp_summary_pages, monkeypatch, caplog
+):
+    def fail(pages):
+        list(pages)
+        raise IndexError("list index out of range")
+
+    monkeypatch.setitem(parse_pdf.cp_processors, "parse_pages", fail)
+    pages = list(example_cp_summary_pages)
+    defendant, cases, errors = parse_pdf_pages(iter(pages))
+    assert "The regex parser failed" in caplog.text
+    grammar_defendant, grammar_cases, _ = parse_pdf_pages(pages, grammars_only=True)
+    assert to_serializable(defendant) == to_serializable(grammar_defendant)
+    assert [to_serializable(c) for c in cases] == [
+        to_serializable(c) for c in grammar_cases
+    ]
+    assert errors == []
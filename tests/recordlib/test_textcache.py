@@ -0,0 +1,50 @@
+from RecordLib.sourcerecords.textcache import TextCache
+import os
+
+
+def test_key_depends_on_extractor_version():
+    assert TextCache.key(b"pdf", "pdftotext 4.02") == TextCache.key(
+        b"pdf", "pdftotext 4.02"
+    )
+    assert TextCache.key(b"pdf", "pdftotext 4.02") != TextCache.key(
+        b"pdf", "pdftotext 4.03"
+    )
+    assert TextCache.key(b"pdf", "v1") != TextCache.key(b"other pdf", "v1")
+
+
+def test_memory_cache():
+    cache = TextCache(memory_items=2)
+    assert cache.get("a") is None
+    cache.put("a", "text a")
+    assert cache.get("a") == "text a"
+    cache.put("b", "text b")
+    cache.put("c", "text c")
+    # "a" was the least recently used.
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_disk_cache_is_shared(tmp_path):
+    TextCache(directory=str(tmp_path)).put("abcd", "some text")
+    other_process = TextCache(directory=str(tmp_path))
+    assert other_process.get("abcd") == "some text"
+    assert other_process.stats()["disk_hits"] == 1
+    # Now it's in memory too.
+    assert other_process.get("abcd") == "some text"
+    assert other_process.stats()["memory_hits"] == 1
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = TextCache(directory=str(tmp_path), max_bytes=25, memory_items=0)
+    cache.put("aa01", "0123456789")
+    cache.put("bb02", "0123456789")
+    os.utime(cache._path("aa01"), (1, 1))
+    cache.get("aa01")
+    os.utime(cache._path("bb02"), (2, 2))
+    cache.put("cc03", "0123456789")
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") == "0123456789"
+    assert cache.get("cc03") == "0123456789"
+    assert cache.stats()["evictions"] == 1